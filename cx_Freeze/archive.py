@@ -0,0 +1,121 @@
+"""
+Implements the writer of the indexed archive, an alternative to the zip
+file for the frozen modules that is read by the finder of the
+initscripts/__archive__.py module.
+
+The archive starts with a header of 16 bytes: the magic b"CXAR", the
+version and the width of the names (16 bits each), the number of entries
+(32 bits) and 4 reserved bytes. The index follows, with one record per
+module, sorted by name: the name encoded in UTF-8 and padded with NUL bytes
+to the width, then the offset and the size of the data (64 and 32 bits) and
+the flags (32 bits). The data of the modules follows, in the order in which
+they were added; the data of each module is its marshaled code, stored or
+compressed with zlib. All the integers are little endian.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import struct
+from typing import List, Optional, Tuple
+import zipfile
+import zlib
+
+from .zipwriter import CompressionPolicy
+
+__all__ = ["ArchiveWriter", "STARTUP_MODULES"]
+
+# the modules (with their submodules) that Python imports during its
+# initialization and the ones that __startup__ imports before the finder of
+# the archive is installed (the constants tell if the archive is used and
+# the tracer is installed first); these are read from the zip file, as the
+# archive can only be read after them
+STARTUP_MODULES = (
+    "BUILD_CONSTANTS",
+    "__archive__",
+    "__importtrace__",
+    "__startup__",
+    "_bootlocale",
+    "_weakrefset",
+    "abc",
+    "codecs",
+    "encodings",
+    "io",
+)
+
+# these values must match the ones in initscripts/__archive__.py
+ARCHIVE_MAGIC = b"CXAR"
+ARCHIVE_VERSION = 1
+HEADER = struct.Struct("<4s2HLL")
+RECORD = struct.Struct("<QLL")
+FLAG_PACKAGE = 1
+FLAG_COMPRESSED = 2
+
+
+class ArchiveWriter:
+    """
+    The ArchiveWriter class collects the marshaled code of the modules and
+    writes the archive when closed. The data of each module is compressed,
+    by a pool of threads, if the policy says so.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        policy: Optional[CompressionPolicy] = None,
+        jobs: int = 1,
+    ):
+        self.filename: str = filename
+        self.policy: CompressionPolicy = policy or CompressionPolicy(False)
+        self.jobs: int = jobs
+        self._entries: List[Tuple[bytes, bytes, int]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def _compress(self, entry: Tuple[bytes, bytes, int]) -> Tuple:
+        """Compress the data of the entry, if the policy says so."""
+        name, data, flags = entry
+        arc_name = name.decode("utf-8").replace(".", "/")
+        if flags & FLAG_PACKAGE:
+            arc_name += "/__init__"
+        method, level = self.policy.get(arc_name + ".pyc", len(data))
+        if method != zipfile.ZIP_STORED:
+            if level is None:
+                level = zlib.Z_DEFAULT_COMPRESSION
+            data = zlib.compress(data, level)
+            flags |= FLAG_COMPRESSED
+        return name, data, flags
+
+    def add(self, name: str, data: bytes, is_package: bool = False) -> None:
+        """Add the marshaled code of the module."""
+        flags = FLAG_PACKAGE if is_package else 0
+        self._entries.append((name.encode("utf-8"), data, flags))
+
+    def close(self) -> None:
+        """Write the archive."""
+        entries = self._entries
+        if self.jobs > 1:
+            with ThreadPoolExecutor(self.jobs) as executor:
+                entries = list(executor.map(self._compress, entries))
+        else:
+            entries = [self._compress(entry) for entry in entries]
+        width = max([len(name) for name, _, _ in entries], default=0)
+        offset = HEADER.size + len(entries) * (width + RECORD.size)
+        offsets = {}
+        for name, data, _ in entries:
+            offsets[name] = offset
+            offset += len(data)
+        with open(self.filename, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    ARCHIVE_MAGIC, ARCHIVE_VERSION, width, len(entries), 0
+                )
+            )
+            for name, data, flags in sorted(entries, key=lambda e: e[0]):
+                file.write(name.ljust(width, b"\0"))
+                file.write(RECORD.pack(offsets[name], len(data), flags))
+            for _, data, _ in entries:
+                file.write(data)
@@ -0,0 +1,94 @@
+"""
+Implements a persistent cache of compiled and scanned modules, used by the
+ModuleFinder to avoid compiling and scanning again the modules that did not
+change since the previous build.
+"""
+
+import hashlib
+from importlib.util import MAGIC_NUMBER
+import marshal
+import os
+from types import CodeType
+from typing import List, Optional, Tuple
+
+__all__ = ["ModuleCache"]
+
+# bump this value when the layout of an entry changes
+CACHE_VERSION = 1
+
+
+class ModuleCache:
+    """
+    The ModuleCache class stores, for each module file, the code object
+    compiled from it and the import operations found in that code. Entries
+    are keyed by path, modification time and size of the file, the optimize
+    flag and the magic number of the running Python, so any change in one
+    of them forces the module to be compiled again.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir: str = os.path.abspath(cache_dir)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._header: bytes = MAGIC_NUMBER + bytes([CACHE_VERSION])
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_name(self, path: str, optimize_flag: int) -> str:
+        """Return the name of the file that stores the entry for path."""
+        key = f"{path}\0{optimize_flag}".encode("utf-8", "surrogateescape")
+        digest = hashlib.sha1(self._header + key).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest[2:])
+
+    def get(
+        self, path: str, optimize_flag: int
+    ) -> Optional[Tuple[CodeType, List[tuple]]]:
+        """
+        Return the code and the import operations cached for the given path
+        or None if the file is not in the cache or if it has been changed.
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+            with open(self._entry_name(path, optimize_flag), "rb") as file:
+                data = file.read()
+        except OSError:
+            self.misses += 1
+            return None
+        if data.startswith(self._header):
+            try:
+                entry = marshal.loads(data[len(self._header) :])
+            except (EOFError, ValueError, TypeError):
+                entry = None
+            if entry is not None and entry[:3] == (
+                path,
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                self.hits += 1
+                return entry[3], entry[4]
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        path: str,
+        optimize_flag: int,
+        code: CodeType,
+        imports: List[tuple],
+    ) -> None:
+        """Store the code and the import operations found for path."""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        entry = (path, stat.st_mtime_ns, stat.st_size, code, imports)
+        filename = self._entry_name(path, optimize_flag)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # write to a temporary file and rename it, so a concurrent build
+        # never reads a partial entry
+        temp_name = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_name, "wb") as file:
+            file.write(self._header)
+            file.write(marshal.dumps(entry))
+        os.replace(temp_name, filename)
@@ -48,6 +48,35 @@ def prepare_parser():
         dest="compress",
         help="compress byte code in zip files",
     )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        dest="compress_level",
+        metavar="N",
+        help="compression level, from 0 (fastest) to 9 (smallest), of the "
+        "entries of the zip file",
+    )
+    parser.add_argument(
+        "--compress-min-size",
+        type=int,
+        default=0,
+        dest="compress_min_size",
+        metavar="BYTES",
+        help="store, without compression, the entries of the zip file that "
+        "are smaller than this size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compress-rule",
+        action="append",
+        default=[],
+        dest="compress_rules",
+        metavar="PATTERN=METHOD[:LEVEL]",
+        help="compression of the entries of the zip file whose names match "
+        "the pattern (like pkg/* or *.json); method is one of stored, "
+        "deflated, bzip2 or lzma, but modules are never compressed with bzip2 "
+        "or lzma, which zipimport cannot read; the first rule that matches "
+        "an entry wins; multiple --compress-rule arguments can be used",
+    )
     parser.add_argument(
         "-s",
         "--silent",
@@ -182,6 +211,156 @@ def prepare_parser():
         "in a zip file; use * to specify that all packages should be placed "
         "in the file system and excluded from the zip file (the default)",
     )
+    parser.add_argument(
+        "--package-data-excludes",
+        dest="package_data_excludes",
+        metavar="PATTERNS",
+        help="comma separated list of glob patterns of the data files and "
+        "directories of the packages placed in the file system which should "
+        "not be copied, matched against their names or their paths from the "
+        "directory of the top level package, like tests,docs,*.pyi,*.c,*.h "
+        "or matplotlib/mpl-data/sample_data",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=["zip", "indexed"],
+        default="zip",
+        dest="archive_format",
+        help="format of the archive of the modules that are not placed in "
+        "the file system: zip (library.zip, read by zipimport) or indexed "
+        "(library.dat, with a sorted index read through a memory map, which "
+        "starts faster; the modules needed to read it stay in library.zip) "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--embed-modules",
+        action="store_true",
+        dest="embed_modules",
+        help="embed the modules imported at startup (by Python itself and by "
+        "the startup and initialization scripts, with the main script and "
+        "the build constants) in each executable, so they are imported as "
+        "frozen modules instead of being read from the zip file",
+    )
+    parser.add_argument(
+        "--origin-rpath",
+        action="store_true",
+        dest="origin_rpath",
+        help="set the rpath of the executables and of the copied libraries "
+        "relative to $ORIGIN, so that the directory of the executables and "
+        "the lib directory are searched first; the ConsoleSetLibPath init "
+        "script then does not restart the executable (Linux only)",
+    )
+    parser.add_argument(
+        "--import-trace",
+        action="store_true",
+        dest="import_trace",
+        help="support the tracing of the imports at runtime: when the "
+        "environment variable CX_FREEZE_IMPORT_TRACE is set to a file or a "
+        "directory, the executables record the modules they import, in order "
+        "and with the time spent importing each of them",
+    )
+    parser.add_argument(
+        "--trace-file",
+        action="append",
+        default=[],
+        dest="trace_files",
+        metavar="PATH",
+        help="import trace, or directory of import traces, recorded by "
+        "executables built with --import-trace; the modules that no trace "
+        "imported are reported; multiple --trace-file arguments can be used",
+    )
+    parser.add_argument(
+        "--exclude-untraced",
+        action="store_true",
+        dest="exclude_untraced",
+        help="exclude the modules that none of the import traces imported, "
+        "except the ones needed to start the executables",
+    )
+    parser.add_argument(
+        "--archive-order",
+        choices=["name", "import"],
+        default="name",
+        dest="archive_order",
+        help="order of the modules in the archive: name or import (the order "
+        "in which the modules are imported, taken from the import traces "
+        "given with --trace-file or, for the modules they do not cover, from "
+        "the imports found in the modules), which puts the modules needed at "
+        "startup together at the start of the file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        dest="profile",
+        help="record the wall and CPU time spent in each phase of the build "
+        "(finding the modules, running the hooks, reading the dependencies of "
+        "the libraries, writing the modules, copying the files...) and print "
+        "a summary of the phases, the longest first",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        dest="profile_trace",
+        metavar="FILE",
+        help="write the profile of the build, as with --profile, to the file "
+        "in the trace event format of Chrome, which chrome://tracing and "
+        "Perfetto can display",
+    )
+    parser.add_argument(
+        "--dedupe-libraries",
+        choices=["hardlink", "symlink", "needed"],
+        dest="dedupe_libraries",
+        metavar="MODE",
+        help="replace the copies of the shared libraries which have the same "
+        "contents as another copy, like the ones vendored by several wheels, "
+        "with hard links (hardlink) or relative symbolic links (symlink) to "
+        "it, or remove them and make the files that load them load the copy "
+        "kept instead by editing their DT_NEEDED entries and rpaths (needed, "
+        "Linux only)",
+    )
+    parser.add_argument(
+        "--stream-modules",
+        action="store_true",
+        dest="stream_modules",
+        help="write the compiled code of each module to a temporary spool "
+        "file as soon as the module is found, instead of keeping it in memory "
+        "until the modules are written, so the memory used by the build does "
+        "not grow with the code of the program",
+    )
+    parser.add_argument(
+        "--size-report",
+        action="store_true",
+        dest="size_report",
+        help="print the modules which take the most space in the build "
+        "directory if they are excluded: their compiled code, the data files "
+        "of their packages, their extension modules and the shared libraries "
+        "and included files that only they need, found with the dominator "
+        "tree of the import graph of the executables",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        metavar="DIR",
+        help="directory in which to keep a persistent cache of the compiled "
+        "and scanned modules, reused by later builds to skip the modules that "
+        "did not change",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        dest="jobs",
+        metavar="N",
+        help="number of parallel jobs used to build the executable; use 0 "
+        "for the number of processors (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        dest="incremental",
+        help="update the target directory instead of building it from "
+        "scratch, copying and writing only the files that changed since the "
+        "previous build and removing the ones no longer needed",
+    )
     parser.add_argument(
         "--icon",
         dest="icon",
@@ -205,6 +384,7 @@ def parse_command_line(parser):
     args.packages = normalize_to_list(args.packages)
     args.zip_include_packages = normalize_to_list(args.zip_include_packages)
     args.zip_exclude_packages = normalize_to_list(args.zip_exclude_packages)
+    args.package_data_excludes = normalize_to_list(args.package_data_excludes)
     replace_paths = []
     if args.replace_paths:
         for directive in args.replace_paths.split(os.pathsep):
@@ -250,6 +430,9 @@ def main():
         packages=args.packages,
         replacePaths=args.replace_paths,
         compress=args.compress,
+        compressLevel=args.compress_level,
+        compressMinSize=args.compress_min_size,
+        compressRules=args.compress_rules,
         optimizeFlag=args.optimize_flag,
         path=None,
         targetDir=args.target_dir,
@@ -258,5 +441,21 @@ def main():
         silent=args.silent,
         zipIncludePackages=args.zip_include_packages,
         zipExcludePackages=args.zip_exclude_packages,
+        cacheDir=args.cache_dir,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        archiveFormat=args.archive_format,
+        embedModules=args.embed_modules,
+        originRpath=args.origin_rpath,
+        importTrace=args.import_trace,
+        traceFiles=args.trace_files,
+        excludeUntraced=args.exclude_untraced,
+        archiveOrder=args.archive_order,
+        profile=args.profile,
+        profileTrace=args.profile_trace,
+        sizeReport=args.size_report,
+        packageDataExcludes=args.package_data_excludes,
+        dedupeLibraries=args.dedupe_libraries,
+        streamModules=args.stream_modules,
     )
     freezer.Freeze()
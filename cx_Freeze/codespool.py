@@ -0,0 +1,64 @@
+"""
+Implements the spool of the marshaled code of the modules, used when the
+stream_modules option is given: the finder writes the code of each module to
+the spool as soon as the module is loaded and releases the code object, and
+the freezer reads the marshaled code back when it writes the module, so the
+memory used does not grow with the code of the program. The spool is an
+anonymous temporary file, removed when it is closed.
+"""
+
+import os
+import tempfile
+from typing import NamedTuple, Optional
+
+__all__ = ["CodeSpool", "SpooledCode"]
+
+
+class SpooledCode(NamedTuple):
+    """The location of the marshaled code of a module in the spool."""
+
+    spool: "CodeSpool"
+    offset: int
+    size: int
+
+    def read(self) -> bytes:
+        """Return the marshaled code."""
+        return self.spool.read(self.offset, self.size)
+
+
+class CodeSpool:
+    """
+    The CodeSpool class appends the marshaled code of the modules to a
+    temporary file and reads it back by offset and size.
+    """
+
+    def __init__(self, dir_name: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(
+            prefix="cx_Freeze-", suffix=".spool", dir=dir_name
+        )
+        self.count: int = 0
+        self.size: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, data: bytes) -> SpooledCode:
+        """Append the marshaled code of a module."""
+        self._file.seek(self.size, os.SEEK_SET)
+        self._file.write(data)
+        entry = SpooledCode(self, self.size, len(data))
+        self.count += 1
+        self.size += len(data)
+        return entry
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Return the data written at the offset."""
+        self._file.seek(offset, os.SEEK_SET)
+        return self._file.read(size)
+
+    def close(self) -> None:
+        """Close and remove the temporary file."""
+        self._file.close()
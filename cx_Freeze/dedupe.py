@@ -0,0 +1,100 @@
+"""
+Implements the search of the shared libraries copied more than once to the
+build directory with the same contents, like the libraries that wheels
+vendor in numpy.libs, scipy.libs or Pillow.libs, which the Freezer replaces
+with links to a single copy when the dedupe_libraries option is given.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+from typing import Dict, List, Sequence, Tuple
+
+__all__ = ["ContentIndex", "is_shared_library"]
+
+SHARED_LIBRARY_SUFFIXES = (".so", ".dll", ".pyd", ".dylib")
+
+
+def is_shared_library(path: str) -> bool:
+    """Return True if the name of the file is the name of a shared library,
+    including the versioned names like libz.so.1."""
+    name = os.path.basename(path).lower()
+    return name.endswith(SHARED_LIBRARY_SUFFIXES) or ".so." in name
+
+
+class ContentIndex:
+    """
+    The ContentIndex class computes the digests of the contents of files,
+    with a pool of threads (hashlib releases the GIL), and memoizes them by
+    device, inode, size and modification time, so a file is read once even
+    if it is reached by several paths. Only the files whose size is shared
+    with another file are read.
+    """
+
+    def __init__(self, jobs: int = 1):
+        self.jobs = jobs
+        self._digests: Dict[Tuple[int, int, int, int], str] = {}
+
+    @staticmethod
+    def _get_key(path: str) -> Tuple[int, int, int, int]:
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def digest(self, path: str) -> str:
+        """Return the digest of the contents of the file."""
+        key = self._get_key(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = self._hash(path)
+        return digest
+
+    def duplicates(self, paths: Sequence[str]) -> List[List[str]]:
+        """
+        Return the groups of files with the same contents, each group
+        starting with the file to keep (the one nearest to the root, then
+        the first by name). The paths that are links to the same file (same
+        inode) as the file to keep are left out, as they are already
+        deduplicated; symbolic links are ignored.
+        """
+        keys: Dict[str, Tuple[int, int, int, int]] = {}
+        by_size: Dict[int, List[str]] = {}
+        for path in paths:
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            key = keys[path] = self._get_key(path)
+            by_size.setdefault(key[2], []).append(path)
+        candidates = [
+            path
+            for same_size in by_size.values()
+            if len({keys[path][:2] for path in same_size}) > 1
+            for path in same_size
+        ]
+        missing = {
+            keys[path]: path
+            for path in candidates
+            if keys[path] not in self._digests
+        }
+        if missing:
+            with ThreadPoolExecutor(self.jobs) as executor:
+                digests = executor.map(self._hash, missing.values())
+                self._digests.update(zip(missing, digests))
+        groups: Dict[str, List[str]] = {}
+        for path in candidates:
+            groups.setdefault(self._digests[keys[path]], []).append(path)
+        result = []
+        for group in groups.values():
+            group.sort(key=lambda path: (path.count(os.sep), path))
+            inode = keys[group[0]][:2]
+            group[1:] = [path for path in group[1:] if keys[path][:2] != inode]
+            if len(group) > 1:
+                result.append(group)
+        result.sort()
+        return result
@@ -93,6 +93,22 @@ class build_exe(distutils.core.Command):
         ),
         ("path=", None, "comma-separated list of paths to search"),
         ("no-compress", None, "create a zipfile with no compression"),
+        (
+            "compress-level=",
+            None,
+            "compression level (0-9) of the entries of the zipfile",
+        ),
+        (
+            "compress-min-size=",
+            None,
+            "store the entries of the zipfile smaller than this size",
+        ),
+        (
+            "compress-rules=",
+            None,
+            "list of rules pattern=method[:level] of compression of the "
+            "entries of the zipfile",
+        ),
         ("constants=", None, "comma-separated list of constants to include"),
         (
             "include-files=",
@@ -144,6 +160,95 @@ class build_exe(distutils.core.Command):
             "and place in the file system instead (or * for all) "
             "[default: *]",
         ),
+        (
+            "package-data-excludes=",
+            None,
+            "comma-separated list of glob patterns of the data files of the "
+            "packages which should not be copied",
+        ),
+        (
+            "archive-format=",
+            None,
+            "format of the archive of the modules: zip or indexed "
+            "[default: zip]",
+        ),
+        (
+            "archive-order=",
+            None,
+            "order of the modules in the archive: name or import "
+            "[default: name]",
+        ),
+        (
+            "embed-modules",
+            None,
+            "embed the modules imported at startup in the executables",
+        ),
+        (
+            "origin-rpath",
+            None,
+            "set the rpath of the executables and libraries relative to "
+            "$ORIGIN (Linux only)",
+        ),
+        (
+            "import-trace",
+            None,
+            "support the tracing of the imports at runtime",
+        ),
+        (
+            "trace-files=",
+            None,
+            "list of import traces (or directories of traces) recorded at "
+            "runtime",
+        ),
+        (
+            "exclude-untraced",
+            None,
+            "exclude the modules that none of the import traces imported",
+        ),
+        (
+            "profile",
+            None,
+            "print the time spent in each phase of the build",
+        ),
+        (
+            "profile-trace=",
+            None,
+            "write the profile of the build to the file, in the trace event "
+            "format of Chrome",
+        ),
+        (
+            "size-report",
+            None,
+            "print the modules which save the most space if excluded",
+        ),
+        (
+            "dedupe-libraries=",
+            None,
+            "replace the identical copies of shared libraries with links: "
+            "hardlink, symlink or needed (Linux only)",
+        ),
+        (
+            "stream-modules",
+            None,
+            "keep the compiled code of the modules in a spool file instead "
+            "of in memory",
+        ),
+        (
+            "cache-dir=",
+            None,
+            "directory of the persistent cache of compiled modules",
+        ),
+        (
+            "jobs=",
+            "j",
+            "number of parallel jobs used to build the executables "
+            "(0 for the number of processors) [default: 1]",
+        ),
+        (
+            "incremental",
+            None,
+            "update the build directory, copying only the changed files",
+        ),
         ("silent", "s", "suppress all output except warnings (equivalent to --silent-level=1)"),
         (
             "silent-level=",
@@ -155,7 +260,19 @@ class build_exe(distutils.core.Command):
             "level 3: suppress all warning messages"
         ),
     ]
-    boolean_options = ["no-compress", "include_msvcr", "silent"]
+    boolean_options = [
+        "no-compress",
+        "include_msvcr",
+        "embed-modules",
+        "exclude-untraced",
+        "import-trace",
+        "incremental",
+        "origin-rpath",
+        "profile",
+        "silent",
+        "size-report",
+        "stream-modules",
+    ]
 
     def add_to_path(self, name):
         source_dir = getattr(self, name.lower())
@@ -212,6 +329,9 @@ class build_exe(distutils.core.Command):
             "bin_path_excludes",
             "zip_include_packages",
             "zip_exclude_packages",
+            "package_data_excludes",
+            "compress_rules",
+            "trace_files",
         ]
 
         for option in self.list_options:
@@ -221,14 +341,34 @@ class build_exe(distutils.core.Command):
         self.optimize = 0
         self.build_exe = None
         self.no_compress = False
+        self.compress_level = None
+        self.compress_min_size = 0
         self.path = None
         self.include_msvcr = None
+        self.archive_format = "zip"
+        self.archive_order = "name"
+        self.embed_modules = False
+        self.origin_rpath = False
+        self.import_trace = False
+        self.exclude_untraced = False
+        self.profile = False
+        self.profile_trace = None
+        self.size_report = False
+        self.dedupe_libraries = None
+        self.stream_modules = False
+        self.cache_dir = None
+        self.jobs = 1
+        self.incremental = False
         self.silent = None
         self.silent_level = None
 
     def finalize_options(self):
         self.set_undefined_options("build", ("build_exe", "build_exe"))
         self.optimize = int(self.optimize)
+        if self.compress_level is not None:
+            self.compress_level = int(self.compress_level)
+        self.compress_min_size = int(self.compress_min_size)
+        self.jobs = int(self.jobs)
 
         self.silent_setting = 0  # the degree of silencing, set from either the silent or silent-level
                                  # option, as appropriate
@@ -278,6 +418,25 @@ class build_exe(distutils.core.Command):
             metadata=metadata,
             zipIncludePackages=self.zip_include_packages,
             zipExcludePackages=self.zip_exclude_packages,
+            cacheDir=self.cache_dir,
+            jobs=self.jobs,
+            incremental=self.incremental,
+            compressLevel=self.compress_level,
+            compressMinSize=self.compress_min_size,
+            compressRules=self.compress_rules,
+            archiveFormat=self.archive_format,
+            embedModules=self.embed_modules,
+            originRpath=self.origin_rpath,
+            importTrace=self.import_trace,
+            traceFiles=self.trace_files,
+            excludeUntraced=self.exclude_untraced,
+            archiveOrder=self.archive_order,
+            profile=self.profile,
+            profileTrace=self.profile_trace,
+            sizeReport=self.size_report,
+            packageDataExcludes=self.package_data_excludes,
+            dedupeLibraries=self.dedupe_libraries,
+            streamModules=self.stream_modules,
         )
 
         # keep freezer around so that its data case be used in bdist_mac phase
@@ -2,19 +2,28 @@
 Base class for finding modules.
 """
 
+from concurrent.futures import Future, ProcessPoolExecutor
 import dis
 from importlib.abc import ExecutionLoader
 import importlib.machinery
+import importlib.util
 import logging
+import marshal
 import os
 import sys
-from tempfile import TemporaryDirectory
 from types import CodeType
 from typing import Any, Dict, List, Optional, Tuple, Union
 import opcode
+import weakref
 
+from .cache import ModuleCache
+from .codespool import CodeSpool
 from .common import code_object_replace
-from .module import Module
+from .hookregistry import HookRegistry
+from .module import DistributionIndex, Module
+from .nametrie import NameTrie
+from .packagequery import PackageQuery
+from .profiler import Profiler
 
 
 BUILD_LIST = opcode.opmap["BUILD_LIST"]
@@ -29,6 +38,24 @@ STORE_GLOBAL = opcode.opmap["STORE_GLOBAL"]
 STORE_OPS = (STORE_NAME, STORE_GLOBAL)
 
 DeferredList = List[Tuple[Module, Module, List[str]]]
+ImportList = List[tuple]
+PathIndex = Dict[str, List[Tuple[int, str, Optional[type]]]]
+
+# the loaders in the order used by the standard path based finder
+FILE_LOADERS = (
+    [
+        (suffix, importlib.machinery.ExtensionFileLoader)
+        for suffix in importlib.machinery.EXTENSION_SUFFIXES
+    ]
+    + [
+        (suffix, importlib.machinery.SourceFileLoader)
+        for suffix in importlib.machinery.SOURCE_SUFFIXES
+    ]
+    + [
+        (suffix, importlib.machinery.SourcelessFileLoader)
+        for suffix in importlib.machinery.BYTECODE_SUFFIXES
+    ]
+)
 
 __all__ = ["Module", "ModuleFinder"]
 
@@ -47,26 +74,53 @@ class ModuleFinder:
         zip_include_packages: Optional[List[str]] = None,
         constants_module=None,
         zip_includes: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        jobs: int = 1,
+        profiler: Optional[Profiler] = None,
+        stream_modules: bool = False,
     ):
         self.include_files = include_files or []
-        self.excludes = dict.fromkeys(excludes or [])
+        self.excludes = NameTrie(excludes or [])
         self.optimize_flag = 0
         self.path = path or sys.path
+        self._hooks = HookRegistry(self.path)
+        self.excludes.update(self._hooks.excludes)
         self.replace_paths = replace_paths or []
         self.zip_include_all_packages = zip_include_all_packages
         self.zip_exclude_packages = zip_exclude_packages or []
         self.zip_include_packages = zip_include_packages or []
         self.constants_module = constants_module
         self.zip_includes = zip_includes or []
+        self.cache: Optional[ModuleCache] = None
+        if cache_dir is not None:
+            self.cache = ModuleCache(cache_dir)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.profiler = profiler or Profiler(enabled=False)
+        # in streaming mode, the code of the modules is kept in a spool
+        self.code_spool: Optional[CodeSpool] = None
+        if stream_modules:
+            self.code_spool = CodeSpool()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shutdown: Optional[weakref.finalize] = None
+        self._prefetched: Dict[Tuple[str, int], Future] = {}
+        # the specs found to prefetch the imports, used when they are loaded
+        self._prefetched_specs: Dict[
+            Tuple[str, Tuple[str, ...]],
+            Optional[importlib.machinery.ModuleSpec],
+        ] = {}
+        self._path_index: Dict[str, Optional[PathIndex]] = {}
         self.modules = []
         self.aliases = {}
         self.exclude_dependent_files = {}
-        self._modules: Dict[str, Any] = dict.fromkeys(excludes or [])
+        self.include_file_callers: Dict[str, str] = {}
+        self._hook_callers: List[Module] = []
+        self._modules: Dict[str, Any] = {}
         self._builtin_modules = dict.fromkeys(sys.builtin_module_names)
         self._bad_modules = {}
-        self._hooks = __import__("cx_Freeze", fromlist=["hooks"]).hooks
-        self._hooks.initialize(self)
-        self.dist_cachedir = TemporaryDirectory(prefix="cxfreeze")
+        self.distributions = DistributionIndex(self.path)
+        self._queries = PackageQuery(
+            self.path, self.distributions, cache_dir=cache_dir
+        )
         self._add_base_modules()
 
     def _add_base_modules(self) -> None:
@@ -104,9 +158,7 @@ class ModuleFinder:
         """
         module = self._modules.get(name)
         if module is None:
-            module = Module(
-                name, path, file_name, parent, rootcachedir=self.dist_cachedir
-            )
+            module = Module(name, path, file_name, parent)
             self._modules[name] = module
             self.modules.append(module)
             if name in self._bad_modules:
@@ -151,11 +203,113 @@ class ModuleFinder:
             deferred_imports.append((caller, package_module, from_list))
         else:
             for name in from_list:
-                if name in package_module.global_names:
+                if package_module.has_global_name(name):
                     continue
                 sub_module_name = f"{package_module.name}.{name}"
                 self._import_module(sub_module_name, deferred_imports, caller)
 
+    def _find_spec(
+        self, name: str, path: List[str]
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        """
+        Find the spec of the named module in the given path, like the path
+        based finder of Python does, but looking up the names in an index of
+        the contents of each directory instead of listing them every time.
+        Namespace packages (including directories without __init__ used by
+        some packages to vendor modules) are returned with a spec without
+        origin and with the directories found as submodule search locations.
+        A spec already found to prefetch the module is used only once.
+        """
+        key = (name, None if path is None else tuple(path))
+        if key in self._prefetched_specs:
+            return self._prefetched_specs.pop(key)
+        tail = name.rpartition(".")[2]
+        namespace_path = []
+        for entry in sys.path if path is None else path:
+            if not isinstance(entry, str):
+                continue
+            index = self._get_path_index(entry)
+            if index is None:
+                # not a directory (zip file, egg, ...): use the importers
+                # that Python provides for it
+                try:
+                    spec = importlib.machinery.PathFinder.find_spec(
+                        name, [entry]
+                    )
+                except Exception:
+                    spec = None
+                if spec is not None and spec.loader is not None:
+                    return spec
+                continue
+            for _, filename, loader_class in index.get(tail, []):
+                location = os.path.join(entry or os.getcwd(), filename)
+                if loader_class is None:
+                    package_index = self._get_path_index(location) or {}
+                    for _, init_name, loader_class in package_index.get(
+                        "__init__", []
+                    ):
+                        if loader_class is not None:
+                            origin = os.path.join(location, init_name)
+                            loader = loader_class(name, origin)
+                            return importlib.util.spec_from_file_location(
+                                name,
+                                origin,
+                                loader=loader,
+                                submodule_search_locations=[location],
+                            )
+                    namespace_path.append(location)
+                else:
+                    loader = loader_class(name, location)
+                    return importlib.util.spec_from_file_location(
+                        name, location, loader=loader
+                    )
+        if namespace_path:
+            spec = importlib.machinery.ModuleSpec(name, None)
+            spec.submodule_search_locations = namespace_path
+            return spec
+        return None
+
+    def _get_path_index(self, entry: str) -> Optional[PathIndex]:
+        """
+        Return the index of the contents of the given directory, built once
+        with a single scan of the directory. The index maps each name to the
+        package directory and module files found for it, with their loaders,
+        in the order of precedence of the standard path based finder
+        (a directory is listed with loader None). None is returned if the
+        entry is not a directory.
+        """
+        try:
+            return self._path_index[entry]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(entry or os.getcwd()) as it:
+                dir_entries = list(it)
+        except OSError:
+            index = None if os.path.isfile(entry) else {}
+            self._path_index[entry] = index
+            return index
+        index: PathIndex = {}
+        for dir_entry in dir_entries:
+            filename = dir_entry.name
+            try:
+                is_dir = dir_entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                index.setdefault(filename, []).append((-1, filename, None))
+                continue
+            for position, (suffix, loader_class) in enumerate(FILE_LOADERS):
+                if filename.endswith(suffix) and len(filename) > len(suffix):
+                    name = filename[: -len(suffix)]
+                    index.setdefault(name, []).append(
+                        (position, filename, loader_class)
+                    )
+        for files in index.values():
+            files.sort(key=lambda file: file[0])
+        self._path_index[entry] = index
+        return index
+
     def _get_parent_by_name(self, name: str) -> Optional[Module]:
         """Return the parent module given the name of a module."""
         pos = name.rfind(".")
@@ -179,6 +333,7 @@ class ModuleFinder:
             except OSError:
                 continue
 
+            sub_modules = []
             for filename in filenames:
                 fullname = os.path.join(path, filename)
                 if os.path.isdir(fullname):
@@ -186,6 +341,7 @@ class ModuleFinder:
                     if not os.path.exists(init_file):
                         continue
                     name = filename
+                    fullname = init_file
                 else:
                     # We need to run through these in order to correctly pick
                     # up PEP 3149 library names (e.g. .cpython-32mu.so).
@@ -204,8 +360,13 @@ class ModuleFinder:
                         continue
                     if name == "__init__":
                         continue
+                sub_modules.append((f"{module.name}.{name}", name, fullname))
+
+            # the sub modules are compiled by the workers in parallel mode
+            for sub_module_name, _, fullname in sub_modules:
+                self._prefetch(sub_module_name, fullname)
 
-                sub_module_name = f"{module.name}.{name}"
+            for sub_module_name, name, _ in sub_modules:
                 sub_module = self._internal_import_module(
                     sub_module_name, deferred_imports
                 )
@@ -215,7 +376,7 @@ class ModuleFinder:
                             f"No module named {sub_module_name!r}"
                         )
                 else:
-                    module.global_names.add(name)
+                    module.add_global_name(name)
                     if sub_module.path and recursive:
                         self._import_all_sub_modules(
                             sub_module, deferred_imports, recursive
@@ -267,7 +428,9 @@ class ModuleFinder:
                     fullname, deferred_imports
                 )
                 if module is not None:
-                    parent.global_names.add(name)
+                    parent.add_global_name(name)
+                    if caller is not None:
+                        caller.imports[module.name] = None
                     return module
 
             module = self._internal_import_module(name, deferred_imports)
@@ -295,10 +458,14 @@ class ModuleFinder:
             if caller is None:
                 raise ImportError(f"No module named {name!r}")
             self._run_hook("missing", name, caller)
-            if name not in caller.ignore_names:
+            if not caller.has_ignore_name(name):
                 callers = self._bad_modules.setdefault(name, {})
                 callers[caller.name] = None
 
+        # otherwise, keep track of the import, to build the import graph
+        elif caller is not None:
+            caller.imports[module.name] = None
+
         return module
 
     def _internal_import_module(
@@ -309,6 +476,8 @@ class ModuleFinder:
         name given is an absolute name. None is returned if the module
         cannot be found.
         """
+        if name in self.excludes:
+            return None
         try:
             # Check in module cache before trying to import it again.
             return self._modules[name]
@@ -379,25 +548,7 @@ class ModuleFinder:
                 loader = None
         else:
             # Find modules to load
-            try:
-                # It's recommended to clear the caches first.
-                importlib.machinery.PathFinder.invalidate_caches()
-                spec = importlib.machinery.PathFinder.find_spec(name, path)
-            except KeyError:
-                if parent:
-                    # some packages use a directory with vendored modules
-                    # without an __init__py and are not considered namespace
-                    # packages, then simulate a subpackage
-                    path = [os.path.join(path[0], name.rpartition(".")[-1])]
-                    origin = os.path.join(path[0], "__init__.py")
-                    module = self._add_module(name, path=path, parent=parent)
-                    logging.debug("Adding module [%s] [PACKAGE]", name)
-                    module.code = compile("", origin, "exec")
-                    module.in_import = False
-                    return module
-                spec = None
-            except Exception:
-                spec = None
+            spec = self._find_spec(name, path)
             if spec is None:
                 return None
             # Handle special cases
@@ -423,46 +574,140 @@ class ModuleFinder:
                 path = spec.origin
                 module = self._add_module(name, file_name=path, parent=parent)
 
+        imports: Optional[ImportList] = None
         if isinstance(loader, importlib.machinery.SourceFileLoader):
             logging.debug("Adding module [%s] [SOURCE]", name)
-            # Load & compile Python source code
-            source_bytes = loader.get_data(path)
-            try:
-                module.code = loader.source_to_code(
-                    source_bytes, path, _optimize=self.optimize_flag
-                )
-            except SyntaxError:
-                logging.debug("Invalid syntax in [%s]", name)
-                raise ImportError(
-                    f"Invalid syntax in {path}", name=name
-                ) from None
+            module.code, imports = self._get_code(name, path, loader)
         elif isinstance(loader, importlib.machinery.SourcelessFileLoader):
             logging.debug("Adding module [%s] [BYTECODE]", name)
-            # Load Python bytecode
-            module.code = loader.get_code(name)
-            if module.code is None:
-                raise ImportError(f"Bad magic number in {path}", name=name)
+            module.code, imports = self._get_code(name, path, loader)
         elif isinstance(loader, importlib.machinery.ExtensionFileLoader):
             logging.debug("Adding module [%s] [EXTENSION]", name)
         else:
             raise ImportError(f"Unknown module loader in {path}", name=name)
+        code = module.code
 
         # If there's a custom hook for this module, run it.
         self._run_hook("load", module.name, module)
 
         if module.code is not None:
+            # the imports found previously are only valid if the hook has
+            # not replaced the code
+            if module.code is not code:
+                imports = None
+
             if self.replace_paths:
                 module.code = self._replace_paths_in_code(module)
 
             # Scan the module code for import statements
-            self._scan_code(module.code, module, deferred_imports)
+            self._scan_code(module.code, module, deferred_imports, imports)
 
             # Verify __package__ in use
             module.code = self._replace_package_in_code(module)
 
+            # the code is final, so it is written to the spool, if any
+            if self.code_spool is not None:
+                with self.profiler.phase("spool code", "finder"):
+                    module.spool_code(self.code_spool)
+
         module.in_import = False
         return module
 
+    def _get_code(
+        self, name: str, path: str, loader: ExecutionLoader
+    ) -> Tuple[CodeType, ImportList]:
+        """
+        Return the code of the module and the import operations found in it,
+        using the cache, if one is in use, to avoid compiling and scanning
+        modules that did not change since the previous build. The result
+        computed in advance by a worker process is used, if available.
+        """
+        is_source = isinstance(loader, importlib.machinery.SourceFileLoader)
+        future = self._prefetched.pop((path, self.optimize_flag), None)
+        if future is None:
+            return _compile_and_scan(
+                name, path, is_source, self.optimize_flag, self.cache
+            )
+        data, cache_hit = future.result()
+        if isinstance(data, str):
+            # the module is compiled again to raise the error of serial mode
+            return _compile_and_scan(
+                name, path, is_source, self.optimize_flag, self.cache
+            )
+        if self.cache is not None:
+            if cache_hit:
+                self.cache.hits += 1
+            else:
+                self.cache.misses += 1
+        return marshal.loads(data)
+
+    def _prefetch(self, name: str, path: str) -> None:
+        """
+        Submit the compilation and scanning of the given module file to the
+        worker processes, when running in parallel mode, so the result is
+        ready when the module is actually loaded.
+        """
+        if self.jobs < 2 or name in self._modules or name in self.excludes:
+            return
+        key = (path, self.optimize_flag)
+        if key in self._prefetched:
+            return
+        if path.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES)):
+            is_source = True
+        elif path.endswith(tuple(importlib.machinery.BYTECODE_SUFFIXES)):
+            is_source = False
+        else:
+            return
+        if self._executor is None:
+            cache_dir = self.cache.cache_dir if self.cache else None
+            self._executor = ProcessPoolExecutor(
+                self.jobs,
+                initializer=_init_worker,
+                initargs=(cache_dir,),
+            )
+            self._shutdown = weakref.finalize(
+                self, _shutdown_workers, self._executor, self._prefetched
+            )
+        self._prefetched[key] = self._executor.submit(
+            _worker_compile_and_scan,
+            name,
+            path,
+            is_source,
+            self.optimize_flag,
+        )
+
+    def _prefetch_imports(self, imports: ImportList) -> None:
+        """
+        Prefetch the absolute imports of a module that were not found yet.
+        """
+        if self.jobs < 2:
+            return
+        for op, *args in imports:
+            if op != IMPORT_NAME or args[1] != 0:
+                continue
+            name = args[0]
+            if name in self._modules or name in self.excludes:
+                continue
+            if name in self._builtin_modules or name in self.aliases:
+                continue
+            parent_name, _, _ = name.rpartition(".")
+            if parent_name:
+                parent = self._modules.get(parent_name)
+                if parent is None or not parent.path:
+                    continue
+                path = parent.path
+            else:
+                path = self.path
+            key = (name, tuple(path))
+            if key in self._prefetched_specs:
+                continue
+            spec = self._find_spec(name, path)
+            # the spec is kept for the import of the module, so it is not
+            # searched twice
+            self._prefetched_specs[key] = spec
+            if spec is not None and spec.has_location:
+                self._prefetch(name, spec.origin)
+
     def _replace_package_in_code(self, module: Module) -> CodeType:
         """
         Replace the value of __package__ directly in the code,
@@ -474,7 +719,7 @@ class ModuleFinder:
         if (
             module.parent is None
             or module.in_file_system
-            or "__package__" in module.global_names
+            or module.has_global_name("__package__")
             or code is None
         ):
             return code
@@ -542,42 +787,43 @@ class ModuleFinder:
         """
         Run hook (load or missing) for the given module if one is present.
         """
-        name = "{}_{}".format(hook, module_name.replace(".", "_"))
-        method = getattr(self._hooks, name, None)
+        method = self._hooks.get(hook, module_name)
         if method is not None:
-            method(self, *args)
+            name = "{}_{}".format(hook, module_name.replace(".", "_"))
+            # the modules and files included by a load hook are recorded as
+            # imported by the module of the hook
+            if hook == "load":
+                self._hook_callers.append(args[0])
+            try:
+                with self.profiler.phase(f"hook {name}", "hook"):
+                    method(self, *args)
+            finally:
+                if hook == "load":
+                    self._hook_callers.pop()
+            self.profiler.count("hooks run")
 
     def _scan_code(
         self,
         code,
         module: Module,
         deferred_imports: DeferredList,
-        top_level: bool = True,
+        imports: Optional[ImportList] = None,
     ):
         """
         Scan code, looking for imported modules and keeping track of the
         constants that have been created in order to better tell which
         modules are truly missing.
         """
-        arguments = []
+        if imports is None:
+            imports = _scan_imports(code)
+        self._prefetch_imports(imports)
         imported_module = None
-        for _index, op, arg in dis._unpack_opargs(code.co_code):
-
-            # keep track of constants (these are used for importing)
-            # immediately restart loop so arguments are retained
-            if op == LOAD_CONST:
-                arguments.append(code.co_consts[arg])
-                continue
+        for op, *args in imports:
 
             # import statement: attempt to import module
             if op == IMPORT_NAME:
-                name = code.co_names[arg]
-                if len(arguments) >= 2:
-                    relative_import_index, from_list = arguments[-2:]
-                else:
-                    relative_import_index = -1
-                    from_list = arguments[0] if arguments else []
-                if name not in module.exclude_names:
+                name, relative_import_index, from_list = args
+                if not module.has_exclude_name(name):
                     imported_module = self._import_module(
                         name, deferred_imports, module, relative_import_index
                     )
@@ -595,26 +841,13 @@ class ModuleFinder:
                             )
 
             # import * statement: copy all global names
-            elif (
-                op == IMPORT_STAR and top_level and imported_module is not None
-            ):
-                module.global_names.update(imported_module.global_names)
+            elif op == IMPORT_STAR:
+                if imported_module is not None:
+                    module.add_star_import(imported_module)
 
             # store operation: track only top level
-            elif top_level and op in STORE_OPS:
-                name = code.co_names[arg]
-                module.global_names.add(name)
-
-            # reset arguments; these are only needed for import statements so
-            # ignore them in all other cases!
-            arguments = []
-
-        # Scan the code objects from function & class definitions
-        for constant in code.co_consts:
-            if isinstance(constant, type(code)):
-                self._scan_code(
-                    constant, module, deferred_imports, top_level=False
-                )
+            else:
+                module.add_global_name(args[0])
 
     def AddAlias(self, name: str, alias_for: str) -> None:
         """
@@ -636,13 +869,8 @@ class ModuleFinder:
     def ExcludeModule(self, name: str) -> None:
         """
         Exclude the named module and its submodules from the resulting frozen
-        executable."""
-        modules_to_exclude = [name] + [
-            mod for mod in self._modules if mod.startswith(f"{name}.")
-        ]
-        for mod in modules_to_exclude:
-            self.excludes[mod] = None
-            self._modules[mod] = None
+        executable; the name can be a glob pattern, like *.tests."""
+        self.excludes.add(name)
 
     def IncludeFile(self, path: str, name: Optional[str] = None) -> Module:
         """Include the named file as a module in the frozen executable."""
@@ -661,20 +889,22 @@ class ModuleFinder:
     ) -> None:
         """Include the files in the given directory in the target build."""
         self.include_files.append((source_path, target_path))
+        if self._hook_callers:
+            caller = self._hook_callers[-1]
+            self.include_file_callers[source_path] = caller.name
         if not copy_dependent_files:
             self.ExcludeDependentFiles(source_path)
 
     def IncludeModule(self, name: str) -> Module:
         """Include the named module in the frozen executable."""
         # includes has priority over excludes
-        if name in self.excludes and name in self._modules:
-            if self._modules[name] is None:
-                self.excludes.pop(name)
-                self._modules.pop(name)
+        self.excludes.discard(name)
         # include module
         deferred_imports: DeferredList = []
         module = self._import_module(name, deferred_imports)
         self._import_deferred_imports(deferred_imports, skip_in_import=True)
+        if self._hook_callers:
+            self._hook_callers[-1].imports[module.name] = None
         return module
 
     def IncludePackage(self, name: str) -> Module:
@@ -686,8 +916,20 @@ class ModuleFinder:
         if module.path:
             self._import_all_sub_modules(module, deferred_imports)
         self._import_deferred_imports(deferred_imports, skip_in_import=True)
+        if self._hook_callers:
+            self._hook_callers[-1].imports[module.name] = None
         return module
 
+    def QueryPackage(self, name: str, source: str) -> Any:
+        """
+        Return the value that the given code assigns to the name result,
+        run in a helper process, so the package of the given name is never
+        imported by the freezer; the answer is cached by package version.
+        Raises ImportError if the query fails.
+        """
+        with self.profiler.phase("package query", package=name):
+            return self._queries.run(name, source)
+
     def ReportMissingModules(self) -> None:
         """Display a list of modules that weren't found."""
         if self._bad_modules:
@@ -703,6 +945,13 @@ class ModuleFinder:
                 "may not be needed on this platform.\n"
             )
 
+    def InvalidateCaches(self) -> None:
+        """
+        Discard the index of the directories in the path, so the files
+        created or removed after the modules were searched can be found.
+        """
+        self._path_index.clear()
+
     def SetOptimizeFlag(self, optimize_flag: int) -> int:
         """Set a new value of optimize flag and returns the previous value."""
         previous = self.optimize_flag
@@ -713,8 +962,147 @@ class ModuleFinder:
             self.optimize_flag = optimize_flag
         return previous
 
+    def ShutdownWorkers(self) -> None:
+        """
+        Cancel the compilations done in parallel that were not used and
+        shut down the worker processes, once the modules are found.
+        """
+        if self._shutdown is not None:
+            self._shutdown()
+            self._shutdown = None
+            self._executor = None
+
     def ZipIncludeFiles(self, source_path, target_path):
         """
         Include files or all of the files in a directory to the zip file.
         """
         self.zip_includes.append((source_path, target_path))
+
+
+def _compile_and_scan(
+    name: str,
+    path: str,
+    is_source: bool,
+    optimize_flag: int,
+    cache: Optional[ModuleCache] = None,
+) -> Tuple[CodeType, ImportList]:
+    """
+    Compile (or load the bytecode of) the given module file and scan the
+    resulting code for imports, using the cache if one is given.
+    """
+    if cache is not None:
+        entry = cache.get(path, optimize_flag)
+        if entry is not None:
+            return entry
+    if is_source:
+        # Load & compile Python source code
+        loader = importlib.machinery.SourceFileLoader(name, path)
+        source_bytes = loader.get_data(path)
+        try:
+            code = loader.source_to_code(
+                source_bytes, path, _optimize=optimize_flag
+            )
+        except SyntaxError:
+            logging.debug("Invalid syntax in [%s]", name)
+            raise ImportError(f"Invalid syntax in {path}", name=name) from None
+    else:
+        # Load Python bytecode
+        loader = importlib.machinery.SourcelessFileLoader(name, path)
+        code = loader.get_code(name)
+        if code is None:
+            raise ImportError(f"Bad magic number in {path}", name=name)
+    imports = _scan_imports(code)
+    if cache is not None:
+        cache.set(path, optimize_flag, code, imports)
+    return code, imports
+
+
+_worker_cache: Optional[ModuleCache] = None
+
+
+def _init_worker(cache_dir: Optional[str]) -> None:
+    """Initialize a worker process used in parallel mode."""
+    global _worker_cache
+    if cache_dir is not None:
+        _worker_cache = ModuleCache(cache_dir)
+
+
+def _shutdown_workers(
+    executor: ProcessPoolExecutor, prefetched: Dict[Tuple[str, int], Future]
+) -> None:
+    """Cancel the compilations that were not used and shut down the worker
+    processes."""
+    for future in prefetched.values():
+        future.cancel()
+    prefetched.clear()
+    executor.shutdown()
+
+
+def _worker_compile_and_scan(
+    name: str, path: str, is_source: bool, optimize_flag: int
+) -> Tuple[Union[bytes, str], bool]:
+    """
+    Run _compile_and_scan in a worker process. Code objects cannot be
+    pickled, so the result is returned marshaled, or as the message of the
+    error raised, along with a flag that tells if the cache was used.
+    """
+    hits = _worker_cache.hits if _worker_cache else 0
+    try:
+        result = _compile_and_scan(
+            name, path, is_source, optimize_flag, _worker_cache
+        )
+        data = marshal.dumps(result)
+    except (ImportError, OSError, SyntaxError) as exc:
+        data = str(exc)
+    cache_hit = _worker_cache is not None and _worker_cache.hits > hits
+    return data, cache_hit
+
+
+def _scan_imports(code: CodeType, top_level: bool = True) -> ImportList:
+    """
+    Return the operations of the code that are relevant to find the imported
+    modules, in the order they must be processed: tuples of the form
+    (IMPORT_NAME, name, relative_import_index, from_list) for each import
+    statement, (IMPORT_STAR,) for each import * statement and
+    (STORE_NAME, name) for each name stored at the top level. The code
+    objects of functions and classes are scanned after the top level code.
+    """
+    imports: ImportList = []
+    arguments = []
+    for _index, op, arg in dis._unpack_opargs(code.co_code):
+
+        # keep track of constants (these are used for importing)
+        # immediately restart loop so arguments are retained
+        if op == LOAD_CONST:
+            arguments.append(code.co_consts[arg])
+            continue
+
+        # import statement
+        if op == IMPORT_NAME:
+            name = code.co_names[arg]
+            if len(arguments) >= 2:
+                relative_import_index, from_list = arguments[-2:]
+            else:
+                relative_import_index = -1
+                from_list = arguments[0] if arguments else []
+            imports.append(
+                (IMPORT_NAME, name, relative_import_index, from_list)
+            )
+
+        # import * statement: only relevant at the top level
+        elif op == IMPORT_STAR and top_level:
+            imports.append((IMPORT_STAR,))
+
+        # store operation: track only top level
+        elif top_level and op in STORE_OPS:
+            imports.append((STORE_NAME, code.co_names[arg]))
+
+        # reset arguments; these are only needed for import statements so
+        # ignore them in all other cases!
+        arguments = []
+
+    # Scan the code objects from function & class definitions
+    for constant in code.co_consts:
+        if isinstance(constant, type(code)):
+            imports.extend(_scan_imports(constant, top_level=False))
+    return imports
@@ -2,30 +2,43 @@
 Base class for freezing scripts into executables.
 """
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from distutils.dist import DistributionMetadata
+import _imp
 import distutils.sysconfig
 import distutils.util
+from fnmatch import fnmatch
+import hashlib
 from importlib.util import MAGIC_NUMBER
-import marshal
 import os
 import shutil
 import stat
 import struct
 import sys
 import sysconfig
+import threading
 import time
 from typing import Any, Dict, List, Optional, Union
 import zipfile
 
+from .archive import ArchiveWriter, STARTUP_MODULES
 from .common import get_resource_file_path, process_path_specs
 from .darwintools import DarwinFile, MachOReference, DarwinFileTracker
+from .dedupe import ContentIndex, is_shared_library
 from .exception import ConfigError
 from .executable import Executable
 from .finder import ModuleFinder
+from .frozentable import EMBEDDED_MODULES, FrozenTable
+from .importtrace import ImportTrace
+from .manifest import BuildManifest
 from .module import ConstantsModule
+from .profiler import Profiler
+from .sizereport import SizeReport
+from .zipwriter import CompressionPolicy, ZipWriter
 
-if sys.platform == "linux":
-    from .patchelf import Patchelf
+if sys.platform not in ("darwin", "win32"):
+    from .patchelf import ELFFile, Patchelf
 if sys.platform == "win32":
     from . import winmsvcr
     from . import util as winutil
@@ -63,6 +76,25 @@ class Freezer:
         includeMSVCR: bool = False,
         zipIncludePackages: Optional[List[str]] = None,
         zipExcludePackages: Optional[List[str]] = None,
+        cacheDir: Optional[str] = None,
+        jobs: int = 1,
+        incremental: bool = False,
+        compressLevel: Optional[int] = None,
+        compressMinSize: int = 0,
+        compressRules: Optional[List] = None,
+        archiveFormat: str = "zip",
+        embedModules: bool = False,
+        originRpath: bool = False,
+        importTrace: bool = False,
+        traceFiles: Optional[List[str]] = None,
+        excludeUntraced: bool = False,
+        archiveOrder: str = "name",
+        profile: bool = False,
+        profileTrace: Optional[str] = None,
+        sizeReport: bool = False,
+        packageDataExcludes: Optional[List[str]] = None,
+        dedupeLibraries: Optional[str] = None,
+        streamModules: bool = False,
     ):
         self.executables = list(executables)
         self.constants_module = constantsModule or ConstantsModule()
@@ -88,6 +120,25 @@ class Freezer:
         self.metadata = metadata
         self.zipIncludePackages = zipIncludePackages
         self.zipExcludePackages = zipExcludePackages
+        self.cache_dir = cacheDir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.incremental = incremental
+        self.compress_level = compressLevel
+        self.compress_min_size = compressMinSize
+        self.compress_rules = list(compressRules or [])
+        self.archive_format = archiveFormat or "zip"
+        self.embed_modules = embedModules
+        self.origin_rpath = originRpath
+        self.import_trace = importTrace
+        self.trace_files = list(traceFiles or [])
+        self.exclude_untraced = excludeUntraced
+        self.archive_order = archiveOrder or "name"
+        self.profile_trace = profileTrace
+        self.profiler = Profiler(profile or bool(profileTrace))
+        self.size_report = sizeReport
+        self.package_data_excludes = list(packageDataExcludes or [])
+        self.dedupe_libraries = dedupeLibraries
+        self.stream_modules = streamModules
         self._VerifyConfiguration()
 
     def _AddVersionResource(self, exe):
@@ -114,6 +165,41 @@ class Freezer:
         )
         version_stamp(filename, versionInfo)
 
+    def _ApplyImportTraces(self):
+        """
+        Report the modules that were found but that none of the import
+        traces imported or, if requested, exclude them. The modules needed
+        to start the executables are always kept.
+        """
+        finder: ModuleFinder = self.finder
+        keep = {"__importtrace__"}
+        for exe in self.executables:
+            keep.update((exe.init_module_name, exe.main_module_name))
+        untraced = sorted(
+            module.name
+            for module in finder.modules
+            if module.name not in finder.excludes
+            and module.name not in self.import_traces
+            and module.name not in keep
+            and module.name.partition(".")[0] not in EMBEDDED_MODULES
+        )
+        if not untraced:
+            return
+        if self.exclude_untraced:
+            for name in untraced:
+                finder.ExcludeModule(name)
+        if self.silent < 2:
+            if self.exclude_untraced:
+                print("Excluded modules not imported by the import traces:")
+            else:
+                print("Modules not imported by the import traces:")
+            for name in untraced:
+                print("-", name)
+            print(
+                f"{len(untraced)} of {len(finder.modules)} modules, according "
+                f"to {len(self.import_traces.files)} traces.\n"
+            )
+
     def _CopyFile(
         self,
         source,
@@ -129,41 +215,49 @@ class Freezer:
         normalizedTarget = os.path.normcase(os.path.normpath(target))
         norm_target_name = os.path.basename(normalizedTarget)
 
-        # fix the target path for C runtime files
-        if norm_target_name in self.runtime_files:
-            target_name = os.path.basename(target)
-            target = os.path.join(self.targetdir, "lib", target_name)
-            # vcruntime140.dll must be in the root and in the lib directory
-            if norm_target_name in self.runtime_files_to_dup:
-                self.runtime_files_to_dup.remove(norm_target_name)
-                self._CopyFile(source, target, copyDependentFiles=False)
-                target = os.path.join(self.targetdir, target_name)
-            normalizedTarget = os.path.normcase(os.path.normpath(target))
-
-        if normalizedTarget in self.files_copied:
-            if sys.platform == "darwin" and (machOReference is not None):
-                # If file was already copied, and we are following a reference
-                # from a DarwinFile, then we need to tell the reference where
-                # the file was copied to (so the reference can later be updated).
-                copiedDarwinFile = self.darwinTracker.getDarwinFile(
-                    sourcePath=normalizedSource, targetPath=normalizedTarget
-                )
-                machOReference.setTargetFile(darwinFile=copiedDarwinFile)
-            return
-        if normalizedSource == normalizedTarget:
-            return
+        # the dependencies are copied by the pool of copy threads, so the
+        # files are claimed under the lock
+        with self._copy_lock:
+            # fix the target path for C runtime files
+            if norm_target_name in self.runtime_files:
+                target_name = os.path.basename(target)
+                target = os.path.join(self.targetdir, "lib", target_name)
+                # vcruntime140.dll must be in the root and in the lib
+                # directory
+                if norm_target_name in self.runtime_files_to_dup:
+                    self.runtime_files_to_dup.remove(norm_target_name)
+                    self._CopyFile(source, target, copyDependentFiles=False)
+                    target = os.path.join(self.targetdir, target_name)
+                normalizedTarget = os.path.normcase(os.path.normpath(target))
+
+            if normalizedTarget in self.files_copied:
+                if sys.platform == "darwin" and (machOReference is not None):
+                    # If file was already copied, and we are following a
+                    # reference from a DarwinFile, then we need to tell the
+                    # reference where the file was copied to (so the
+                    # reference can later be updated).
+                    copiedDarwinFile = self.darwinTracker.getDarwinFile(
+                        sourcePath=normalizedSource,
+                        targetPath=normalizedTarget,
+                    )
+                    machOReference.setTargetFile(darwinFile=copiedDarwinFile)
+                return
+            if normalizedSource == normalizedTarget:
+                return
+            self.files_copied.add(normalizedTarget)
+            if self._size_report is not None:
+                self._size_report.add_file(source, os.path.getsize(source))
         targetdir = os.path.dirname(target)
         self._CreateDirectory(targetdir)
         if self.silent < 1:
             print(f"copying {source} -> {target}")
-        shutil.copyfile(source, target)
-        shutil.copystat(source, target)
-        if includeMode:
-            shutil.copymode(source, target)
-        self.files_copied.add(normalizedTarget)
 
         newDarwinFile = None
         if sys.platform == "darwin":
+            # the Mach-O references are fixed after the copy, in the final
+            # pass, so copy the file right away
+            self._CopyFileData(source, target, includeMode)
+
             # The file was not previously copied, so need to create a
             # DarwinFile file object to represent the file being copied.
             referencingFile = None
@@ -179,13 +273,15 @@ class Freezer:
                 targetPath=normalizedTarget, darwinFile=newDarwinFile
             )
 
-        if (
+        copyDependentFiles = (
             copyDependentFiles
             and source not in self.finder.exclude_dependent_files
-        ):
-            # Always copy dependent files on root directory
-            # to allow to set relative reference
-            if sys.platform == "darwin":
+        )
+
+        # Always copy dependent files on root directory
+        # to allow to set relative reference
+        if sys.platform == "darwin":
+            if copyDependentFiles:
                 targetdir = self.targetdir
                 for dependent_file in self._GetDependentFiles(
                     source, darwinFile=newDarwinFile
@@ -201,16 +297,69 @@ class Freezer:
                             path=dependent_file
                         ),
                     )
-            elif sys.platform == "win32":
+        else:
+            # the dependencies of the file are read by the same job that
+            # copies it, and are queued in turn
+            self._QueueCopyJob(
+                self._CopyFileAndDependencies,
+                source,
+                target,
+                copyDependentFiles,
+                includeMode,
+            )
+
+    def _CopyFileAndDependencies(
+        self,
+        source: str,
+        target: str,
+        copyDependentFiles: bool,
+        includeMode: bool = False,
+    ):
+        """
+        Copy the file and queue the copies of its dependencies, if
+        requested, fixing the rpath of the copy on Linux (not on Mac OS X,
+        where the Mach-O references are fixed once all the files are
+        copied).
+        """
+        targetdir = os.path.dirname(target)
+        if sys.platform == "win32":
+            self._CopyFileData(source, target, includeMode)
+            if copyDependentFiles:
                 for dependent_file in self._GetDependentFiles(source):
                     target = os.path.join(
                         targetdir, os.path.basename(dependent_file)
                     )
                     self._CopyFile(dependent_file, target, copyDependentFiles)
-            else:
+        else:
+            # the dependencies are planned first, so the rpath can be fixed
+            # by the same job that copies the file
+            dependencies = []
+            fix_rpath = set()
+            library_dir = os.path.join(self.targetdir, "lib")
+            origin_rpath = []
+            elf = None
+            if self.origin_rpath:
+                # only the executables and shared objects loaded by the
+                # dynamic linker can have an rpath, not the data files
+                try:
+                    elf = ELFFile(source)
+                except (OSError, ValueError):
+                    pass
+            if elf is not None and elf.dynamic:
+                # the directory of the executables and the lib directory are
+                # searched first, as ConsoleSetLibPath does at runtime
+                for path in (self.targetdir, library_dir):
+                    rel_path = os.path.relpath(path, targetdir)
+                    if rel_path == os.curdir:
+                        origin_rpath.append("$ORIGIN")
+                    else:
+                        origin_rpath.append(f"$ORIGIN/{rel_path}")
+                current_rpath = elf.runpath or elf.rpath or ""
+                for path in current_rpath.split(":"):
+                    if path.startswith("$ORIGIN") and path not in origin_rpath:
+                        origin_rpath.append(path)
+            if copyDependentFiles:
                 source_dir = os.path.dirname(source)
-                library_dir = os.path.join(self.targetdir, "lib")
-                fix_rpath = set()
                 for dependent_file in self._GetDependentFiles(source):
                     dep_base = os.path.basename(dependent_file)
                     dep_abs = os.path.abspath(dependent_file)
@@ -222,22 +371,187 @@ class Freezer:
                     if dep_libs:
                         fix_rpath.add(dep_libs)
                     dependent_target = os.path.join(targetdir, dep_rel)
-                    self._CopyFile(
-                        dependent_file,
-                        dependent_target,
-                        copyDependentFiles,
+                    dependencies.append((dependent_file, dependent_target))
+            rpath = origin_rpath + [f"$ORIGIN/{r}" for r in sorted(fix_rpath)]
+            rpath = ":".join(rpath) or None
+            self._CopyFileData(source, target, includeMode, rpath)
+            for dependent_file, dependent_target in dependencies:
+                self._CopyFile(
+                    dependent_file,
+                    dependent_target,
+                    copyDependentFiles,
+                )
+
+
+    def _CopyFileData(
+        self,
+        source: str,
+        target: str,
+        includeMode: bool = False,
+        rpath: Optional[str] = None,
+    ):
+        """
+        Copy the contents and the stats (and the mode, if requested) of the
+        file, setting the rpath of the copy if one is given. In incremental
+        mode, a copy that is up to date is left alone.
+        """
+        options = [includeMode, rpath]
+        if self.manifest is not None and self.manifest.is_up_to_date(
+            target, source, options
+        ):
+            return
+        if os.path.lexists(target):
+            # a previous build may have left a read-only copy
+            os.remove(target)
+        with self.profiler.phase("copy file", "copy"):
+            shutil.copyfile(source, target)
+            shutil.copystat(source, target)
+            if includeMode:
+                shutil.copymode(source, target)
+        if self.profiler.enabled:
+            self.profiler.count("files copied")
+            self.profiler.count("bytes copied", os.path.getsize(target))
+        if rpath:
+            with self.profiler.phase("set rpath", "copy", file=target):
+                self.patchelf.set_rpath(target, rpath)
+        if self.manifest is not None:
+            self.manifest.add(target, source, options)
+
+    def _CopyPackageData(
+        self, sourceDir: str, targetDir: str, ignore, packageName: str
+    ):
+        """
+        Copy the data files of a package, like shutil.copytree, but allowing
+        the target directory to exist, as it does in incremental mode. The
+        directories of the excluded subpackages and the files and
+        directories matching the package data excludes are skipped while
+        walking, so they are never copied; the files are copied by the pool
+        of jobs.
+        """
+        excludes = self.finder.excludes
+        patterns = self.package_data_excludes
+        for path, dirnames, filenames in os.walk(sourceDir, followlinks=True):
+            relPath = os.path.relpath(path, sourceDir)
+            name = packageName
+            if relPath != os.curdir:
+                name += "." + relPath.replace(os.sep, ".")
+            ignored = set(ignore(path, dirnames + filenames))
+            ignored.update(
+                dirname
+                for dirname in dirnames
+                if f"{name}.{dirname}" in excludes
+            )
+            if patterns:
+                # the patterns match the name of the file or directory or
+                # its path from the directory of the top level package
+                prefix = name.replace(".", "/") + "/"
+                for entry in dirnames + filenames:
+                    if any(
+                        fnmatch(entry, pattern)
+                        or fnmatch(prefix + entry, pattern)
+                        for pattern in patterns
+                    ):
+                        ignored.add(entry)
+            dirnames[:] = [d for d in dirnames if d not in ignored]
+            fullTargetDir = os.path.normpath(os.path.join(targetDir, relPath))
+            os.makedirs(fullTargetDir, exist_ok=True)
+            size = 0
+            for filename in filenames:
+                if filename not in ignored:
+                    sourcePath = os.path.join(path, filename)
+                    self._QueueCopyFileData(
+                        sourcePath, os.path.join(fullTargetDir, filename)
                     )
-                if fix_rpath:
-                    has_rpath = self.patchelf.get_rpath(target)
-                    rpath = ":".join([f"$ORIGIN/{r}" for r in fix_rpath])
-                    if has_rpath != rpath:
-                        self.patchelf.set_rpath(target, rpath)
+                    if self._size_report is not None:
+                        size += os.path.getsize(sourcePath)
+            if size:
+                # the data of a directory belongs to its subpackage
+                self._size_report.add_data(name, size)
 
     def _CreateDirectory(self, path: str):
         if (self.silent < 1) and not os.path.isdir(path):
             print("creating directory %s" % path)
         os.makedirs(path, exist_ok=True)
 
+    def _DedupeLibraries(self):
+        """
+        Replace the copies of the shared libraries which have the same
+        contents as another copy with hard links or relative symbolic links
+        to it or, in needed mode, remove them and make the files that load
+        them load the copy kept instead, editing their DT_NEEDED entries and
+        their rpaths.
+        """
+        libraries = sorted(
+            path for path in self.files_copied if is_shared_library(path)
+        )
+        groups = ContentIndex(self.jobs).duplicates(libraries)
+        if not groups:
+            return
+        elf_files = {}
+        if self.dedupe_libraries == "needed":
+            for path in sorted(self.files_copied):
+                try:
+                    elf_files[path] = ELFFile(path)
+                except (OSError, ValueError):
+                    pass
+        saved = 0
+        for canonical, *duplicates in groups:
+            for duplicate in duplicates:
+                saved += os.path.getsize(duplicate)
+                if self.silent < 1:
+                    print(f"deduplicating {duplicate} -> {canonical}")
+                if self.dedupe_libraries == "needed":
+                    if self._ReplaceNeeded(elf_files, duplicate, canonical):
+                        os.remove(duplicate)
+                        if self.manifest is not None:
+                            self.manifest.forget(duplicate)
+                        continue
+                    # a file may still load the duplicate, which is linked
+                    # to the canonical copy instead of being removed
+                    if self.silent < 1:
+                        print(f"keeping {duplicate}, needed by other files")
+                # the link replaces the copy atomically
+                temp_path = duplicate + ".dedupe"
+                if os.path.lexists(temp_path):
+                    os.remove(temp_path)
+                if self.dedupe_libraries == "symlink":
+                    os.symlink(
+                        os.path.relpath(canonical, os.path.dirname(duplicate)),
+                        temp_path,
+                    )
+                else:
+                    os.link(canonical, temp_path)
+                os.replace(temp_path, duplicate)
+                if self.manifest is not None:
+                    self.manifest.update_target(duplicate)
+        count = sum(len(group) - 1 for group in groups)
+        self.profiler.count("libraries deduplicated", count)
+        self.profiler.count("bytes deduplicated", saved)
+        if self.silent < 1:
+            print(f"deduplicated {count} libraries, saving {saved} bytes")
+
+    def _EmbedModules(self, exe):
+        """Append to the executable the table of the modules imported at
+        startup, which the base executable installs as frozen modules."""
+        finder: ModuleFinder = self.finder
+        table = FrozenTable()
+        exe_modules = (exe.init_module_name, exe.main_module_name)
+        for module in finder.modules:
+            if not module.has_code or module.name in finder.excludes:
+                continue
+            if _imp.is_frozen(module.name):
+                continue
+            if (
+                module.name.partition(".")[0] in EMBEDDED_MODULES
+                or module.name in exe_modules
+            ):
+                data = module.dump_code()
+                table.add(module.name, data, module.path is not None)
+        target_path = os.path.join(self.targetdir, exe.target_name)
+        if self.silent < 1:
+            print(f"embedding {len(table)} modules in {target_path}")
+        table.append_to(target_path)
+
     def _FreezeExecutable(self, exe):
         finder: ModuleFinder = self.finder
         finder.IncludeFile(exe.main_script, exe.main_module_name)
@@ -307,12 +621,16 @@ class Freezer:
                     source, target, copyDependentFiles=True, includeMode=True
                 )
         target_path = os.path.join(self.targetdir, exe.target_name)
+        # the executable is modified after the copy, so it is always replaced
+        if self.manifest is not None:
+            self.manifest.invalidate(target_path)
         self._CopyFile(
             exe.base,
             target_path,
             copyDependentFiles=False,
             includeMode=True,
         )
+        self._WaitForCopies()
         if not os.access(target_path, os.W_OK):
             mode = os.stat(target_path).st_mode
             os.chmod(target_path, mode | stat.S_IWUSR)
@@ -397,98 +715,128 @@ class Freezer:
 
     def _GetDependentFiles(self, path, darwinFile: DarwinFile = None) -> List:
         """Return the file's dependencies using platform-specific tools (the
-        imagehlp library on Windows, otool on Mac OS X and ldd on Linux);
-        limit this list by the exclusion lists as needed"""
+        imagehlp library on Windows, otool on Mac OS X and the ELF reader of
+        the patchelf module on Linux); limit this list by the exclusion lists
+        as needed"""
         path = os.path.normcase(path)
         dependentFiles = self.dependentFiles.get(path, [])
         if not dependentFiles:
-            if sys.platform == "win32":
-                if path.endswith((".exe", ".dll", ".pyd")):
-                    origPath = os.environ["PATH"]
-                    os.environ["PATH"] = (
-                        origPath + os.pathsep + os.pathsep.join(sys.path)
-                    )
-                    try:
-                        dependentFiles = winutil.GetDependentFiles(path)
-                    except winutil.BindError as exc:
-                        # Sometimes this gets called when path is not actually
-                        # a library (See issue 88).
-                        if self.silent < 3:
-                            print("error during GetDependentFiles() of ", end="")
-                            print(f"{path!r}: {exc!s}")
-                    os.environ["PATH"] = origPath
-            elif sys.platform == "darwin":
-                # if darwinFile is None (which means that _GetDependentFiles is
-                # being called outside of _CopyFile -- e.g., one of the
-                # preliminary calls in _FreezeExecutable), create a temporary
-                # DarwinFile object for the path, just so we can read its
-                # dependencies
-                if darwinFile is None:
-                    darwinFile = DarwinFile(
-                        originalFilePath=path, referencingFile=None
-                    )
-                dependentFiles = darwinFile.getDependentFilePaths()
-
-                # cache the MachOReferences to the dependencies, so they can be
-                # called up later in _CopyFile if copying a dependency without
-                # an explicit reference provided
-                # (to assist in resolving @rpaths)
-                for reference in darwinFile.getMachOReferenceList():
-                    if reference.isResolved():
-                        self.darwinTracker.cacheReferenceTo(
-                            sourcePath=reference.resolvedReferencePath,
-                            machOReference=reference,
-                        )
-            else:
-                if not os.access(path, os.X_OK):
-                    self.dependentFiles[path] = []
-                    return []
-                command = f"ldd {path!r}"
-                splitString = " => "
-                dependentFileIndex = 1
-                for line in os.popen(command):
-                    parts = line.expandtabs().strip().split(splitString)
-                    if len(parts) != 2:
-                        continue
-                    dependentFile = parts[dependentFileIndex].strip()
-                    if dependentFile == os.path.basename(path):
-                        continue
-                    if dependentFile in ("not found", "(file not found)"):
-                        filename = parts[0]
-                        if filename not in self.linkerWarnings:
-                            self.linkerWarnings[filename] = None
-                            if self.silent < 3:
-                                print("WARNING: cannot find %s" % filename)
-                        continue
-                    if dependentFile.startswith("("):
-                        continue
-                    pos = dependentFile.find(" (")
-                    if pos >= 0:
-                        dependentFile = dependentFile[:pos].strip()
-                    if dependentFile:
-                        dependentFiles.append(dependentFile)
+            self.profiler.count("dependency lookups")
+            with self.profiler.phase(
+                "dependent files", "dependencies", file=path
+            ):
+                dependentFiles = self._ReadDependentFiles(path, darwinFile)
             self.dependentFiles[path] = dependentFiles
         return dependentFiles
 
+    def _GetImportOrder(self, modules) -> Dict[str, int]:
+        """
+        Return the rank of each module in the order in which the modules are
+        expected to be imported: first the order of the import traces, if
+        any, then a breadth first search of the import graph starting at the
+        modules imported by Python itself, the startup script and the init
+        and main scripts of the executables. Packages are ranked before
+        their submodules.
+        """
+        modules_by_name = {module.name: module for module in modules}
+        order: Dict[str, int] = {}
+
+        def add(name: str) -> None:
+            if name in order or name not in modules_by_name:
+                return
+            parent_name = name.rpartition(".")[0]
+            if parent_name:
+                add(parent_name)
+            order[name] = len(order)
+
+        if self.import_traces is not None:
+            for name in self.import_traces.ordered():
+                add(name)
+        roots = ["encodings", "io", "__startup__"]
+        for exe in self.executables:
+            roots += [exe.init_module_name, exe.main_module_name]
+        queue = deque(roots)
+        seen = set(roots)
+        while queue:
+            name = queue.popleft()
+            add(name)
+            module = modules_by_name.get(name)
+            if module is None:
+                continue
+            for imported_name in module.imports:
+                if imported_name not in seen:
+                    seen.add(imported_name)
+                    queue.append(imported_name)
+        return order
+
+    def _GetInputsDigest(self, inputs: List) -> str:
+        """Return a digest of the inputs of a file written by the freezer,
+        used in incremental mode to find out if it needs to be written
+        again."""
+        inputs = [self.optimize_flag, self.replacePaths, inputs]
+        return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+    def _GetModuleData(self, module, header: bytes = b"") -> bytes:
+        """Return the marshaled code of the module, preceded by the header
+        of a pyc file, if given."""
+        with self.profiler.phase("marshal", "modules"):
+            data = header + module.dump_code()
+        self.profiler.count("modules marshaled")
+        return data
+
     def _GetModuleFinder(self) -> ModuleFinder:
-        finder = ModuleFinder(
-            self.includeFiles,
-            self.excludes,
-            self.path,
-            self.replacePaths,
-            self.zipIncludeAllPackages,
-            self.zipExcludePackages,
-            self.zipIncludePackages,
-            self.constants_module,
-            self.zipIncludes,
-        )
+        with self.profiler.phase("finder construction", "finder"):
+            finder = ModuleFinder(
+                self.includeFiles,
+                self.excludes,
+                self.path,
+                self.replacePaths,
+                self.zipIncludeAllPackages,
+                self.zipExcludePackages,
+                self.zipIncludePackages,
+                self.constants_module,
+                self.zipIncludes,
+                self.cache_dir,
+                self.jobs,
+                profiler=self.profiler,
+                stream_modules=self.stream_modules,
+            )
         finder.SetOptimizeFlag(self.optimize_flag)
+        if self.origin_rpath and sys.platform not in ("darwin", "win32"):
+            finder.AddConstant("ORIGIN_RPATH", True)
+        if self.archive_format == "indexed":
+            finder.AddConstant("INDEXED_ARCHIVE", True)
+            finder.IncludeModule("mmap")
+            finder.IncludeFile(
+                get_resource_file_path("initscripts", "__archive__", ".py")
+            )
+        if self.import_trace:
+            finder.AddConstant("IMPORT_TRACE", True)
+            finder.IncludeFile(
+                get_resource_file_path("initscripts", "__importtrace__", ".py")
+            )
         for name in self.includes:
-            finder.IncludeModule(name)
+            with self.profiler.phase("include module", "finder", module=name):
+                finder.IncludeModule(name)
         for name in self.packages:
-            finder.IncludePackage(name)
+            with self.profiler.phase(
+                "include package", "finder", package=name
+            ):
+                finder.IncludePackage(name)
         return finder
 
+    def _GetModuleInputs(self, module) -> List:
+        """Return the inputs of the compiled code of the module."""
+        if module.name == self.constants_module.module_name:
+            # the build timestamp alone does not require a new build
+            values = dict(self.constants_module.values)
+            values.pop("BUILD_TIMESTAMP", None)
+            return [module.name, sorted(values.items())]
+        if module.file is None or module.source_is_zip_file:
+            return [module.name, module.file]
+        st = os.stat(module.file)
+        return [module.name, module.file, st.st_size, st.st_mtime_ns]
+
     def _PrintReport(self, filename, modules):
         print("writing zip file %s\n" % filename)
         print("  {:<25} {}".format("Name", "File"))
@@ -500,6 +848,180 @@ class Freezer:
                 print("m", end="")
             print(" {:<25} {}\n".format(module.name, module.file or ""))
 
+    def _PrintSizeReport(self):
+        """Complete the graph of the size report with the modules, their
+        imports and the dependencies of the files copied, and print it."""
+        report = self._size_report
+        for module in self.finder.modules:
+            if module.name in self.finder.excludes:
+                continue
+            report.add_module(module.name)
+            for imported_name in module.imports:
+                report.add_import(module.name, imported_name)
+            if not module.has_code and module.file is not None:
+                report.add_dependency(module.name, module.file)
+        for node in list(report.files):
+            for dependent_file in self.dependentFiles.get(node, []):
+                report.add_dependency(node, dependent_file)
+
+        # the files included by a hook belong to the module of the hook
+        for source_path, name in self.finder.include_file_callers.items():
+            source_path = os.path.normcase(os.path.normpath(source_path))
+            for node in report.files:
+                if os.path.commonpath([node, source_path]) == source_path:
+                    report.add_dependency(name, node)
+
+        report.add_root("__startup__")
+        report.add_root(self.constants_module.module_name)
+        for exe in self.executables:
+            report.add_root(exe.init_module_name)
+            report.add_root(exe.main_module_name)
+        report.print_report()
+
+    def _QueueCopyFileData(self, *args):
+        """
+        Run _CopyFileData in the pool of copy threads, when running in
+        parallel mode, or right away otherwise.
+        """
+        self._QueueCopyJob(self._CopyFileData, *args)
+
+    def _QueueCopyJob(self, function, *args):
+        """
+        Run the function in the pool of copy threads, when running in
+        parallel mode, or right away otherwise. The jobs can queue other
+        jobs.
+        """
+        if self.jobs < 2:
+            function(*args)
+            return
+        with self._copy_lock:
+            if self._copy_executor is None:
+                self._copy_executor = ThreadPoolExecutor(self.jobs)
+            self._copy_jobs.append(
+                self._copy_executor.submit(function, *args)
+            )
+
+    def _ReplaceNeeded(self, elf_files: Dict, duplicate: str, canonical: str):
+        """
+        Make the files which load the duplicate library, found in their
+        rpath or runpath or in the directories searched by
+        ConsoleSetLibPath, load the canonical copy instead (Linux only).
+        Returns False, without editing any file, if a file which needs a
+        library of the name of the duplicate is not known to find it in the
+        directory of the duplicate, as the duplicate must then be kept.
+        """
+        duplicate_dir, duplicate_name = os.path.split(duplicate)
+        canonical_dir, canonical_name = os.path.split(canonical)
+        library_dirs = [self.targetdir, os.path.join(self.targetdir, "lib")]
+        users = []
+        for path, elf in elf_files.items():
+            if path == duplicate or duplicate_name not in elf.needed:
+                continue
+            origin = os.path.dirname(path)
+            current_rpath = elf.runpath or elf.rpath or ""
+            rpath = [entry for entry in current_rpath.split(":") if entry]
+            search_dirs = library_dirs + [
+                entry.replace("${ORIGIN}", origin).replace("$ORIGIN", origin)
+                for entry in rpath
+            ]
+            search_dirs = [
+                os.path.normcase(os.path.normpath(entry))
+                for entry in search_dirs
+            ]
+            if duplicate_dir not in search_dirs:
+                return False
+            users.append((path, origin, rpath))
+        for path, origin, rpath in users:
+            if canonical_name != duplicate_name:
+                self.patchelf.replace_needed(
+                    path, duplicate_name, canonical_name
+                )
+            rel_path = os.path.relpath(canonical_dir, origin)
+            if rel_path == os.curdir:
+                entry = "$ORIGIN"
+            else:
+                entry = f"$ORIGIN/{rel_path}"
+            if entry not in rpath:
+                self.patchelf.set_rpath(path, ":".join(rpath + [entry]))
+            elf_files[path] = ELFFile(path)
+            if self.manifest is not None:
+                self.manifest.update_target(path)
+        return True
+
+    def _ReadDependentFiles(self, path, darwinFile: DarwinFile = None) -> List:
+        """Read the file's dependencies using platform-specific tools."""
+        dependentFiles = []
+        if sys.platform == "win32":
+            if path.endswith((".exe", ".dll", ".pyd")):
+                # the imagehlp library is not thread safe
+                with self._bind_lock:
+                    origPath = os.environ["PATH"]
+                    os.environ["PATH"] = (
+                        origPath + os.pathsep + os.pathsep.join(sys.path)
+                    )
+                    try:
+                        dependentFiles = winutil.GetDependentFiles(path)
+                    except winutil.BindError as exc:
+                        # Sometimes this gets called when path is not
+                        # actually a library (See issue 88).
+                        if self.silent < 3:
+                            print(
+                                "error during GetDependentFiles() of", end=" "
+                            )
+                            print(f"{path!r}: {exc!s}")
+                    os.environ["PATH"] = origPath
+        elif sys.platform == "darwin":
+            # if darwinFile is None (which means that _GetDependentFiles is
+            # being called outside of _CopyFile -- e.g., one of the
+            # preliminary calls in _FreezeExecutable), create a temporary
+            # DarwinFile object for the path, just so we can read its
+            # dependencies
+            if darwinFile is None:
+                darwinFile = DarwinFile(
+                    originalFilePath=path, referencingFile=None
+                )
+            dependentFiles = darwinFile.getDependentFilePaths()
+
+            # cache the MachOReferences to the dependencies, so they can be
+            # called up later in _CopyFile if copying a dependency without
+            # an explicit reference provided
+            # (to assist in resolving @rpaths)
+            for reference in darwinFile.getMachOReferenceList():
+                if reference.isResolved():
+                    self.darwinTracker.cacheReferenceTo(
+                        sourcePath=reference.resolvedReferencePath,
+                        machOReference=reference,
+                    )
+        else:
+            dependentFiles, missing = self.patchelf.get_dependent_files(
+                path
+            )
+            dependentFiles = list(dependentFiles)
+            for filename in missing:
+                with self._copy_lock:
+                    warned = filename in self.linkerWarnings
+                    self.linkerWarnings[filename] = None
+                if not warned and self.silent < 3:
+                    print("WARNING: cannot find %s" % filename)
+        return dependentFiles
+
+    def _RemoveStaleFiles(self):
+        """Remove the files written by the previous build but not by this
+        one, in incremental mode, and the directories they leave empty."""
+        for path in self.manifest.stale_files():
+            if not os.path.isfile(path):
+                continue
+            if self.silent < 1:
+                print(f"removing {path}")
+            os.remove(path)
+            dirname = os.path.dirname(path)
+            while dirname != self.targetdir:
+                try:
+                    os.rmdir(dirname)
+                except OSError:
+                    break
+                dirname = os.path.dirname(dirname)
+
     def _RemoveVersionNumbers(self, filename):
         tweaked = False
         parts = filename.split(".")
@@ -556,9 +1078,12 @@ class Freezer:
         return True
 
     def _VerifyConfiguration(self):
-        # starts external component
-        if sys.platform == "linux":
+        # starts external component; the patchelf utility is needed when an
+        # rpath does not fit in a file, so a missing one stops the build
+        # before any file is copied
+        if sys.platform not in ("darwin", "win32"):
             self.patchelf = Patchelf()
+            self.patchelf.verify()
 
         # starts in a clean directory
         if self.targetdir is None:
@@ -566,7 +1091,14 @@ class Freezer:
             ver_major, ver_minor = sys.version_info[0:2]
             dir_name = f"exe.{platform}-{ver_major}.{ver_minor}"
             self.targetdir = os.path.abspath(os.path.join("build", dir_name))
-        if os.path.isdir(self.targetdir):
+        # in incremental mode, the directory is cleaned only when there is no
+        # usable manifest of the previous build
+        self.manifest: Optional[BuildManifest] = None
+        if self.incremental:
+            self.manifest = BuildManifest(self.targetdir)
+        if os.path.isdir(self.targetdir) and not (
+            self.manifest is not None and self.manifest.loaded
+        ):
 
             def onerror(*args):
                 raise ConfigError("the build directory cannot be cleaned")
@@ -613,6 +1145,39 @@ class Freezer:
         else:
             self.zipIncludePackages = list(self.zipIncludePackages or [])
             self.zipExcludePackages = list(self.zipExcludePackages or [])
+        if self.archive_format not in ("zip", "indexed"):
+            raise ConfigError(
+                f"unknown archive format {self.archive_format!r} "
+                "(use zip or indexed)"
+            )
+        if self.archive_order not in ("name", "import"):
+            raise ConfigError(
+                f"unknown archive order {self.archive_order!r} "
+                "(use name or import)"
+            )
+        dedupe_modes = (None, "hardlink", "symlink", "needed")
+        if self.dedupe_libraries not in dedupe_modes:
+            raise ConfigError(
+                f"unknown dedupe mode {self.dedupe_libraries!r} "
+                "(use hardlink, symlink or needed)"
+            )
+        if self.dedupe_libraries == "needed" and sys.platform in (
+            "darwin",
+            "win32",
+        ):
+            raise ConfigError("the needed dedupe mode is only for Linux")
+        self.compression_policy = CompressionPolicy(
+            self.compress,
+            self.compress_level,
+            self.compress_min_size,
+            self.compress_rules,
+        )
+        self.import_traces: Optional[ImportTrace] = None
+        if self.trace_files:
+            self.import_traces = ImportTrace(self.trace_files)
+        elif self.exclude_untraced:
+            raise ConfigError("exclude_untraced requires trace_files")
+
         self.zipExcludeAllPackages = "*" in self.zipExcludePackages
         self.zipIncludeAllPackages = "*" in self.zipIncludePackages
         if self.zipExcludeAllPackages and self.zipIncludeAllPackages:
@@ -627,7 +1192,59 @@ class Freezer:
                     "excluded from zip file"
                 )
 
+    def _WaitForCopies(self):
+        """Wait for the copies queued so far and for the copies they queue
+        in turn, raising their errors."""
+        while True:
+            with self._copy_lock:
+                copy_jobs, self._copy_jobs = self._copy_jobs, []
+            if not copy_jobs:
+                return
+            for job in copy_jobs:
+                job.result()
+
+    def _WriteArchive(self, filename, modules, inputs):
+        """Write the indexed archive, unless it is up to date."""
+        if self.manifest is not None:
+            inputs = self._GetInputsDigest([self.compression_policy, inputs])
+            if self.manifest.is_up_to_date(filename, None, inputs):
+                if self.silent < 1:
+                    print(f"{filename} is up to date")
+                return
+        with ArchiveWriter(
+            filename, self.compression_policy, self.jobs
+        ) as archive:
+            for name, data, is_package in modules:
+                archive.add(name, data, is_package)
+        if self.manifest is not None:
+            self.manifest.add(filename, None, inputs)
+
     def _WriteModules(self, filename, finder):
+        targetdir = os.path.dirname(filename)
+
+        # if an extension module is found in a package that is to be
+        # included in a zip file, copy the actual file to the build
+        # directory because shared libraries cannot be loaded from a
+        # zip file; the paths of these files, relative to the target
+        # directory, are recorded for the ExtensionFinder of __startup__
+        filesToCopy = []
+        extensionModules = {}
+        for module in sorted(finder.modules, key=lambda m: m.name):
+            if (
+                not module.has_code
+                and module.file is not None
+                and not module.in_file_system
+                and module.name not in finder.excludes
+            ):
+                parts = module.name.split(".")[:-1]
+                parts.append(os.path.basename(module.file))
+                target = os.path.join(targetdir, ".".join(parts))
+                filesToCopy.append((module, target))
+                if module.parent is not None:
+                    extensionModules[module.name] = os.path.relpath(
+                        target, self.targetdir
+                    )
+        finder.AddConstant("EXTENSION_MODULES", extensionModules)
         finder.IncludeFile(*self.constants_module.create(finder.modules))
 
         modules = [m for m in finder.modules if m.name not in finder.excludes]
@@ -638,7 +1255,12 @@ class Freezer:
         if self.silent < 2:
             finder.ReportMissingModules()
 
-        targetdir = os.path.dirname(filename)
+        # the modules that are imported first are written first, if
+        # requested, so they are close together in the archive
+        if self.archive_order == "import":
+            order = self._GetImportOrder(modules)
+            modules.sort(key=lambda m: order.get(m.name, len(order)))
+
         self._CreateDirectory(targetdir)
 
         # Prepare zip file
@@ -646,9 +1268,12 @@ class Freezer:
             compress_type = zipfile.ZIP_DEFLATED
         else:
             compress_type = zipfile.ZIP_STORED
-        outFile = zipfile.PyZipFile(filename, "w", compress_type)
+        zipModules = []
+        zipInputs = []
+        archiveModules = []
+        archiveInputs = []
 
-        filesToCopy = []
+        packageDirsCopied = set()
         ignorePatterns = shutil.ignore_patterns(
             "*.py", "*.pyc", "*.pyo", "__pycache__"
         )
@@ -674,46 +1299,26 @@ class Freezer:
                 parts = module.name.split(".")
                 targetPackageDir = os.path.join(targetdir, *parts)
                 sourcePackageDir = os.path.dirname(module.file)
-                if not os.path.exists(targetPackageDir):
+                if not any(
+                    targetPackageDir.startswith(d) for d in packageDirsCopied
+                ):
                     if self.silent<1:
                         print("Copying data from package", module.name + "...")
-                    shutil.copytree(
-                        sourcePackageDir,
-                        targetPackageDir,
-                        ignore=ignorePatterns,
-                    )
-
-                    # remove the subfolders which belong to excluded modules
-                    excludedFolders = [
-                        m[len(module.name) + 1 :].replace(".", os.sep)
-                        for m in finder.excludes
-                        if m.split(".")[0] == parts[0]
-                    ]
-                    for folder in excludedFolders:
-                        folderToRemove = os.path.join(targetPackageDir, folder)
-                        if os.path.isdir(folderToRemove):
-                            if self.silent<1:
-                                print("Removing", folderToRemove + "...")
-                            shutil.rmtree(folderToRemove)
-
-            # if an extension module is found in a package that is to be
-            # included in a zip file, copy the actual file to the build
-            # directory because shared libraries cannot be loaded from a
-            # zip file
-            if (
-                module.code is None
-                and module.file is not None
-                and not include_in_file_system
-            ):
-                parts = module.name.split(".")[:-1]
-                parts.append(os.path.basename(module.file))
-                target = os.path.join(targetdir, ".".join(parts))
-                filesToCopy.append((module, target))
+                    with self.profiler.phase(
+                        "copy package data", "copy", package=module.name
+                    ):
+                        self._CopyPackageData(
+                            sourcePackageDir,
+                            targetPackageDir,
+                            ignorePatterns,
+                            module.name,
+                        )
+                    packageDirsCopied.add(targetPackageDir + os.sep)
 
             # starting with Python 3.3 the pyc file format contains the source
             # size; it is not actually used for anything except determining if
             # the file is up to date so we can safely set this value to zero
-            if module.code is not None:
+            if module.has_code:
                 if module.file is not None and os.path.exists(module.file):
                     st = os.stat(module.file)
                     mtime = int(st.st_mtime)
@@ -725,12 +1330,11 @@ class Freezer:
                     header = MAGIC_NUMBER + struct.pack("<ii", mtime, size)
                 else:
                     header = MAGIC_NUMBER + struct.pack("<iii", 0, mtime, size)
-                data = header + marshal.dumps(module.code)
 
             # if the module should be written to the file system, do so
             if include_in_file_system and module.file is not None:
                 parts = module.name.split(".")
-                if module.code is None:
+                if not module.has_code:
                     parts.pop()
                     parts.append(os.path.basename(module.file))
                     target_name = os.path.join(targetdir, *parts)
@@ -743,25 +1347,60 @@ class Freezer:
                     if module.path is not None:
                         parts.append("__init__")
                     target_name = os.path.join(targetdir, *parts) + ".pyc"
-                    with open(target_name, "wb") as fp:
-                        fp.write(data)
-
-            # otherwise, write to the zip file
-            elif module.code is not None:
+                    data = self._GetModuleData(module, header)
+                    inputs = self._GetInputsDigest(
+                        self._GetModuleInputs(module)
+                    )
+                    if self.manifest is None or not (
+                        self.manifest.is_up_to_date(target_name, None, inputs)
+                    ):
+                        # the directory is not copied if the package data
+                        # excludes match it
+                        target_dir = os.path.dirname(target_name)
+                        os.makedirs(target_dir, exist_ok=True)
+                        with open(target_name, "wb") as fp:
+                            fp.write(data)
+                        if self.manifest is not None:
+                            self.manifest.add(target_name, None, inputs)
+                    if self._size_report is not None:
+                        self._size_report.add_module(module.name, len(data))
+
+            # otherwise, write to the indexed archive, if requested, unless
+            # the module is needed before the archive can be read
+            elif (
+                module.has_code
+                and self.archive_format == "indexed"
+                and module.name.partition(".")[0] not in STARTUP_MODULES
+            ):
+                data = self._GetModuleData(module)
+                archiveModules.append(
+                    (module.name, data, module.path is not None)
+                )
+                if self._size_report is not None:
+                    self._size_report.add_module(module.name, len(data))
+                if self.manifest is not None:
+                    archiveInputs.append(self._GetModuleInputs(module))
+
+            # otherwise, write to the zip file; the code is marshaled (or
+            # read from the spool) only when the entry is written
+            elif module.has_code:
                 zipTime = time.localtime(mtime)[:6]
-                filename = "/".join(module.name.split("."))
+                arcName = "/".join(module.name.split("."))
                 if module.path:
-                    filename += "/__init__"
-                zinfo = zipfile.ZipInfo(filename + ".pyc", zipTime)
+                    arcName += "/__init__"
+                zinfo = zipfile.ZipInfo(arcName + ".pyc", zipTime)
                 zinfo.compress_type = compress_type
-                outFile.writestr(zinfo, data)
+                zipModules.append((zinfo, module, header))
+                if self.manifest is not None:
+                    zipInputs.append(self._GetModuleInputs(module))
 
         # put the distribution files metadata in the zip file
-        dist_cachedir = finder.dist_cachedir.name
-        for dirpath, _, filenames in os.walk(dist_cachedir):
-            basedir = dirpath[len(dist_cachedir) + 1 :].replace("\\", "/")
-            for name in filenames:
-                outFile.write(os.path.join(dirpath, name), f"{basedir}/{name}")
+        zipFiles = []
+        top_level_names = [m.name for m in modules if m.parent is None]
+        for arc_name, source_path in finder.distributions.get_files(
+            top_level_names
+        ):
+            zipFiles.append((source_path, arc_name))
 
         # write any files to the zip file that were requested specially
         for source_filename, target_filename in finder.zip_includes:
@@ -770,14 +1409,68 @@ class Freezer:
                     basePath = dirPath[len(source_filename) :]
                     targetPath = target_filename + basePath.replace("\\", "/")
                     for name in filenames:
-                        outFile.write(
-                            os.path.join(dirPath, name),
-                            targetPath + "/" + name,
+                        zipFiles.append(
+                            (
+                                os.path.join(dirPath, name),
+                                targetPath + "/" + name,
+                            )
                         )
             else:
-                outFile.write(source_filename, target_filename)
-
-        outFile.close()
+                zipFiles.append((source_filename, target_filename))
+
+        # in incremental mode, the zip file is written only when its modules
+        # or its files changed
+        inputs = None
+        if self.manifest is not None:
+            for source_path, arc_name in zipFiles:
+                st = os.stat(source_path)
+                zipInputs.append(
+                    [arc_name, source_path, st.st_size, st.st_mtime_ns]
+                )
+            inputs = self._GetInputsDigest(
+                [self.compression_policy, zipInputs]
+            )
+        if inputs is not None and self.manifest.is_up_to_date(
+            filename, None, inputs
+        ):
+            if self.silent < 1:
+                print(f"{filename} is up to date")
+        else:
+            # the entries are compressed by the pool of jobs, as chosen by
+            # the compression policy
+            with self.profiler.phase("write zip file", "modules"), ZipWriter(
+                filename, compress_type, self.jobs, self.compression_policy
+            ) as outFile:
+                for zinfo, module, header in zipModules:
+                    outFile.writestr(
+                        zinfo, self._GetModuleData(module, header)
+                    )
+                for source_path, arc_name in zipFiles:
+                    outFile.write(source_path, arc_name)
+            self.profiler.count(
+                "zip file entries", len(zipModules) + len(zipFiles)
+            )
+            if self.manifest is not None:
+                self.manifest.add(filename, None, inputs)
+
+        # the modules are attributed the compressed size of their entry
+        if self._size_report is not None:
+            with zipfile.ZipFile(filename) as zip_file:
+                for info in zip_file.infolist():
+                    if not info.filename.endswith(".pyc"):
+                        continue
+                    name = info.filename[:-4].replace("/", ".")
+                    if name.endswith(".__init__"):
+                        name = name[: -len(".__init__")]
+                    self._size_report.add_module(name, info.compress_size)
+
+        if self.archive_format == "indexed":
+            with self.profiler.phase("write archive", "modules"):
+                self._WriteArchive(
+                    os.path.join(targetdir, "library.dat"),
+                    archiveModules,
+                    archiveInputs,
+                )
 
         # Copy Python extension modules from the list built above.
         origPath = os.environ["PATH"]
@@ -786,11 +1479,14 @@ class Freezer:
                 if module.parent is not None:
                     path = os.pathsep.join([origPath] + module.parent.path)
                     os.environ["PATH"] = path
-                self._CopyFile(
-                    module.file,
-                    target,
-                    copyDependentFiles=True,
-                )
+                with self.profiler.phase(
+                    "copy extension module", "copy", module=module.name
+                ):
+                    self._CopyFile(
+                        module.file,
+                        target,
+                        copyDependentFiles=True,
+                    )
             finally:
                 os.environ["PATH"] = origPath
 
@@ -798,6 +1494,13 @@ class Freezer:
         self.dependentFiles = {}  # type: Dict[Any, List]
         self.files_copied = set()
         self.linkerWarnings = {}
+        self._copy_executor: Optional[ThreadPoolExecutor] = None
+        self._copy_jobs: List[Future] = []
+        self._copy_lock = threading.RLock()
+        self._bind_lock = threading.Lock()
+        self._size_report: Optional[SizeReport] = None
+        if self.size_report:
+            self._size_report = SizeReport()
 
         self.darwinTracker = None  # type: Optional[DarwinFileTracker]
         if sys.platform == "darwin":
@@ -807,44 +1510,108 @@ class Freezer:
 
         # Add the executables to target
         for executable in self.executables:
-            self._FreezeExecutable(executable)
+            with self.profiler.phase(
+                "freeze executable", executable=executable.target_name
+            ):
+                self._FreezeExecutable(executable)
+
+        if self.import_traces is not None:
+            self._ApplyImportTraces()
 
         # Write the modules
         targetdir = self.targetdir
         ziptargetdir = os.path.join(targetdir, "lib")
         filename = os.path.join(ziptargetdir, "library.zip")
-        self._WriteModules(filename, self.finder)
+        with self.profiler.phase("write modules", "modules"):
+            self._WriteModules(filename, self.finder)
+        self.finder.ShutdownWorkers()
 
         for source_filename, target_filename in self.finder.include_files:
-            if os.path.isdir(source_filename):
-                # Copy directories by recursing into them.
-                # Can't use shutil.copytree because we may need dependencies
-                for path, dirnames, filenames in os.walk(source_filename):
-                    short_path = path[len(source_filename) + 1 :]
-                    if ".svn" in dirnames:
-                        dirnames.remove(".svn")
-                    if "CVS" in dirnames:
-                        dirnames.remove("CVS")
-                    fulltargetdir = os.path.join(
-                        targetdir, target_filename, short_path
-                    )
-                    self._CreateDirectory(fulltargetdir)
-                    for filename in filenames:
-                        source_path = os.path.join(path, filename)
-                        target_path = os.path.join(fulltargetdir, filename)
-                        self._CopyFile(
-                            source_path,
-                            target_path,
-                            copyDependentFiles=True,
+            with self.profiler.phase(
+                "include files", "copy", source=source_filename
+            ):
+                if os.path.isdir(source_filename):
+                    # Copy directories by recursing into them.
+                    # Can't use shutil.copytree because we may need
+                    # dependencies
+                    for path, dirnames, filenames in os.walk(source_filename):
+                        short_path = path[len(source_filename) + 1 :]
+                        if ".svn" in dirnames:
+                            dirnames.remove(".svn")
+                        if "CVS" in dirnames:
+                            dirnames.remove("CVS")
+                        fulltargetdir = os.path.join(
+                            targetdir, target_filename, short_path
                         )
-            else:
-                # Copy regular files.
-                fullname = os.path.join(targetdir, target_filename)
-                self._CopyFile(
-                    source_filename,
-                    fullname,
-                    copyDependentFiles=True,
-                )
+                        self._CreateDirectory(fulltargetdir)
+                        for filename in filenames:
+                            source_path = os.path.join(path, filename)
+                            target_path = os.path.join(fulltargetdir, filename)
+                            self._CopyFile(
+                                source_path,
+                                target_path,
+                                copyDependentFiles=True,
+                            )
+                else:
+                    # Copy regular files.
+                    fullname = os.path.join(targetdir, target_filename)
+                    self._CopyFile(
+                        source_filename,
+                        fullname,
+                        copyDependentFiles=True,
+                    )
+        with self.profiler.phase("wait for copies", "copy"):
+            self._WaitForCopies()
+        if self._copy_executor is not None:
+            self._copy_executor.shutdown()
+
+        if self.dedupe_libraries:
+            with self.profiler.phase("dedupe libraries", "copy"):
+                self._DedupeLibraries()
+
         # do a final pass to clean up dependency references in Mach-O files.
         if sys.platform == "darwin":
             self.darwinTracker.finalizeReferences()
+
+        # the manifest records the files once they are no longer modified
+        if self.manifest is not None:
+            with self.profiler.phase("update manifest"):
+                if sys.platform == "darwin":
+                    for darwinFile in self.darwinTracker:
+                        self.manifest.update_target(darwinFile.getBuildPath())
+                self._RemoveStaleFiles()
+                self.manifest.save()
+
+        # the modules are appended last, as the executables must not be
+        # modified afterwards
+        if self.embed_modules:
+            for executable in self.executables:
+                with self.profiler.phase(
+                    "embed modules", executable=executable.target_name
+                ):
+                    self._EmbedModules(executable)
+
+        # the spool is only needed until the modules are written
+        spool = self.finder.code_spool
+        if spool is not None:
+            self.profiler.count("modules spooled", spool.count)
+            self.profiler.count("bytes spooled", spool.size)
+            spool.close()
+
+        cache = self.finder.cache
+        if cache is not None and self.silent < 1:
+            print(
+                f"module cache: {cache.hits} hits, {cache.misses} misses "
+                f"({cache.cache_dir})"
+            )
+
+        if self._size_report is not None and self.silent < 2:
+            self._PrintSizeReport()
+
+        if self.profiler.enabled:
+            if self.silent < 2:
+                self.profiler.print_summary()
+            if self.profile_trace:
+                self.profiler.write_trace(self.profile_trace)
+                if self.silent < 1:
+                    print(f"writing profile trace {self.profile_trace}")
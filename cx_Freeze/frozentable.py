@@ -0,0 +1,108 @@
+"""
+Implements the table of frozen modules that is appended to the frozen
+executables when the modules needed at startup are embedded in them. The
+base executable reads the table before Python is initialized and installs
+it as PyImport_FrozenModules, so these modules are imported by the frozen
+importer instead of being read from lib/library.zip.
+
+The table starts with a record for each module: the offsets of the name and
+of the data, relative to the start of the table, and the size of the data,
+negated for packages (32 bits each). The names, terminated by NUL bytes, and
+the marshaled code of the modules follow. The table ends with a trailer of
+16 bytes: the magic b"CXFZ", the version, the number of modules and the size
+of the table without the trailer (32 bits each). All the integers are little
+endian.
+"""
+
+import struct
+from typing import List, Tuple
+
+__all__ = ["EMBEDDED_MODULES", "FrozenTable"]
+
+# the modules (with their submodules) that are imported during the
+# initialization of Python and by the startup and initialization scripts,
+# before the main script runs; packages are embedded with all their
+# submodules, as frozen packages do not have a location to search
+EMBEDDED_MODULES = (
+    "BUILD_CONSTANTS",
+    "__archive__",
+    "__startup__",
+    "_bootlocale",
+    "_collections_abc",
+    "_weakrefset",
+    "abc",
+    "codecs",
+    "collections",
+    "copyreg",
+    "encodings",
+    "enum",
+    "functools",
+    "genericpath",
+    "heapq",
+    "importlib",
+    "io",
+    "keyword",
+    "linecache",
+    "ntpath",
+    "operator",
+    "os",
+    "posixpath",
+    "re",
+    "reprlib",
+    "sre_compile",
+    "sre_constants",
+    "sre_parse",
+    "stat",
+    "string",
+    "token",
+    "tokenize",
+    "traceback",
+    "types",
+    "warnings",
+)
+
+# these values must match the ones in source/bases/Common.c
+TABLE_MAGIC = b"CXFZ"
+TABLE_VERSION = 1
+RECORD = struct.Struct("<LLl")
+TRAILER = struct.Struct("<4s3L")
+
+
+class FrozenTable:
+    """
+    The FrozenTable class collects the marshaled code of the modules and
+    appends the table to an executable.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[bytes, bytes, bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, data: bytes, is_package: bool = False) -> None:
+        """Add the marshaled code of the module."""
+        self._entries.append((name.encode("utf-8"), data, is_package))
+
+    def append_to(self, filename: str) -> None:
+        """Append the table to the executable."""
+        entries = sorted(self._entries)
+        records = []
+        names = b"".join(name + b"\0" for name, _, _ in entries)
+        name_offset = len(entries) * RECORD.size
+        data_offset = name_offset + len(names)
+        for name, data, is_package in entries:
+            size = -len(data) if is_package else len(data)
+            records.append(RECORD.pack(name_offset, data_offset, size))
+            name_offset += len(name) + 1
+            data_offset += len(data)
+        with open(filename, "ab") as file:
+            file.write(b"".join(records))
+            file.write(names)
+            for _, data, _ in entries:
+                file.write(data)
+            file.write(
+                TRAILER.pack(
+                    TABLE_MAGIC, TABLE_VERSION, len(entries), data_offset
+                )
+            )
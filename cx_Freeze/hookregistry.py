@@ -0,0 +1,123 @@
+"""
+Implements the registry of the hooks, which maps the names of the modules to
+their hooks with a table for the modules found (load) and a table for the
+modules not found (missing), so the finder looks up the hook of a module in
+a dict. The hooks of cx_Freeze are declared in the hookspecs module; other
+packages can add hooks for their modules with entry points of the
+cx_Freeze.hooks group, named after the module ("missing:" followed by the
+name for a module not found), which load a HookSpec, a dict of the fields of
+a HookSpec or a function called with the finder and the module. The hooks of
+a module are compiled into a single function the first time the module is
+seen, which is the only time their entry points and callbacks are imported;
+the callbacks of cx_Freeze are imported from the module of the hooks package
+named after the top level package of the module.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import importlib_metadata
+
+from .hookspecs import EXCLUDES, HOOKS, MISSING_HOOKS, HookSpec
+from .module import Module
+
+__all__ = ["HookRegistry", "HookSpec"]
+
+ENTRY_POINT_GROUP = "cx_Freeze.hooks"
+
+Hook = Callable[[Any, Module], None]
+HookEntry = Union[HookSpec, Hook, importlib_metadata.EntryPoint]
+
+
+class HookRegistry:
+    """
+    The HookRegistry class holds the hooks and the modules excluded by
+    default. The hooks added for a module run after the hooks already
+    registered for it, so the hooks of other packages extend the hooks of
+    cx_Freeze.
+    """
+
+    def __init__(
+        self, path: Optional[List[str]] = None, entry_points: bool = True
+    ):
+        self.excludes: List[str] = list(EXCLUDES)
+        self._tables: Dict[str, Dict[str, Any]] = {
+            "load": {name: [spec] for name, spec in HOOKS.items()},
+            "missing": {name: [spec] for name, spec in MISSING_HOOKS.items()},
+        }
+        if entry_points:
+            self._add_entry_points(sys.path if path is None else path)
+
+    def _add_entry_points(self, path: List[str]) -> None:
+        """Add the hooks declared by the distributions found in the path."""
+        names = set()
+        for dist in importlib_metadata.distributions(path=path):
+            # the first distribution found in the path has priority
+            name = dist.metadata["Name"]
+            if name in names:
+                continue
+            names.add(name)
+            for entry_point in dist.entry_points:
+                if entry_point.group != ENTRY_POINT_GROUP:
+                    continue
+                hook, _, module_name = entry_point.name.rpartition(":")
+                self.add(hook or "load", module_name, entry_point)
+
+    @staticmethod
+    def _resolve(name: str, entry: HookEntry) -> List[Hook]:
+        """Return the functions that run the hook of the named module."""
+        if isinstance(entry, importlib_metadata.EntryPoint):
+            entry = entry.load()
+            if isinstance(entry, dict):
+                entry = HookSpec(**entry)
+        if not isinstance(entry, HookSpec):
+            return [entry]
+        functions = []
+        if entry._replace(callback=None) != HookSpec():
+            functions.append(entry.apply)
+        if entry.callback is not None:
+            module_name, _, function_name = entry.callback.rpartition(":")
+            if not module_name:
+                module_name = f"cx_Freeze.hooks.{name.partition('.')[0]}"
+            module = importlib.import_module(module_name)
+            functions.append(getattr(module, function_name))
+        return functions
+
+    def add(self, hook: str, name: str, entry: HookEntry) -> None:
+        """
+        Add a hook (load or missing) for the module of the given name: a
+        HookSpec, a function called with the finder and the module or an
+        entry point that loads one of them.
+        """
+        entries = self._tables[hook].get(name)
+        if entries is None:
+            entries = self._tables[hook][name] = []
+        elif callable(entries):
+            entries = self._tables[hook][name] = [entries]
+        entries.append(entry)
+
+    def get(self, hook: str, name: str) -> Optional[Hook]:
+        """
+        Return the function that runs the hooks (load or missing) of the
+        module of the given name, or None if the module has no hook.
+        """
+        table = self._tables[hook]
+        entries = table.get(name)
+        if entries is None or callable(entries):
+            return entries
+        functions = [
+            function
+            for entry in entries
+            for function in self._resolve(name, entry)
+        ]
+        if len(functions) == 1:
+            table[name] = functions[0]
+        else:
+
+            def run_hooks(finder: Any, module: Module) -> None:
+                for function in functions:
+                    function(finder, module)
+
+            table[name] = run_hooks
+        return table[name]
@@ -0,0 +1,72 @@
+"""
+The hooks of the pycryptodome package (Crypto).
+"""
+
+from ..common import code_object_replace
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_Crypto_Cipher(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.Cipher subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_Hash(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.Hash subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_Math(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.Math subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_Protocol(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.Protocol subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_PublicKey(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.PublicKey subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_Util(finder: ModuleFinder, module: Module) -> None:
+    """The Crypto.Util subpackage of pycryptodome package."""
+    if not module.in_file_system:
+        finder.IncludePackage(module.name)
+
+
+def load_Crypto_Util__file_system(
+    finder: ModuleFinder, module: Module
+) -> None:
+    """The pycryptodome package"""
+    # WARNING: do not touch this code string
+    PYCRYPTODOME_CODE_STR = """
+import os
+
+def pycryptodome_filename(dir_comps, filename):
+    import sys
+    if dir_comps[0] != "Crypto":
+        raise ValueError("Only available for modules under 'Crypto'")
+    dir_comps = list(dir_comps) + [filename]
+    root_lib = os.path.join(os.path.dirname(sys.executable), "lib")
+    return os.path.join(root_lib, ".".join(dir_comps))
+"""
+    if not module.in_file_system and module.code is not None:
+        new_code = compile(PYCRYPTODOME_CODE_STR, module.file, "exec")
+        co_func = new_code.co_consts[2]
+        name = co_func.co_name
+        code = module.code
+        consts = list(code.co_consts)
+        for i in range(len(consts)):
+            if isinstance(consts[i], type(code)) and consts[i].co_name == name:
+                consts[i] = co_func
+                break
+        module.code = code_object_replace(code, co_consts=consts)
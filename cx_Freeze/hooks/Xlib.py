@@ -0,0 +1,20 @@
+"""
+The hooks of the Xlib package.
+"""
+
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_Xlib_support_connect(finder: ModuleFinder, module: Module) -> None:
+    """
+    The Xlib.support.connect module implicitly loads a platform specific
+    module; make sure this happens.
+    """
+    if sys.platform.split("-")[0] == "OpenVMS":
+        module_name = "vms_connect"
+    else:
+        module_name = "unix_connect"
+    finder.IncludeModule(f"Xlib.support.{module_name}")
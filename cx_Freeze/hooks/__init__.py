@@ -0,0 +1,13 @@
+"""
+The hooks of cx_Freeze which need code, the callbacks named in the hookspecs
+module. The callbacks of the hooks of a module live in the module of this
+package named after its top level package (the callbacks of numpy.* in
+cx_Freeze.hooks.numpy), so only the callbacks of the packages found are
+imported.
+"""
+
+import sys
+import sysconfig
+
+MINGW = sysconfig.get_platform() == "mingw"
+WIN32 = sys.platform == "win32"
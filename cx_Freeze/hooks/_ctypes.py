@@ -0,0 +1,21 @@
+"""
+The hooks of the _ctypes module.
+"""
+
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import MINGW, WIN32
+
+
+def load__ctypes(finder: ModuleFinder, module: Module) -> None:
+    """
+    In Windows, the _ctypes module in Python 3.8+ requires an additional dll
+    libffi-7.dll to be present in the build directory.
+    """
+    if WIN32 and sys.version_info >= (3, 8) and not MINGW:
+        dll_name = "libffi-7.dll"
+        dll_path = os.path.join(sys.base_prefix, "DLLs", dll_name)
+        finder.IncludeFiles(dll_path, os.path.join("lib", dll_name))
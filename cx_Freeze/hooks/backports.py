@@ -0,0 +1,8 @@
+"""
+The hooks of the backports.zoneinfo package.
+"""
+
+from .zoneinfo import load_zoneinfo
+
+
+load_backports_zoneinfo = load_zoneinfo
@@ -0,0 +1,28 @@
+"""
+The hooks of the certifi package.
+"""
+
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_certifi(finder: ModuleFinder, module: Module) -> None:
+    """
+    The certifi package, in python 3.7 and up, uses importlib.resources
+    to locate the cacert.pem in zip packages.
+    In previous versions, it is expected to be stored in the file system.
+    """
+    if not module.in_file_system:
+        if sys.version_info < (3, 7):
+            module.in_file_system = True
+            return
+        cacert = os.path.join(module.path[0], "cacert.pem")
+        if not os.path.isfile(cacert):
+            cacert = finder.QueryPackage(
+                "certifi", "import certifi; result = certifi.where()"
+            )
+        target = "certifi/" + os.path.basename(cacert)
+        finder.ZipIncludeFiles(cacert, target)
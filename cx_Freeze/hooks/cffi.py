@@ -0,0 +1,14 @@
+"""
+The hooks of the cffi package.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_cffi_cparser(finder: ModuleFinder, module: Module) -> None:
+    """The cffi.cparser module can use a extension if present."""
+    try:
+        finder.IncludeModule("cffi._pycparser")
+    except ImportError:
+        finder.ExcludeModule("cffi._pycparser")
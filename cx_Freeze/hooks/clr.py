@@ -0,0 +1,20 @@
+"""
+The hooks of the pythonnet package (clr).
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_clr(finder: ModuleFinder, module: Module) -> None:
+    """
+    The pythonnet package (imported as 'clr') needs Python.Runtime.dll
+    in runtime.
+    """
+    module_dir = os.path.dirname(module.file)
+    dll_name = "Python.Runtime.dll"
+    finder.IncludeFiles(
+        os.path.join(module_dir, dll_name), os.path.join("lib", dll_name)
+    )
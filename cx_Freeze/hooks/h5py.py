@@ -0,0 +1,19 @@
+"""
+The hooks of the h5py package.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_h5py(finder: ModuleFinder, module: Module) -> None:
+    """h5py module has a number of implicit imports"""
+    finder.IncludeModule("h5py.defs")
+    finder.IncludeModule("h5py.utils")
+    finder.IncludeModule("h5py._proxy")
+    try:
+        finder.IncludeModule("h5py.api_gen")
+    except ImportError:
+        pass
+    finder.IncludeModule("h5py._errors")
+    finder.IncludeModule("h5py.h5ac")
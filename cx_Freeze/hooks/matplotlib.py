@@ -0,0 +1,45 @@
+"""
+The hooks of the matplotlib package.
+"""
+
+import os
+
+from ..common import code_object_replace
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_matplotlib(finder: ModuleFinder, module: Module) -> None:
+    """The matplotlib package requires mpl-data subdirectory."""
+    data_path = os.path.join(module.path[0], "mpl-data")
+    target_path = os.path.join("lib", module.name, "mpl-data")
+    # After matplotlib 3.4 mpl-data is guaranteed to be a subdirectory.
+    if not os.path.isdir(data_path):
+        data_path = finder.QueryPackage(
+            "matplotlib",
+            "import matplotlib; result = matplotlib.get_data_path()",
+        )
+        need_patch = True
+    else:
+        need_patch = not module.in_file_system
+    finder.IncludeFiles(data_path, target_path, copy_dependent_files=False)
+    finder.IncludePackage("matplotlib")
+    finder.ExcludeModule("matplotlib.tests")
+    finder.ExcludeModule("matplotlib.testing")
+    if not need_patch or module.code is None:
+        return
+    CODE_STR = f"""
+def _get_data_path():
+    return os.path.join(os.path.dirname(sys.executable), "{target_path}")
+"""
+    for code_str in [CODE_STR, CODE_STR.replace("_get_data_", "get_data_")]:
+        new_code = compile(code_str, module.file, "exec")
+        co_func = new_code.co_consts[0]
+        name = co_func.co_name
+        code = module.code
+        consts = list(code.co_consts)
+        for i in range(len(consts)):
+            if isinstance(consts[i], type(code)) and consts[i].co_name == name:
+                consts[i] = co_func
+                break
+        module.code = code_object_replace(code, co_consts=consts)
@@ -0,0 +1,22 @@
+"""
+The hooks of the mkl package.
+"""
+
+import glob
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_mkl(finder: ModuleFinder, module: Module) -> None:
+    """The mkl package in conda."""
+    libs_dir = os.path.join(sys.base_prefix, "Library", "bin")
+    if os.path.isdir(libs_dir):
+        for dll_path in glob.glob(os.path.join(libs_dir, "mkl_*.dll")):
+            dll_name = os.path.basename(dll_path)
+            finder.IncludeFiles(dll_path, os.path.join("lib", "mkl", dll_name))
+        for dll_path in glob.glob(os.path.join(libs_dir, "libiomp*.dll")):
+            dll_name = os.path.basename(dll_path)
+            finder.IncludeFiles(dll_path, os.path.join("lib", "mkl", dll_name))
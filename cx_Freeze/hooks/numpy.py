@@ -0,0 +1,20 @@
+"""
+The hooks of the numpy package.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import WIN32
+
+
+def load_numpy(finder: ModuleFinder, module: Module) -> None:
+    """The numpy must be loaded as a package."""
+    finder.IncludePackage("numpy")
+    finder.ExcludeModule("numpy.random._examples")
+    if WIN32 and not module.in_file_system:
+        # copy any file at site-packages/numpy/.libs
+        libs_dir = os.path.join(module.path[0], ".libs")
+        if os.path.exists(libs_dir):
+            finder.IncludeFiles(libs_dir, "lib")
@@ -0,0 +1,17 @@
+"""
+The hooks of the postgresql package.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_postgresql_lib(finder: ModuleFinder, module: Module) -> None:
+    """
+    The postgresql.lib module requires the libsys.sql file to be included
+    so make sure that file is included.
+    """
+    filename = os.path.join(module.path[0], "libsys.sql")
+    finder.IncludeFiles(filename, os.path.basename(filename))
@@ -0,0 +1,15 @@
+"""
+The hooks of the pycountry package.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_pycountry(finder: ModuleFinder, module: Module) -> None:
+    """
+    The pycountry module has data in subdirectories.
+    """
+    finder.ExcludeModule("pycountry.tests")
+    if not module.in_file_system:
+        module.in_file_system = True
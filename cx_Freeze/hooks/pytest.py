@@ -0,0 +1,18 @@
+"""
+The hooks of the pytest package.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_pytest(finder: ModuleFinder, module: Module) -> None:
+    """
+    The pytest package implicitly imports others modules;
+    make sure this happens.
+    """
+    includes = finder.QueryPackage(
+        "pytest", "import pytest; result = pytest.freeze_includes()"
+    )
+    for mod in includes:
+        finder.IncludeModule(mod)
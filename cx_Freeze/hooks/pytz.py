@@ -0,0 +1,38 @@
+"""
+The hooks of the pytz package.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_pytz(finder: ModuleFinder, module: Module) -> None:
+    """
+    The pytz module requires timezone data to be found in a known directory
+    or in the zip file where the package is written.
+    """
+    target_path = os.path.join("lib", "pytz", "zoneinfo")
+    data_path = os.path.join(module.path[0], "zoneinfo")
+    if not os.path.isdir(data_path):
+        # Fedora (and possibly other systems) use a separate location to
+        # store timezone data so look for that here as well
+        tzinfo_dir = finder.QueryPackage(
+            "pytz",
+            "import pytz; result = getattr(pytz, '_tzinfo_dir', None)",
+        )
+        data_path = (
+            tzinfo_dir or os.getenv("PYTZ_TZDATADIR") or "/usr/share/zoneinfo"
+        )
+        if data_path.endswith(os.sep):
+            data_path = data_path[:-1]
+        if os.path.isdir(data_path):
+            finder.AddConstant("PYTZ_TZDATADIR", target_path)
+    if os.path.isdir(data_path):
+        if module.in_file_system:
+            finder.IncludeFiles(
+                data_path, target_path, copy_dependent_files=False
+            )
+        else:
+            finder.ZipIncludeFiles(data_path, "pytz/zoneinfo")
@@ -0,0 +1,26 @@
+"""
+The hooks of the pywintypes module.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_pywintypes(finder: ModuleFinder, module: Module) -> None:
+    """
+    The pywintypes module is actually contained in a DLL but since those
+    cannot be loaded directly in Python 2.5 and higher a special module is
+    used to perform that task; simply use that technique directly to
+    determine the name of the DLL and ensure it is included as a file in the
+    target directory.
+    """
+    filename = finder.QueryPackage(
+        "pywintypes", "import pywintypes; result = pywintypes.__file__"
+    )
+    finder.IncludeFiles(
+        filename,
+        os.path.join("lib", os.path.basename(filename)),
+        copy_dependent_files=False,
+    )
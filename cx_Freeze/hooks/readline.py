@@ -0,0 +1,16 @@
+"""
+The hooks of the readline module.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import WIN32
+
+
+def missing_readline(finder: ModuleFinder, caller: Module) -> None:
+    """
+    The readline module is not normally present on Windows but it also may be
+    so instead of excluding it completely, ignore it if it can't be found.
+    """
+    if WIN32:
+        caller.ignore_names.add("readline")
@@ -0,0 +1,31 @@
+"""
+The hooks of the scipy package.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import WIN32
+
+
+def load_scipy(finder: ModuleFinder, module: Module) -> None:
+    """
+    The scipy module loads items within itself in a way that causes
+    problems without the entire package and a number of other subpackages
+    being present.
+    """
+    finder.IncludePackage("scipy._lib")
+    finder.IncludePackage("scipy.misc")
+    if WIN32:
+        finder.ExcludeModule("scipy.spatial.cKDTree")
+
+
+def load_scipy_ndimage(finder: ModuleFinder, module: Module) -> None:
+    """The scipy.ndimage must be loaded as a package."""
+    finder.ExcludeModule("scipy.ndimage.tests")
+    finder.IncludePackage("scipy.ndimage")
+
+
+def load_scipy_sparse_csgraph(finder: ModuleFinder, module: Module) -> None:
+    """The scipy.sparse.csgraph must be loaded as a package."""
+    finder.ExcludeModule("scipy.sparse.csgraph.tests")
+    finder.IncludePackage("scipy.sparse.csgraph")
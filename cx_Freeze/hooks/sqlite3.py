@@ -0,0 +1,26 @@
+"""
+The hooks of the sqlite3 package.
+"""
+
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import MINGW, WIN32
+
+
+def load_sqlite3(finder: ModuleFinder, module: Module) -> None:
+    """
+    In Windows, the sqlite3 module requires an additional dll sqlite3.dll to
+    be present in the build directory.
+    """
+    if WIN32 and not MINGW:
+        dll_name = "sqlite3.dll"
+        dll_path = os.path.join(sys.base_prefix, "DLLs", dll_name)
+        if not os.path.exists(dll_path):
+            dll_path = os.path.join(
+                sys.base_prefix, "Library", "bin", dll_name
+            )
+        finder.IncludeFiles(dll_path, os.path.join("lib", dll_name))
+    finder.IncludePackage("sqlite3")
@@ -0,0 +1,25 @@
+"""
+The hooks of the ssl module.
+"""
+
+import glob
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import MINGW, WIN32
+
+
+def load_ssl(finder: ModuleFinder, module: Module) -> None:
+    """
+    In Windows, the SSL module in Python 3.7+ requires additional dlls to
+    be present in the build directory.
+    """
+    if WIN32 and sys.version_info >= (3, 7) and not MINGW:
+        for dll_search in ["libcrypto-*.dll", "libssl-*.dll"]:
+            for dll_path in glob.glob(
+                os.path.join(sys.base_prefix, "DLLs", dll_search)
+            ):
+                dll_name = os.path.basename(dll_path)
+                finder.IncludeFiles(dll_path, os.path.join("lib", dll_name))
@@ -0,0 +1,42 @@
+"""
+The hooks of the tkinter package.
+"""
+
+import os
+import sys
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import MINGW, WIN32
+
+
+def load_tkinter(finder: ModuleFinder, module: Module) -> None:
+    """
+    The tkinter module has data files that are required to be loaded so
+    ensure that they are copied into the directory that is expected at
+    runtime.
+    """
+    if WIN32:
+        root_names = "tcl", "tk"
+        environ_names = "TCL_LIBRARY", "TK_LIBRARY"
+        version_vars = finder.QueryPackage(
+            "tkinter",
+            "import tkinter; result = [tkinter.TclVersion, tkinter.TkVersion]",
+        )
+        zipped = zip(environ_names, version_vars, root_names)
+        for env_name, ver_var, mod_name in zipped:
+            dir_name = mod_name + str(ver_var)
+            try:
+                lib_texts = os.environ[env_name]
+            except KeyError:
+                if MINGW:
+                    lib_texts = os.path.join(sys.base_prefix, "lib", dir_name)
+                else:
+                    lib_texts = os.path.join(sys.base_prefix, "tcl", dir_name)
+            target_path = os.path.join("lib", "tkinter", dir_name)
+            finder.AddConstant(env_name, target_path)
+            finder.IncludeFiles(lib_texts, target_path)
+            if not MINGW:
+                dll_name = dir_name.replace(".", "") + "t.dll"
+                dll_path = os.path.join(sys.base_prefix, "DLLs", dll_name)
+                finder.IncludeFiles(dll_path, os.path.join("lib", dll_name))
@@ -0,0 +1,15 @@
+"""
+The hooks of the win32api module.
+"""
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_win32api(finder: ModuleFinder, module: Module) -> None:
+    """
+    The win32api module implicitly loads the pywintypes module; make sure
+    this happens.
+    """
+    finder.ExcludeDependentFiles(module.file)
+    finder.IncludeModule("pywintypes")
@@ -0,0 +1,18 @@
+"""
+The hooks of the win32com package.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_win32com(finder: ModuleFinder, module: Module) -> None:
+    """
+    The win32com package manipulates its search path at runtime to include
+    the sibling directory called win32comext; simulate that by changing the
+    search path in a similar fashion here.
+    """
+    base_dir = os.path.dirname(os.path.dirname(module.file))
+    module.path.append(os.path.join(base_dir, "win32comext"))
@@ -0,0 +1,20 @@
+"""
+The hooks of the wx package.
+"""
+
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_wx_lib_pubsub_core(finder: ModuleFinder, module: Module) -> None:
+    """
+    The wx.lib.pubsub.core module modifies the search path which cannot
+    be done in a frozen application in the same way; modify the module
+    search path here instead so that the right modules are found; note
+    that this only works if the import of wx.lib.pubsub.setupkwargs
+    occurs first.
+    """
+    dir_name = os.path.dirname(module.file)
+    module.path.insert(0, os.path.join(dir_name, "kwargs"))
@@ -0,0 +1,34 @@
+"""
+The hooks of the zmq package (pyzmq).
+"""
+
+from importlib.machinery import EXTENSION_SUFFIXES
+import os
+
+from ..finder import ModuleFinder
+from ..module import Module
+from . import WIN32
+
+
+def load_zmq(finder: ModuleFinder, module: Module) -> None:
+    """
+    The zmq package loads zmq.backend.cython dynamically and links
+    dynamically to zmq.libzmq.
+    """
+    finder.IncludePackage("zmq.backend.cython")
+    if WIN32:
+        # For pyzmq 22 the libzmq dependencies are located in
+        # site-packages/pyzmq.libs
+        libzmq_folder = "pyzmq.libs"
+        libs_dir = os.path.join(os.path.dirname(module.path[0]), libzmq_folder)
+        if os.path.exists(libs_dir):
+            finder.IncludeFiles(libs_dir, os.path.join("lib", libzmq_folder))
+            return
+        # Include the bundled libzmq library, if it exists
+        for suffix in EXTENSION_SUFFIXES:
+            filename = "libzmq" + suffix
+            if os.path.isfile(os.path.join(module.path[0], filename)):
+                finder.IncludeFiles(
+                    os.path.join(module.path[0], filename), filename
+                )
+                break
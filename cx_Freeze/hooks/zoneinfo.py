@@ -0,0 +1,33 @@
+"""
+The hooks of the zoneinfo package.
+"""
+
+import os
+from typing import Optional
+
+from ..finder import ModuleFinder
+from ..module import Module
+
+
+def load_zoneinfo(finder: ModuleFinder, module: Module) -> None:
+    """
+    The zoneinfo package requires timezone data, that
+    can be the in tzdata package, if installed.
+    """
+    tzdata: Optional[Module]
+    try:
+        tzdata = finder.IncludePackage("tzdata")
+    except ImportError:
+        tzdata = None
+    if tzdata is None:
+        return
+    # store tzdata along with zoneinfo
+    tzdata.in_file_system = module.in_file_system
+    if tzdata.in_file_system:
+        finder.IncludeFiles(
+            tzdata.path[0],
+            os.path.join("lib", "tzdata"),
+            copy_dependent_files=False,
+        )
+    else:
+        finder.ZipIncludeFiles(tzdata.path[0], "tzdata")
@@ -0,0 +1,592 @@
+"""
+Declares the hooks of cx_Freeze, which tell the finder what it cannot see in
+the code of the modules: the modules imported implicitly, by extension
+modules or dynamically, the names that are optional or defined at runtime
+and the modules that are obsolete or belong to other platforms. Most hooks
+are plain declarations; the others name a function of the hooks package,
+whose module is only imported when one of their modules is found.
+"""
+
+import collections.abc
+import os
+import sys
+import sysconfig
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .module import Module
+
+__all__ = ["EXCLUDES", "HOOKS", "MISSING_HOOKS", "HookSpec"]
+
+WIN32 = sys.platform == "win32"
+
+
+class HookSpec(NamedTuple):
+    """
+    The declarative description of a hook. The hook of a module found is
+    applied to the module; the hook of a module not found is applied to the
+    module that imports it. The files are given relative to the directory
+    of the package (or of the module) and are included in the build
+    directory if they exist. The callback, a function called with the finder
+    and the module after the declarations are applied, is given as
+    "package.module:function" or as the name of a function of the module of
+    the hooks package named after the top level package of the module.
+    """
+
+    includes: Tuple[str, ...] = ()
+    include_packages: Tuple[str, ...] = ()
+    excludes: Tuple[str, ...] = ()
+    ignore_names: Tuple[str, ...] = ()
+    global_names: Tuple[str, ...] = ()
+    in_file_system: Optional[bool] = None
+    include_files: Tuple[Tuple[str, str], ...] = ()
+    constants: Tuple[Tuple[str, str], ...] = ()
+    callback: Optional[str] = None
+
+    def apply(self, finder: Any, module: Module) -> None:
+        """Apply the declarations (not the callback) to the module."""
+        if self.in_file_system is not None:
+            module.in_file_system = self.in_file_system
+        if self.ignore_names:
+            module.ignore_names.update(self.ignore_names)
+        if self.global_names:
+            module.global_names.update(self.global_names)
+        for name in self.includes:
+            finder.IncludeModule(name)
+        for name in self.include_packages:
+            finder.IncludePackage(name)
+        for name in self.excludes:
+            finder.ExcludeModule(name)
+        if self.include_files:
+            if module.path:
+                source_dir = module.path[0]
+            elif module.file is not None:
+                source_dir = os.path.dirname(module.file)
+            else:
+                source_dir = None
+            for source, target in self.include_files:
+                if source_dir is None:
+                    break
+                source_path = os.path.join(source_dir, source)
+                if os.path.exists(source_path):
+                    finder.IncludeFiles(source_path, target)
+        for name, value in self.constants:
+            finder.AddConstant(name, value)
+
+
+def _get_sysconfigdata_name() -> str:
+    """
+    Return the name of the module that sysconfig loads implicitly, built as
+    sysconfig builds it but without calling sysconfig, which sets
+    sys.abiflags on the platforms that do not define it.
+    """
+    if not hasattr(sysconfig, "_get_sysconfigdata_name"):
+        return "_sysconfigdata"
+    multiarch = getattr(sys.implementation, "_multiarch", "")
+    abiflags = getattr(sys, "abiflags", "")
+    return os.environ.get(
+        "_PYTHON_SYSCONFIGDATA_NAME",
+        f"_sysconfigdata_{abiflags}_{sys.platform}_{multiarch}",
+    )
+
+
+# py2 modules that have been removed or renamed in py3
+EXCLUDES: List[str] = [
+    f"collections.{name}" for name in collections.abc.__all__
+]
+EXCLUDES += [
+    f"email.{name}"
+    for name in (
+        "Charset",
+        "Encoders",
+        "Errors",
+        "FeedParser",
+        "Generator",
+        "Header",
+        "Iterators",
+        "Message",
+        "Parser",
+        "Utils",
+        "base64MIME",
+        "quopriMIME",
+    )
+]
+EXCLUDES += [
+    "__builtin__",
+    "__main__",
+    "_winreg",
+    "audiodev",
+    "anydbm",
+    "BaseHTTPServer",
+    "Bastion",
+    "bsddb",
+    "cPickle",
+    "commands",
+    "ConfigParser",
+    "Cookie",
+    "copy_reg",
+    "cStringIO",
+    "dbhash",
+    "dircache",
+    "dl",
+    "dumbdbm",
+    "dummy_thread",
+    "FCNTL",
+    "fl",
+    "fm",
+    "fpformat",
+    "gl",
+    "gdbm",
+    "htmllib",
+    "HTMLParser",
+    "httplib",
+    "hotshot",
+    "ihooks",
+    "imputil",
+    "linuxaudiodev",
+    "md5",
+    "Nav",
+    "new",
+    "mutex",
+    "Pickle",
+    "Queue",
+    "rexec",
+    "robotparser",
+    "sgmllib",
+    "sha",
+    "SocketServer",
+    "statvfs",
+    "StringIO",
+    "sunaudiodev",
+    "thread",
+    "Tkinter",
+    "toaiff",
+    "urllib.quote",
+    "urllib.quote_plus",
+    "urllib.unquote",
+    "urllib.unquote_plus",
+    "urllib.urlencode",
+    "urllib.urlopen",
+    "urllib.urlretrieve",
+    "urllib2",
+    "urlparse",
+    "user",
+    "UserDict",
+    "UserList",
+    "UserString",
+    "whichdb",
+    # macos specfic removed in py3
+    # https://docs.python.org/2.7/library/mac.html?highlight=removed
+    "autoGIL",
+    "EasyDialogs",
+    "findertools",
+    "FrameWork",
+    "ic",
+    "MacOS",
+    "macostools",
+    # macpython removed
+    "aetools",
+    "aepack",
+    "aetypes",
+    "applesingle",
+    "buildtools",
+    "cfmfile",
+    "icopen",
+    "macerros",
+    "macresource",
+    "PixMapWrapper",
+    "videoreader",
+    "W",
+    # sgi removed
+    "al",
+    "imgfile",
+    "jpeg",
+    "cd",
+    "sv",
+    # internal modules
+    "_frozen_importlib",
+    "_frozen_importlib_external",
+    "os.path",
+    # confused names in Windows
+    "multiprocessing.Pool",
+    "multiprocessing.Process",
+]
+# exclusion by platform/os
+if os.name == "nt":
+    EXCLUDES += [
+        "fcntl",
+        "grp",
+        "pwd",
+        "termios",
+    ]
+else:
+    EXCLUDES += [
+        "_overlapped",
+        "_subprocess",
+        "_winapi",
+        "msilib",
+        "msvcrt",
+        "multiprocessing._multiprocessing",
+        "nt",
+        "nturl2path",
+        "pyHook",
+        "pythoncom",
+        "pywintypes",
+        "winerror",
+        "winsound",
+        "win32api",
+        "win32con",
+        "win32com.shell",
+        "win32gui",
+        "win32event",
+        "win32evtlog",
+        "win32evtlogutil",
+        "win32file",
+        "win32pdh",
+        "win32pipe",
+        "win32process",
+        "win32security",
+        "win32service",
+        "win32stat",
+        "win32wnet",
+        "winreg",
+        "wx.activex",
+    ]
+if os.name != "posix":
+    EXCLUDES += [
+        "posix",
+    ]
+if sys.platform != "darwin":
+    EXCLUDES += [
+        "ctypes.macholib.dyld",
+        "mac",
+        "macpath",
+        "macurl2path",
+        "_scproxy",
+    ]
+if os.name != "os2":
+    EXCLUDES += [
+        "os2",
+        "os2emxpath",
+        "_emx_link",
+    ]
+if os.name != "ce":
+    EXCLUDES += [
+        "ce",
+    ]
+if os.name != "riscos":
+    EXCLUDES += [
+        "riscos",
+        "riscosenviron",
+        "riscospath",
+        "rourl2path",
+    ]
+if not sys.platform.startswith("OpenVMS"):
+    EXCLUDES += [
+        "vms_lib",
+    ]
+
+
+# the hooks of the modules found, by module name
+HOOKS: Dict[str, HookSpec] = {
+    "aiofiles": HookSpec(include_packages=("aiofiles",)),
+    "asyncio": HookSpec(include_packages=("asyncio",)),
+    "babel": HookSpec(include_packages=("babel",), in_file_system=True),
+    "backports.zoneinfo": HookSpec(callback="load_backports_zoneinfo"),
+    "bcrypt": HookSpec(includes=("_cffi_backend",)),
+    "cElementTree": HookSpec(includes=("elementtree.ElementTree",)),
+    "ceODBC": HookSpec(includes=("datetime", "decimal")),
+    "certifi": HookSpec(callback="load_certifi"),
+    "cffi.cparser": HookSpec(callback="load_cffi_cparser"),
+    "clr": HookSpec(callback="load_clr"),
+    "crc32c": HookSpec(includes=("_cffi_backend",)),
+    "Crypto.Cipher": HookSpec(callback="load_Crypto_Cipher"),
+    "Crypto.Hash": HookSpec(callback="load_Crypto_Hash"),
+    "Crypto.Math": HookSpec(callback="load_Crypto_Math"),
+    "Crypto.Protocol": HookSpec(callback="load_Crypto_Protocol"),
+    "Crypto.PublicKey": HookSpec(callback="load_Crypto_PublicKey"),
+    "Crypto.Util": HookSpec(callback="load_Crypto_Util"),
+    "Crypto.Util._file_system": HookSpec(
+        callback="load_Crypto_Util__file_system"
+    ),
+    "cryptography.hazmat.bindings._openssl": HookSpec(includes=("cffi",)),
+    "cryptography.hazmat.bindings._padding": HookSpec(
+        includes=("_cffi_backend",)
+    ),
+    "cx_Oracle": HookSpec(includes=("datetime", "decimal")),
+    "datetime": HookSpec(includes=("time",)),
+    "docutils.frontend": HookSpec(ignore_names=("optik",)),
+    "dummy_threading": HookSpec(excludes=("_dummy_threading",)),
+    "ftplib": HookSpec(ignore_names=("SOCKS",)),
+    "gevent": HookSpec(include_packages=("gevent",)),
+    "GifImagePlugin": HookSpec(ignore_names=("_imaging_gif",)),
+    "glib": HookSpec(
+        global_names=(
+            "GError",
+            "IOChannel",
+            "IO_ERR",
+            "IO_FLAG_APPEND",
+            "IO_FLAG_GET_MASK",
+            "IO_FLAG_IS_READABLE",
+            "IO_FLAG_IS_SEEKABLE",
+            "IO_FLAG_IS_WRITEABLE",
+            "IO_FLAG_MASK",
+            "IO_FLAG_NONBLOCK",
+            "IO_FLAG_SET_MASK",
+            "IO_HUP",
+            "IO_IN",
+            "IO_NVAL",
+            "IO_OUT",
+            "IO_PRI",
+            "IO_STATUS_AGAIN",
+            "IO_STATUS_EOF",
+            "IO_STATUS_ERROR",
+            "IO_STATUS_NORMAL",
+            "Idle",
+            "MainContext",
+            "MainLoop",
+            "OPTION_ERROR",
+            "OPTION_ERROR_BAD_VALUE",
+            "OPTION_ERROR_FAILED",
+            "OPTION_ERROR_UNKNOWN_OPTION",
+            "OPTION_FLAG_FILENAME",
+            "OPTION_FLAG_HIDDEN",
+            "OPTION_FLAG_IN_MAIN",
+            "OPTION_FLAG_NOALIAS",
+            "OPTION_FLAG_NO_ARG",
+            "OPTION_FLAG_OPTIONAL_ARG",
+            "OPTION_FLAG_REVERSE",
+            "OPTION_REMAINING",
+            "OptionContext",
+            "OptionGroup",
+            "PRIORITY_DEFAULT",
+            "PRIORITY_DEFAULT_IDLE",
+            "PRIORITY_HIGH",
+            "PRIORITY_HIGH_IDLE",
+            "PRIORITY_LOW",
+            "Pid",
+            "PollFD",
+            "SPAWN_CHILD_INHERITS_STDIN",
+            "SPAWN_DO_NOT_REAP_CHILD",
+            "SPAWN_FILE_AND_ARGV_ZERO",
+            "SPAWN_LEAVE_DESCRIPTORS_OPEN",
+            "SPAWN_SEARCH_PATH",
+            "SPAWN_STDERR_TO_DEV_NULL",
+            "SPAWN_STDOUT_TO_DEV_NULL",
+            "Source",
+            "Timeout",
+            "child_watch_add",
+            "filename_display_basename",
+            "filename_display_name",
+            "filename_from_utf8",
+            "get_application_name",
+            "get_current_time",
+            "get_prgname",
+            "glib_version",
+            "idle_add",
+            "io_add_watch",
+            "main_context_default",
+            "main_depth",
+            "markup_escape_text",
+            "set_application_name",
+            "set_prgname",
+            "source_remove",
+            "spawn_async",
+            "timeout_add",
+            "timeout_add_seconds",
+        )
+    ),
+    "google.cloud.storage": HookSpec(include_packages=("google.cloud",)),
+    "gtk._gtk": HookSpec(
+        includes=("atk", "cairo", "gio", "pango", "pangocairo")
+    ),
+    "h5py": HookSpec(callback="load_h5py"),
+    "hashlib": HookSpec(ignore_names=("_md5", "_sha", "_sha256", "_sha512")),
+    "idna": HookSpec(includes=("idna.idnadata",)),
+    "llvmlite": HookSpec(
+        include_packages=("llvmlite",), excludes=("llvmlite.tests",)
+    ),
+    "lxml": HookSpec(includes=("lxml._elementpath",)),
+    "matplotlib": HookSpec(callback="load_matplotlib"),
+    "mkl": HookSpec(callback="load_mkl"),
+    "Numeric": HookSpec(ignore_names=("dotblas",)),
+    "numpy": HookSpec(callback="load_numpy"),
+    "numpy.core.multiarray": HookSpec(global_names=("arange",)),
+    "numpy.core.numerictypes": HookSpec(
+        global_names=(
+            "bool_",
+            "cdouble",
+            "complexfloating",
+            "csingle",
+            "double",
+            "float64",
+            "float_",
+            "inexact",
+            "intc",
+            "int32",
+            "number",
+            "single",
+        )
+    ),
+    "numpy.core.umath": HookSpec(
+        global_names=(
+            "add",
+            "absolute",
+            "arccos",
+            "arccosh",
+            "arcsin",
+            "arcsinh",
+            "arctan",
+            "arctanh",
+            "bitwise_and",
+            "bitwise_or",
+            "bitwise_xor",
+            "ceil",
+            "conj",
+            "conjugate",
+            "cosh",
+            "divide",
+            "fabs",
+            "floor",
+            "floor_divide",
+            "fmod",
+            "greater",
+            "hypot",
+            "invert",
+            "isfinite",
+            "isinf",
+            "isnan",
+            "less",
+            "left_shift",
+            "log",
+            "logical_and",
+            "logical_not",
+            "logical_or",
+            "logical_xor",
+            "maximum",
+            "minimum",
+            "multiply",
+            "negative",
+            "not_equal",
+            "power",
+            "remainder",
+            "right_shift",
+            "sign",
+            "sinh",
+            "sqrt",
+            "tan",
+            "tanh",
+            "true_divide",
+        )
+    ),
+    "numpy.distutils.command.scons": HookSpec(ignore_names=("numscons",)),
+    "numpy.distutils.misc_util": HookSpec(ignore_names=("numscons",)),
+    "numpy.distutils.system_info": HookSpec(ignore_names=("Numeric",)),
+    "numpy.f2py.__version__": HookSpec(ignore_names=("__svn_version__",)),
+    "numpy.linalg": HookSpec(includes=("numpy.linalg.lapack_lite",)),
+    "numpy.random.mtrand": HookSpec(global_names=("rand", "randn")),
+    "pandas": HookSpec(
+        include_packages=("pandas._libs",), excludes=("pandas.tests",)
+    ),
+    "pikepdf": HookSpec(include_packages=("pikepdf",)),
+    "PIL": HookSpec(include_packages=("PIL",)),
+    "pkg_resources": HookSpec(include_packages=("pkg_resources",)),
+    "postgresql.lib": HookSpec(callback="load_postgresql_lib"),
+    "pty": HookSpec(ignore_names=("sgi",)),
+    "pycountry": HookSpec(callback="load_pycountry"),
+    "pycparser": HookSpec(includes=("pycparser.lextab", "pycparser.yacctab")),
+    "pygments": HookSpec(
+        include_packages=(
+            "pygments.styles",
+            "pygments.lexers",
+            "pygments.formatters",
+        )
+    ),
+    "pyodbc": HookSpec(
+        includes=("datetime", "decimal", "hashlib", "locale", "uuid")
+    ),
+    "PyQt5.phonon": HookSpec(callback="load_PyQt5_phonon"),
+    "PyQt5.Qt": HookSpec(callback="load_PyQt5_Qt"),
+    "PyQt5.QtCore": HookSpec(callback="load_PyQt5_QtCore"),
+    "PyQt5.QtGui": HookSpec(callback="load_PyQt5_QtGui"),
+    "PyQt5.QtMultimedia": HookSpec(callback="load_PyQt5_QtMultimedia"),
+    "PyQt5.QtPrintSupport": HookSpec(callback="load_PyQt5_QtPrintSupport"),
+    "PyQt5.QtWebKit": HookSpec(callback="load_PyQt5_QtWebKit"),
+    "PyQt5.QtWidgets": HookSpec(callback="load_PyQt5_QtWidgets"),
+    "PyQt5.uic": HookSpec(callback="load_PyQt5_uic"),
+    "pyqtgraph": HookSpec(include_packages=("pyqtgraph",)),
+    "pytest": HookSpec(callback="load_pytest"),
+    "pythoncom": HookSpec(callback="load_pythoncom"),
+    "pytz": HookSpec(callback="load_pytz"),
+    "pywintypes": HookSpec(callback="load_pywintypes"),
+    "reportlab": HookSpec(includes=("reportlab.rl_settings",)),
+    "scipy": HookSpec(callback="load_scipy"),
+    "scipy.linalg": HookSpec(
+        include_packages=("scipy.linalg",), global_names=("norm",)
+    ),
+    "scipy.linalg.interface_gen": HookSpec(ignore_names=("pre",)),
+    "scipy.ndimage": HookSpec(callback="load_scipy_ndimage"),
+    "scipy.sparse.csgraph": HookSpec(callback="load_scipy_sparse_csgraph"),
+    "scipy.sparse.linalg.dsolve.linsolve": HookSpec(
+        ignore_names=("scikits.umfpack",)
+    ),
+    "scipy.special": HookSpec(include_packages=("scipy.special",)),
+    "scipy.special._cephes": HookSpec(global_names=("gammaln",)),
+    "setuptools": HookSpec(include_packages=("setuptools",)),
+    "setuptools.extension": HookSpec(
+        ignore_names=("Pyrex.Distutils.build_ext",)
+    ),
+    "site": HookSpec(ignore_names=("sitecustomize", "usercustomize")),
+    "sqlite3": HookSpec(include_packages=("sqlite3",)),
+    "sysconfig": HookSpec(includes=(_get_sysconfigdata_name(),)),
+    "tensorflow": HookSpec(
+        include_packages=(
+            "tensorboard",
+            "tensorflow.compiler",
+            "tensorflow.python",
+        )
+    ),
+    "time": HookSpec(includes=("_strptime",)),
+    "twisted.conch.ssh.transport": HookSpec(
+        include_packages=("Crypto.Cipher",)
+    ),
+    "twitter": HookSpec(ignore_names=("json", "simplejson", "django.utils")),
+    "uvloop": HookSpec(includes=("uvloop._noop",)),
+    "win32api": HookSpec(callback="load_win32api"),
+    "win32com": HookSpec(callback="load_win32com"),
+    "win32file": HookSpec(includes=("pywintypes", "win32timezone")),
+    "wx.lib.pubsub.core": HookSpec(callback="load_wx_lib_pubsub_core"),
+    "Xlib.display": HookSpec(
+        includes=(
+            "Xlib.ext.xtest",
+            "Xlib.ext.shape",
+            "Xlib.ext.xinerama",
+            "Xlib.ext.record",
+            "Xlib.ext.composite",
+            "Xlib.ext.randr",
+        )
+    ),
+    "Xlib.support.connect": HookSpec(callback="load_Xlib_support_connect"),
+    "Xlib.XK": HookSpec(
+        includes=("Xlib.keysymdef.miscellany", "Xlib.keysymdef.latin1")
+    ),
+    "xml.etree.cElementTree": HookSpec(includes=("xml.etree.ElementTree",)),
+    "zmq": HookSpec(callback="load_zmq"),
+    "zoneinfo": HookSpec(callback="load_zoneinfo"),
+    "zope.component": HookSpec(includes=("pkg_resources",)),
+}
+
+# the hooks of the modules not found, by module name
+MISSING_HOOKS: Dict[str, HookSpec] = {
+    "__archive__": HookSpec(ignore_names=("__archive__",)),
+    "__importtrace__": HookSpec(ignore_names=("__importtrace__",)),
+    "gdk": HookSpec(ignore_names=("gdk",)),
+    "ltihooks": HookSpec(ignore_names=("ltihooks",)),
+}
+
+# the hooks which include files on Windows
+if WIN32:
+    HOOKS["_ctypes"] = HookSpec(callback="load__ctypes")
+    HOOKS["sqlite3"] = HookSpec(callback="load_sqlite3")
+    HOOKS["ssl"] = HookSpec(callback="load_ssl")
+    HOOKS["tkinter"] = HookSpec(callback="load_tkinter")
+    MISSING_HOOKS["readline"] = HookSpec(callback="missing_readline")
@@ -0,0 +1,62 @@
+"""
+Implements the reading of the import traces recorded by the frozen
+executables built with the import_trace option (see
+initscripts/__importtrace__.py), which tell the Freezer the modules that are
+actually imported at runtime and the order in which they are imported.
+"""
+
+import json
+import os
+from typing import Dict, List, Sequence
+
+from .exception import ConfigError
+
+__all__ = ["ImportTrace", "TRACE_VARIABLE"]
+
+# these values must match the ones in initscripts/__importtrace__.py
+TRACE_VARIABLE = "CX_FREEZE_IMPORT_TRACE"
+TRACE_VERSION = 1
+
+
+class ImportTrace:
+    """
+    The ImportTrace class merges the trace files given, or the trace files
+    (*.json) found in the directories given. A module is used if any of the
+    traces imported it; its rank is the best position at which a trace
+    imported it, so the modules needed first come first.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        self.files: List[str] = []
+        self.ranks: Dict[str, int] = {}
+        for path in paths:
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    if name.endswith(".json"):
+                        self._read(os.path.join(path, name))
+            else:
+                self._read(path)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ranks
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def _read(self, filename: str) -> None:
+        """Read a trace file and merge it."""
+        try:
+            with open(filename, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as exc:
+            raise ConfigError(f"cannot read import trace {filename}: {exc}")
+        if not isinstance(data, dict) or data.get("version") != TRACE_VERSION:
+            raise ConfigError(f"{filename} is not an import trace")
+        self.files.append(filename)
+        for rank, module in enumerate(data.get("modules", [])):
+            name = module["name"]
+            self.ranks[name] = min(rank, self.ranks.get(name, rank))
+
+    def ordered(self) -> List[str]:
+        """Return the names of the modules in the order they are imported."""
+        return sorted(self.ranks, key=lambda name: (self.ranks[name], name))
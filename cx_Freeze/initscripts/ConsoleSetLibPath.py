@@ -4,7 +4,10 @@ directory in which the executable is found is searched for extensions but
 no other directory is searched. The environment variable LD_LIBRARY_PATH is
 manipulated first, however, to ensure that shared libraries found in the
 target directory are found. This requires a restart of the executable because
-the environment variable LD_LIBRARY_PATH is only checked at startup.
+the environment variable LD_LIBRARY_PATH is only checked at startup. When
+the executable was frozen with origin_rpath, the rpath of the executable and
+of the libraries already points to the target directory, so the restart is
+skipped and LD_LIBRARY_PATH is only set for the child processes.
 
 """
 
@@ -20,7 +23,8 @@ paths = os.environ.get("LD_LIBRARY_PATH", "").split(os.pathsep)
 if DIR_NAME not in paths:
     paths.insert(0, DIR_NAME)
     os.environ["LD_LIBRARY_PATH"] = os.pathsep.join(paths)
-    os.execv(sys.executable, sys.argv)
+    if not getattr(BUILD_CONSTANTS, "ORIGIN_RPATH", False):
+        os.execv(sys.executable, sys.argv)
 
 sys.frozen = True
 sys.path = sys.path[:4]
@@ -0,0 +1,150 @@
+"""
+This module is included when the modules are frozen in an indexed archive
+(lib/library.dat) instead of the zip file. It is imported by __startup__,
+which installs the finder that maps the archive into memory and looks up
+the modules in its sorted index, without parsing a directory at startup.
+The format is described in cx_Freeze/archive.py.
+"""
+
+# only builtin and frozen modules are imported, as the archive is not
+# available yet
+import marshal
+import sys
+from _frozen_importlib import ModuleSpec
+from _frozen_importlib_external import PathFinder
+
+# these values must match the ones in cx_Freeze/archive.py
+ARCHIVE_MAGIC = b"CXAR"
+ARCHIVE_VERSION = 1
+HEADER_SIZE = 16
+FLAG_PACKAGE = 1
+FLAG_COMPRESSED = 2
+
+SEP = "\\" if sys.platform == "win32" else "/"
+
+
+class ArchiveFinder:
+    """
+    Finder and loader of the modules stored in the indexed archive. The
+    code is unmarshaled straight from the memory map of the file, so the
+    modules report as their location the zip file they replace.
+    """
+
+    def __init__(self, filename, location):
+        import mmap
+
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._map[:HEADER_SIZE]
+        if header[:4] != ARCHIVE_MAGIC:
+            raise ImportError(f"{filename} is not an archive")
+        if int.from_bytes(header[4:6], "little") != ARCHIVE_VERSION:
+            raise ImportError(f"{filename} has an unsupported version")
+        self._width = int.from_bytes(header[6:8], "little")
+        self._count = int.from_bytes(header[8:12], "little")
+        self._record_size = self._width + 16
+        self._view = memoryview(self._map)
+        self.filename = filename
+        self.location = location
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.filename!r}>"
+
+    def _lookup(self, fullname):
+        """Return the offset, the size and the flags of the module, using a
+        binary search in the index, or None if it is not in the archive."""
+        key = fullname.encode("utf-8")
+        width = self._width
+        if len(key) > width:
+            return None
+        key = key.ljust(width, b"\0")
+        record_map = self._map
+        record_size = self._record_size
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER_SIZE + middle * record_size
+            name = record_map[start : start + width]
+            if name < key:
+                low = middle + 1
+            elif name > key:
+                high = middle
+            else:
+                record = record_map[start + width : start + record_size]
+                return (
+                    int.from_bytes(record[:8], "little"),
+                    int.from_bytes(record[8:12], "little"),
+                    int.from_bytes(record[12:], "little"),
+                )
+        return None
+
+    def module_names(self):
+        """Return the names of the modules in the archive."""
+        names = []
+        for index in range(self._count):
+            start = HEADER_SIZE + index * self._record_size
+            name = self._map[start : start + self._width].rstrip(b"\0")
+            names.append(name.decode("utf-8"))
+        return names
+
+    def find_spec(self, fullname, path=None, target=None):
+        entry = self._lookup(fullname)
+        if entry is None:
+            return None
+        is_package = bool(entry[2] & FLAG_PACKAGE)
+        location = SEP.join([self.location] + fullname.split("."))
+        if is_package:
+            origin = location + SEP + "__init__.pyc"
+        else:
+            origin = location + ".pyc"
+        spec = ModuleSpec(fullname, self, origin=origin, is_package=is_package)
+        spec.has_location = True
+        if is_package:
+            spec.submodule_search_locations = [location]
+        return spec
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = self.get_code(module.__spec__.name)
+        exec(code, module.__dict__)
+
+    def get_code(self, fullname):
+        entry = self._lookup(fullname)
+        if entry is None:
+            raise ImportError(f"no module named {fullname!r}", name=fullname)
+        offset, size, flags = entry
+        data = self._view[offset : offset + size]
+        if flags & FLAG_COMPRESSED:
+            import zlib
+
+            data = zlib.decompress(data)
+        return marshal.loads(data)
+
+    def get_source(self, fullname):
+        return None
+
+    def is_package(self, fullname):
+        entry = self._lookup(fullname)
+        if entry is None:
+            raise ImportError(f"no module named {fullname!r}", name=fullname)
+        return bool(entry[2] & FLAG_PACKAGE)
+
+
+def install():
+    """Install the finder of the archive found beside the zip file in
+    sys.path, before the path based finder, and return it."""
+    for location in sys.path:
+        if not location.endswith(".zip"):
+            continue
+        try:
+            finder = ArchiveFinder(location[:-4] + ".dat", location)
+        except OSError:
+            continue
+        index = len(sys.meta_path)
+        if PathFinder in sys.meta_path:
+            index = sys.meta_path.index(PathFinder)
+        sys.meta_path.insert(index, finder)
+        return finder
+    return None
@@ -0,0 +1,171 @@
+"""
+This module is included when the executables are frozen with the
+import_trace option. It is imported by __startup__ and, when the environment
+variable CX_FREEZE_IMPORT_TRACE is set, it records the modules imported at
+runtime, in order and with the time spent importing each of them. The trace
+is written at exit to the file named by the variable or, if it names a
+directory, to a file of this directory named after the executable and the
+process. The freezer reads these traces with the trace_files option.
+"""
+
+# only builtin modules are imported, to trace as many imports as possible
+import sys
+import time
+
+# these values must match the ones in cx_Freeze/importtrace.py
+TRACE_VARIABLE = "CX_FREEZE_IMPORT_TRACE"
+TRACE_VERSION = 1
+
+
+class LegacyTracingLoader:
+    """
+    Wraps the loader of a module to time the loading of the module, for the
+    loaders which only implement load_module (like zipimport before Python
+    3.10). The real loader is restored in the spec before the module is
+    loaded, so the module never sees the wrapper.
+    """
+
+    def __init__(self, tracer, spec):
+        self._tracer = tracer
+        self._spec = spec
+        self._loader = spec.loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def load_module(self, fullname):
+        self._spec.loader = self._loader
+        self._tracer.enter()
+        try:
+            return self._loader.load_module(fullname)
+        finally:
+            self._tracer.leave(fullname)
+
+
+class TracingLoader(LegacyTracingLoader):
+    """
+    Wraps the loader of a module to time the execution of the module. The
+    real loader is restored in the spec and in the module before the module
+    is executed, so the module never sees the wrapper.
+    """
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        if create_module is None:
+            return None
+        return create_module(spec)
+
+    def exec_module(self, module):
+        loader = self._loader
+        module.__spec__.loader = loader
+        module.__loader__ = loader
+        self._tracer.enter()
+        try:
+            loader.exec_module(module)
+        finally:
+            self._tracer.leave(module.__spec__.name)
+
+
+class ImportTracer:
+    """
+    Finder placed first in sys.meta_path, which records the imports. It
+    asks the other finders for the spec of each module and wraps its loader
+    to time the execution of the module, like -X importtime: the time
+    spent in the module itself and the time including its imports.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.start = time.perf_counter()
+        # the modules imported before the tracer was installed have no times
+        self.records = {name: [None, None, None] for name in sys.modules}
+        self._finding = set()
+        self._stack = []
+
+    def enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][1] += cumulative
+        record = self.records.get(name)
+        if record is not None:
+            record[1] = cumulative - children
+            record[2] = cumulative
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, "find_spec", None)
+                if finder is self or find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+        if fullname not in self.records:
+            start = time.perf_counter() - self.start
+            self.records[fullname] = [start, None, None]
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = TracingLoader(self, spec)
+        elif hasattr(spec.loader, "load_module"):
+            spec.loader = LegacyTracingLoader(self, spec)
+        return spec
+
+    def write(self):
+        """Write the trace of the imports, in the order they started."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        import json
+        import os
+
+        for name in list(sys.modules):
+            self.records.setdefault(name, [None, None, None])
+        modules = [
+            {"name": name, "start": start, "self": own, "cumulative": total}
+            for name, (start, own, total) in self.records.items()
+        ]
+        filename = self.filename
+        if os.path.isdir(filename):
+            name = os.path.splitext(os.path.basename(sys.executable))[0]
+            filename = os.path.join(filename, f"{name}-{os.getpid()}.json")
+        data = {
+            "version": TRACE_VERSION,
+            "executable": sys.executable,
+            "modules": modules,
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+
+
+def install():
+    """Install the tracer, if the environment variable is set, and return
+    it."""
+    if sys.platform == "win32":
+        from nt import environ
+
+        filename = environ.get(TRACE_VARIABLE)
+    else:
+        from posix import environ
+
+        value = environ.get(TRACE_VARIABLE.encode())
+        filename = None
+        if value is not None:
+            encoding = sys.getfilesystemencoding()
+            filename = value.decode(encoding, "surrogateescape")
+    if not filename:
+        return None
+    import atexit
+
+    tracer = ImportTracer(filename)
+    sys.meta_path.insert(0, tracer)
+    atexit.register(tracer.write)
+    return tracer
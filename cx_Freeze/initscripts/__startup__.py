@@ -3,16 +3,32 @@ This is the first script that is run when cx_Freeze starts up. It simply
 determines the name of the initscript that is to be executed.
 """
 
+import sys
+
+import BUILD_CONSTANTS
+
+# when the executables are frozen with the import_trace option, the imports
+# are recorded if the environment variable of the trace is set
+if getattr(BUILD_CONSTANTS, "IMPORT_TRACE", False):
+    import __importtrace__
+
+    __importtrace__.install()
+
+# when the modules are frozen in the indexed archive, its finder is installed
+# before the other modules are imported
+archive_finder = None
+if getattr(BUILD_CONSTANTS, "INDEXED_ARCHIVE", False):
+    import __archive__
+
+    archive_finder = __archive__.install()
+
 import os
 import string
-import sys
-from importlib.machinery import (
-    EXTENSION_SUFFIXES,
-    ExtensionFileLoader,
-    ModuleSpec,
-    PathFinder,
-)
+import zipimport
+from importlib.machinery import ExtensionFileLoader, ModuleSpec, PathFinder
 
+DIR_NAME = os.path.dirname(sys.executable)
+EXTENSION_MODULES = getattr(BUILD_CONSTANTS, "EXTENSION_MODULES", {})
 STRINGREPLACE = list(
     string.whitespace + string.punctuation.replace(".", "").replace("_", "")
 )
@@ -26,20 +42,16 @@ class ExtensionFinder(PathFinder):
         are included in the zip file (instead of as files on disk);
         extension modules cannot be found within zip files but are stored in
         the lib subdirectory; if the extension module is found in a package,
-        however, its name has been altered so this finder is needed.
+        however, its name has been altered so this finder is needed. The
+        locations of these modules are recorded when they are frozen, so
+        the file system is not searched.
         """
-        if path is None:
+        location = EXTENSION_MODULES.get(fullname)
+        if location is None:
             return None
-        suffixes = EXTENSION_SUFFIXES
-        for entry in sys.path:
-            if ".zip" in entry:
-                continue
-            for ext in suffixes:
-                location = os.path.join(entry, fullname + ext)
-                if os.path.isfile(location):
-                    loader = ExtensionFileLoader(fullname, location)
-                    return ModuleSpec(fullname, loader, origin=location)
-        return None
+        location = os.path.join(DIR_NAME, location)
+        loader = ExtensionFileLoader(fullname, location)
+        return ModuleSpec(fullname, loader, origin=location)
 
 
 sys.meta_path.append(ExtensionFinder)
@@ -65,11 +77,22 @@ def run():
         module = __import__(name + "__init__")
     except ModuleNotFoundError:
         files = []
-        for k in __loader__._files:
+        loader = __loader__
+        if not hasattr(loader, "_files"):
+            # the modules are embedded in the executable, so look up the
+            # scripts in the zip file (the first entry of sys.path)
+            loader = zipimport.zipimporter(sys.path[0])
+        for k in loader._files:
             if k.endswith("__init__.pyc"):
                 k = k.rpartition("__init__")[0]
                 if k.isidentifier():
                     files.append(k)
+        if archive_finder is not None:
+            for k in archive_finder.module_names():
+                if k.endswith("__init__"):
+                    k = k.rpartition("__init__")[0]
+                    if k.isidentifier():
+                        files.append(k)
         if len(files) != 1:
             raise RuntimeError(
                 "Apparently, the original executable has been renamed to "
@@ -0,0 +1,168 @@
+"""
+Implements the manifest of a build, used by the incremental mode of the
+Freezer to update a target directory instead of building it from scratch.
+"""
+
+import hashlib
+from importlib.util import MAGIC_NUMBER
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import importlib_metadata
+
+__all__ = ["BuildManifest"]
+
+# bump this value when the layout of the manifest changes
+MANIFEST_VERSION = 1
+
+
+def _file_hash(path: str) -> Optional[str]:
+    """Return the sha1 digest of the contents of the file."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _file_stat(path: str) -> Optional[List[int]]:
+    """Return the size and the modification time of the file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class BuildManifest:
+    """
+    The BuildManifest class records, for each file written to the target
+    directory, the inputs it was produced from: the source file (path,
+    size, modification time and content hash) when the file is a copy and
+    the options used to produce it. A file is up to date when the inputs
+    did not change and the file itself was not modified since the build
+    that wrote it. The manifest is stored beside the target directory, so
+    it is not distributed with the frozen application. The entries can be
+    recorded by the threads that copy the files.
+    """
+
+    def __init__(self, target_dir: str):
+        self.target_dir: str = os.path.abspath(target_dir)
+        self.filename: str = self.target_dir + ".manifest.json"
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._header: Dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "cx_Freeze": importlib_metadata.version("cx_Freeze"),
+            "magic": MAGIC_NUMBER.hex(),
+        }
+        self._lock = threading.Lock()
+        self.loaded: bool = self._load()
+
+    def _key(self, path: str) -> str:
+        """Return the key of the entry for the file, relative to the target
+        directory."""
+        path = os.path.relpath(os.path.abspath(path), self.target_dir)
+        return os.path.normcase(path).replace(os.sep, "/")
+
+    def _load(self) -> bool:
+        """Load the manifest of the previous build, if it exists and was
+        written by the same version of cx_Freeze and Python."""
+        try:
+            with open(self.filename, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("header") != self._header:
+            return False
+        self.previous = data.get("entries", {})
+        return True
+
+    def add(
+        self, path: str, source: Optional[str] = None, options: Any = None
+    ) -> None:
+        """Record that the file was written from source with the options."""
+        entry = {"source": source, "options": options}
+        if source is not None:
+            entry["stat"] = _file_stat(source)
+            entry["hash"] = _file_hash(source)
+        entry["target"] = _file_stat(path)
+        with self._lock:
+            self.entries[self._key(path)] = entry
+
+    def update_target(self, path: str) -> None:
+        """Record the new state of the file, once it is replaced or modified
+        after it was written, so it is still up to date."""
+        with self._lock:
+            entry = self.entries.get(self._key(path))
+            if entry is not None:
+                entry["target"] = _file_stat(path)
+
+    def invalidate(self, path: str) -> None:
+        """Force the file to be written again."""
+        with self._lock:
+            self.previous.pop(self._key(path), None)
+
+    def is_up_to_date(
+        self, path: str, source: Optional[str] = None, options: Any = None
+    ) -> bool:
+        """
+        Return True if the file is up to date with the source and the
+        options, keeping its entry for the new manifest. A source with a
+        different modification time but the same contents is up to date.
+        """
+        key = self._key(path)
+        previous = self.previous.get(key)
+        if previous is None:
+            return False
+        if previous["source"] != source or previous["options"] != options:
+            return False
+        target_stat = previous["target"]
+        if target_stat is None or _file_stat(path) != target_stat:
+            return False
+        entry = dict(previous)
+        if source is not None:
+            stat = _file_stat(source)
+            if stat is None:
+                return False
+            if stat != previous["stat"]:
+                if stat[0] != previous["stat"][0]:
+                    return False
+                if _file_hash(source) != previous["hash"]:
+                    return False
+                entry["stat"] = stat
+        with self._lock:
+            self.entries[key] = entry
+        return True
+
+    def forget(self, path: str) -> None:
+        """Remove the entries of the file or of the files in the directory,
+        once they are removed from the target directory."""
+        key = self._key(path)
+        prefix = key + "/"
+        with self._lock:
+            for name in list(self.entries):
+                if name == key or name.startswith(prefix):
+                    del self.entries[name]
+
+    def stale_files(self) -> List[str]:
+        """Return the files written by the previous build but not by this
+        one."""
+        return [
+            os.path.join(self.target_dir, *name.split("/"))
+            for name in sorted(self.previous)
+            if name not in self.entries
+        ]
+
+    def save(self) -> None:
+        """Write the manifest of this build."""
+        data = {"header": self._header, "entries": self.entries}
+        temp_name = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_name, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(temp_name, self.filename)
@@ -4,80 +4,78 @@ Base class for module.
 
 import datetime
 from keyword import iskeyword
+import marshal
 import os
-import shutil
+import re
 import socket
+import sys
 from tempfile import TemporaryDirectory
 from types import CodeType
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 import importlib_metadata
 
+from .codespool import CodeSpool, SpooledCode
 from .exception import ConfigError
 
 
-__all__ = ["ConstantsModule", "Module"]
+__all__ = ["ConstantsModule", "DistributionIndex", "Module"]
 
 
 class Module:
     """
-    The Module class.
+    The Module class. The instances have no __dict__ and their sets of names
+    are only allocated when a name is added, as a build can find tens of
+    thousands of modules. The names imported with "from module import *"
+    are kept as a frozen set, shared by the modules which import the same
+    module, until the set of global names is requested to be modified. The
+    code can be written to a spool, which releases the code object until it
+    is requested again.
     """
 
+    __slots__ = (
+        "name",
+        "path",
+        "file",
+        "parent",
+        "_code",
+        "_spooled_code",
+        "imports",
+        "in_import",
+        "source_is_zip_file",
+        "_in_file_system",
+        "_exclude_names",
+        "_global_names",
+        "_ignore_names",
+        "_star_names",
+        "_frozen_global_names",
+    )
+
     def __init__(
         self,
         name: str,
         path: Optional[str] = None,
         file_name: Optional[str] = None,
         parent: Optional["Module"] = None,
-        *,
-        rootcachedir: TemporaryDirectory,
     ):
-        self.name: str = name
+        self.name: str = sys.intern(name)
         self.path: Optional[str] = path
         self.file: Optional[str] = file_name
         self.parent: Optional["Module"] = parent
-        self.rootcachedir = rootcachedir
-        self.code: Optional[CodeType] = None
-        self.dist_files: List[str] = []
-        self.exclude_names: Set[str] = set()
-        self.global_names: Set[str] = set()
-        self.ignore_names: Set[str] = set()
+        self._code: Optional[CodeType] = None
+        self._spooled_code: Optional[SpooledCode] = None
+        self._exclude_names: Optional[Set[str]] = None
+        self._global_names: Optional[Set[str]] = None
+        self._ignore_names: Optional[Set[str]] = None
+        # the global names of the modules imported with *
+        self._star_names: Tuple[FrozenSet[str], ...] = ()
+        self._frozen_global_names: Optional[FrozenSet[str]] = None
+        # the names of the modules imported by this one, in the order in
+        # which the imports were found
+        self.imports: Dict[str, None] = {}
         self.in_import: bool = True
         self.source_is_zip_file: bool = False
         self._in_file_system: bool = True
-        # dist-info files (metadata)
-        self._cache_dist_info(name)
-        try:
-            requires = importlib_metadata.requires(name)
-        except importlib_metadata.PackageNotFoundError:
-            requires = None
-        if requires is not None:
-            for req in requires:
-                req_name = req.partition(" ")[0]
-                self._cache_dist_info(req_name)
-
-    def _cache_dist_info(self, package_name) -> None:
-        """Cache the dist-info files."""
-        try:
-            files = importlib_metadata.files(package_name)
-        except importlib_metadata.PackageNotFoundError:
-            files = None
-        if files is None:
-            return
-        # select only dist-info files
-        files = [file for file in files if file.match("*.dist-info/*")]
-        if files:
-            for file in files:
-                src_path = file.locate()
-                if not src_path.exists():
-                    continue
-                dist_path = os.path.join(
-                    self.rootcachedir.name, os.path.normpath(file.as_posix())
-                )
-                os.makedirs(os.path.dirname(dist_path), exist_ok=True)
-                shutil.copyfile(src_path, dist_path)
-                self.dist_files.append(file.as_posix())
 
     def __repr__(self) -> str:
         parts = [f"name={self.name!r}"]
@@ -87,6 +85,50 @@ class Module:
             parts.append(f"path={self.path!r}")
         return "<Module {}>".format(", ".join(parts))
 
+    @property
+    def code(self) -> Optional[CodeType]:
+        """The code of the module; the code written to a spool is read back
+        each time it is requested."""
+        if self._spooled_code is not None:
+            return marshal.loads(self._spooled_code.read())
+        return self._code
+
+    @code.setter
+    def code(self, value: Optional[CodeType]) -> None:
+        self._code = value
+        self._spooled_code = None
+
+    @property
+    def exclude_names(self) -> Set[str]:
+        """The names of the modules that are not imported by the module."""
+        if self._exclude_names is None:
+            self._exclude_names = set()
+        return self._exclude_names
+
+    @property
+    def global_names(self) -> Set[str]:
+        """The global names of the module, as a set that can be modified."""
+        if self._global_names is None:
+            self._global_names = set()
+        for star_names in self._star_names:
+            self._global_names.update(star_names)
+        self._star_names = ()
+        self._frozen_global_names = None
+        return self._global_names
+
+    @property
+    def has_code(self) -> bool:
+        """True if the module has code, in memory or in a spool."""
+        return self._code is not None or self._spooled_code is not None
+
+    @property
+    def ignore_names(self) -> Set[str]:
+        """The names of the modules imported by the module that are not
+        reported as missing."""
+        if self._ignore_names is None:
+            self._ignore_names = set()
+        return self._ignore_names
+
     @property
     def in_file_system(self) -> bool:
         """
@@ -103,6 +145,160 @@ class Module:
     def in_file_system(self, value) -> None:
         self._in_file_system = value
 
+    def add_global_name(self, name: str) -> None:
+        """Add a global name to the module."""
+        if self._global_names is None:
+            self._global_names = set()
+        self._global_names.add(sys.intern(name))
+        self._frozen_global_names = None
+
+    def add_star_import(self, module: "Module") -> None:
+        """Add the global names of the module imported with *."""
+        star_names = module.get_frozen_global_names()
+        if star_names and star_names not in self._star_names:
+            self._star_names += (star_names,)
+            self._frozen_global_names = None
+
+    def dump_code(self) -> bytes:
+        """Return the marshaled code of the module."""
+        if self._spooled_code is not None:
+            return self._spooled_code.read()
+        return marshal.dumps(self._code)
+
+    def get_frozen_global_names(self) -> FrozenSet[str]:
+        """Return the global names of the module as a frozen set, which is
+        shared until the global names change."""
+        frozen = self._frozen_global_names
+        if frozen is None:
+            if not self._global_names and len(self._star_names) == 1:
+                frozen = self._star_names[0]
+            else:
+                frozen = frozenset(self._global_names or ()).union(
+                    *self._star_names
+                )
+            self._frozen_global_names = frozen
+        return frozen
+
+    def has_exclude_name(self, name: str) -> bool:
+        """Return True if the module does not import the named module."""
+        return self._exclude_names is not None and name in self._exclude_names
+
+    def has_global_name(self, name: str) -> bool:
+        """Return True if the name is a global name of the module."""
+        if self._global_names is not None and name in self._global_names:
+            return True
+        return any(name in star_names for star_names in self._star_names)
+
+    def has_ignore_name(self, name: str) -> bool:
+        """Return True if the named module is not reported as missing."""
+        return self._ignore_names is not None and name in self._ignore_names
+
+    def spool_code(self, spool: CodeSpool) -> None:
+        """Write the marshaled code of the module to the spool and release
+        the code object."""
+        if self._code is not None:
+            self._spooled_code = spool.add(marshal.dumps(self._code))
+            self._code = None
+
+
+class DistributionIndex:
+    """
+    The DistributionIndex class maps the top-level import names to the
+    installed distributions that provide them, so the metadata (dist-info
+    files) of the distributions used by the frozen modules can be included.
+    The index is built once, on first use, with a single pass over the
+    distributions found in the path.
+    """
+
+    def __init__(self, path: Optional[List[str]] = None):
+        self.path: Optional[List[str]] = path
+        self._by_import_name: Optional[Dict[str, List]] = None
+        self._by_name: Dict[str, object] = {}
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        """Normalize the name of a distribution (PEP 503)."""
+        return re.sub(r"[-_.]+", "_", name).lower()
+
+    def _build(self) -> Dict[str, List]:
+        """Build the index of the installed distributions."""
+        by_import_name: Dict[str, List] = {}
+        path = sys.path if self.path is None else self.path
+        for dist in importlib_metadata.distributions(path=path):
+            name = dist.metadata["Name"]
+            if not name:
+                continue
+            name = self._normalize(name)
+            # the first distribution found in the path has priority
+            if name in self._by_name:
+                continue
+            self._by_name[name] = dist
+            top_level = dist.read_text("top_level.txt")
+            if top_level:
+                import_names = top_level.split()
+            else:
+                import_names = {
+                    file.parts[0]
+                    if len(file.parts) > 1
+                    else file.with_suffix("").name
+                    for file in dist.files or []
+                    if file.suffix == ".py"
+                }
+            for import_name in import_names:
+                by_import_name.setdefault(import_name, []).append(dist)
+        return by_import_name
+
+    def _get_distributions(self, import_name: str) -> List:
+        """
+        Return the distributions that provide the given top-level name,
+        along with the distributions that they require.
+        """
+        if self._by_import_name is None:
+            self._by_import_name = self._build()
+        dists = list(self._by_import_name.get(import_name, []))
+        dist = self._by_name.get(self._normalize(import_name))
+        if dist is not None and dist not in dists:
+            dists.append(dist)
+        for dist in list(dists):
+            for requirement in dist.requires or []:
+                # the requirements of optional features are not needed
+                if re.search(r";.*\bextra\s*==", requirement):
+                    continue
+                req_name = re.split(r"[\s;<>=!~\[(]", requirement, 1)[0]
+                req_dist = self._by_name.get(self._normalize(req_name))
+                if req_dist is not None and req_dist not in dists:
+                    dists.append(req_dist)
+        return dists
+
+    def get_files(self, import_names: Iterable[str]) -> List[Tuple[str, str]]:
+        """
+        Return the dist-info files of the distributions that provide the
+        given top-level names, as a sorted list of tuples of the form
+        (archive name, source path).
+        """
+        files: Dict[str, str] = {}
+        for import_name in import_names:
+            for dist in self._get_distributions(import_name):
+                for file in dist.files or []:
+                    if not file.match("*.dist-info/*"):
+                        continue
+                    arc_name = file.as_posix()
+                    if arc_name in files:
+                        continue
+                    source_path = file.locate()
+                    if os.path.isfile(source_path):
+                        files[arc_name] = str(source_path)
+        return sorted(files.items())
+
+    def get_version(self, import_name: str) -> Optional[str]:
+        """Return the version of the distribution that provides the given
+        top-level name, or None if it is not installed as a distribution."""
+        import_name = import_name.partition(".")[0]
+        dists = self._get_distributions(import_name)
+        if not dists:
+            return None
+        return dists[0].metadata["Version"]
+
 
 class ConstantsModule:
     """
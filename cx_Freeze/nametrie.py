@@ -0,0 +1,102 @@
+"""
+Implements the set of excluded module names of the finder, which the
+freezer also uses to filter the modules written, the data directories of the
+packages copied and the modules of the reports. A name excludes the module
+and its submodules; a glob pattern, like *.tests, excludes the modules whose
+name, or the name of one of their packages, matches it. The names are kept
+in a trie of their dotted parts, so a lookup costs the depth of the name.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+__all__ = ["NameTrie"]
+
+# the key of a node of the trie that marks an excluded name
+EXCLUDED = None
+
+
+def is_pattern(name: str) -> bool:
+    """Return True if the name is a glob pattern."""
+    return any(char in name for char in "*?[")
+
+
+class NameTrie:
+    """
+    The NameTrie class holds the names and the patterns added, in order. The
+    patterns whose last part is a plain name are indexed by it, so only
+    the patterns that can match a name are tried.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: Dict[str, None] = {}
+        self._root: Dict[Optional[str], Any] = {}
+        self._patterns: Dict[Optional[str], List[str]] = {}
+        self.update(names)
+
+    def __contains__(self, name: str) -> bool:
+        parts = name.split(".")
+        node = self._root
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            if EXCLUDED in node:
+                return True
+        if not self._patterns:
+            return False
+        any_patterns = self._patterns.get(None, [])
+        for index, part in enumerate(parts, 1):
+            patterns = self._patterns.get(part)
+            if patterns is None and not any_patterns:
+                continue
+            prefix = ".".join(parts[:index])
+            for pattern in (patterns or []) + any_patterns:
+                if fnmatchcase(prefix, pattern):
+                    return True
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        """Add the name or the pattern."""
+        if name in self._names:
+            return
+        self._names[name] = None
+        if is_pattern(name):
+            last_part = name.rpartition(".")[2]
+            key = None if is_pattern(last_part) else last_part
+            self._patterns.setdefault(key, []).append(name)
+            return
+        node = self._root
+        for part in name.split("."):
+            node = node.setdefault(part, {})
+        node[EXCLUDED] = None
+
+    def discard(self, name: str) -> None:
+        """Remove the name or the pattern, if it was added; the names
+        excluded by another name or by a pattern stay excluded."""
+        if name not in self._names:
+            return
+        del self._names[name]
+        if is_pattern(name):
+            last_part = name.rpartition(".")[2]
+            key = None if is_pattern(last_part) else last_part
+            patterns = self._patterns[key]
+            patterns.remove(name)
+            if not patterns:
+                del self._patterns[key]
+            return
+        node = self._root
+        for part in name.split("."):
+            node = node[part]
+        del node[EXCLUDED]
+
+    def update(self, names: Iterable[str]) -> None:
+        """Add the names and the patterns."""
+        for name in names:
+            self.add(name)
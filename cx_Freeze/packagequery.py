@@ -0,0 +1,111 @@
+"""
+Implements the queries that the hooks make about the packages they describe
+when the information cannot be found in the file system, like the library
+paths of Qt or the data directory of an old matplotlib. The code of a query
+runs in a helper process, with the path of the finder, so the freezer
+process never imports these packages, which can take seconds and hundreds of
+megabytes. The answers are cached by package version: in memory and, when
+the finder has a cache directory, in the queries directory of the cache.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+from .module import DistributionIndex
+
+__all__ = ["PackageQuery"]
+
+# bump this value when the layout of an answer changes
+QUERY_VERSION = 1
+
+# the result is printed after a marker, as the package may print too
+RESULT_MARKER = "\0cx_Freeze query result\0"
+
+HELPER = f"""
+import json, sys
+namespace = {{}}
+exec(compile(sys.stdin.read(), "<query>", "exec"), namespace)
+sys.stdout.write({RESULT_MARKER!r} + json.dumps(namespace.get("result")))
+"""
+
+
+class PackageQuery:
+    """
+    The PackageQuery class runs the code of a query in a helper process and
+    returns the value that the code assigns to the name result, which must
+    be serializable with json. A query that fails, because the package
+    cannot be imported or for any other reason, raises ImportError.
+    """
+
+    def __init__(
+        self,
+        path: List[str],
+        distributions: DistributionIndex,
+        cache_dir: Optional[str] = None,
+    ):
+        self.path: List[str] = path
+        self.distributions: DistributionIndex = distributions
+        self.cache_dir: Optional[str] = None
+        if cache_dir is not None:
+            self.cache_dir = os.path.join(cache_dir, "queries")
+        self.runs: int = 0
+        self._answers: Dict[str, Any] = {}
+
+    def _entry_name(self, name: str, source: str) -> Optional[str]:
+        """Return the name of the file that caches the answer, or None if
+        the version of the package is not known."""
+        version = self.distributions.get_version(name)
+        if self.cache_dir is None or version is None:
+            return None
+        key = [QUERY_VERSION, sys.executable, sys.version, name, version]
+        key.append(source)
+        digest = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".json")
+
+    def run(self, name: str, source: str) -> Any:
+        """Return the result of the query about the package of the given
+        name."""
+        key = f"{name}\0{source}"
+        if key in self._answers:
+            return self._answers[key]
+        entry_name = self._entry_name(name, source)
+        if entry_name is not None:
+            try:
+                with open(entry_name, encoding="utf-8") as file:
+                    result = self._answers[key] = json.load(file)["result"]
+                return result
+            except (OSError, ValueError, KeyError):
+                pass
+        result = self._answers[key] = self._run_helper(name, source)
+        if entry_name is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temporary file and rename it, so a concurrent build
+            # never reads a partial entry
+            temp_name = f"{entry_name}.{os.getpid()}.tmp"
+            with open(temp_name, "w", encoding="utf-8") as file:
+                json.dump({"name": name, "result": result}, file)
+            os.replace(temp_name, entry_name)
+        return result
+
+    def _run_helper(self, name: str, source: str) -> Any:
+        """Run the query in a helper process."""
+        self.runs += 1
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(self.path)
+        process = subprocess.run(
+            [sys.executable, "-c", HELPER],
+            input=source,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            universal_newlines=True,
+        )
+        output = process.stdout
+        if process.returncode != 0 or RESULT_MARKER not in output:
+            lines = process.stderr.strip().splitlines() or ["no result"]
+            raise ImportError(f"query about {name!r} failed: {lines[-1]}")
+        return json.loads(output.rpartition(RESULT_MARKER)[2])
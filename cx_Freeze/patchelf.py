@@ -3,43 +3,701 @@ Implements a new `Patchelf` interface to create an abstraction for patching
 ELF files.
 """
 
+from collections import deque
+from contextlib import contextmanager
 from distutils.spawn import find_executable
-from subprocess import check_call, check_output, CalledProcessError
+import os
 import re
+import stat
+import struct
+from subprocess import check_call, check_output, CalledProcessError
+import sys
+import sysconfig
+from typing import Dict, List, Optional, Tuple
+
+__all__ = ["ELFFile", "Patchelf"]
+
+ELF_MAGIC = b"\x7fELF"
+PT_LOAD = 1
+PT_DYNAMIC = 2
+SHT_STRTAB = 3
+SHT_NOBITS = 8
+SHT_DYNSYM = 11
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_STRSZ = 10
+DT_SONAME = 14
+DT_RPATH = 15
+DT_RUNPATH = 29
+DT_VERDEF = 0x6FFFFFFC
+DT_VERDEFNUM = 0x6FFFFFFD
+DT_VERNEED = 0x6FFFFFFE
+DT_VERNEEDNUM = 0x6FFFFFFF
+DT_STRING_TAGS = (DT_NEEDED, DT_SONAME, DT_RPATH, DT_RUNPATH)
+
+# formats of the ELF structures, by ELF class (1 = 32 bits, 2 = 64 bits)
+ELF_HEADER_FORMAT = {1: "HHIIIIIHHHHHH", 2: "HHIQQQIHHHHHH"}
+PROGRAM_HEADER_FORMAT = {1: "IIIIIIII", 2: "IIQQQQQQ"}
+SECTION_HEADER_FORMAT = {1: "IIIIIIIIII", 2: "IIQQQQIIQQ"}
+DYNAMIC_FORMAT = {1: "iI", 2: "qQ"}
+
+# the dynamic linker is already loaded, ldd does not list it as dependency
+DYNAMIC_LINKER_NAME = re.compile(r"ld(64)?([-.][-\w]*)?\.so(\.\d+)*$")
+
+LD_SO_CACHE = "/etc/ld.so.cache"
+LD_SO_CACHE_OLD_MAGIC = b"ld.so-1.7.0"
+LD_SO_CACHE_NEW_MAGIC = b"glibc-ld.so.cache1.1"
+
+
+class ELFFile:
+    """
+    Reads the dynamic section of an ELF file: the needed libraries, the
+    soname and the rpath or runpath, along with the locations of the
+    entries and strings in the file that can be edited in place, the
+    number of empty entries that follow the end of the dynamic section and
+    the free space that follows the string table.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name: str = file_name
+        self.elf_class: int = 0
+        self.machine: int = 0
+        self.needed: List[str] = []
+        self.soname: Optional[str] = None
+        self.rpath: Optional[str] = None
+        self.runpath: Optional[str] = None
+        # (tag, value, file offset) of each entry of the dynamic section
+        self.dynamic: List[Tuple[int, int, int]] = []
+        self.dynamic_address: int = 0
+        self.dynamic_offset: int = 0
+        self.spare_dynamic_entries: int = 0
+        self.strtab_address: int = 0
+        self.strtab_offset: int = 0
+        self.strtab_size: int = 0
+        self.byte_order: str = "<"
+        self._section_headers: List[tuple] = []
+        # (start, end) offsets of the headers and tables of the file
+        self._header_ranges: List[Tuple[int, int]] = []
+        self._shoff: int = 0
+        self._shentsize: int = 0
+        # (address, file offset, file size) of each loaded segment
+        self._segments: List[Tuple[int, int, int]] = []
+        with open(file_name, "rb") as file:
+            self._read(file)
+
+    def _read(self, file) -> None:
+        ident = file.read(16)
+        if len(ident) < 16 or ident[:4] != ELF_MAGIC or ident[4] not in (1, 2):
+            raise ValueError(f"{self.file_name!r} is not an ELF file")
+        self.elf_class = elf_class = ident[4]
+        self.byte_order = byte_order = "<" if ident[5] == 1 else ">"
+
+        header_format = byte_order + ELF_HEADER_FORMAT[elf_class]
+        header = struct.unpack(
+            header_format, file.read(struct.calcsize(header_format))
+        )
+        self.machine = header[1]
+        phoff, shoff = header[4], header[5]
+        ehsize, phentsize, phnum, shentsize, shnum = header[7:12]
+        self._shoff, self._shentsize = shoff, shentsize
+        self._header_ranges = [
+            (0, ehsize),
+            (phoff, phoff + phentsize * phnum),
+            (shoff, shoff + shentsize * shnum),
+        ]
+
+        # program headers: locate the dynamic section and the loaded segments
+        ph_format = byte_order + PROGRAM_HEADER_FORMAT[elf_class]
+        file.seek(phoff)
+        data = file.read(phentsize * phnum)
+        dynamic_offset = dynamic_size = 0
+        for i in range(phnum):
+            fields = struct.unpack_from(ph_format, data, i * phentsize)
+            if elf_class == 1:
+                p_type, p_offset, p_vaddr, _, p_filesz = fields[:5]
+            else:
+                p_type, _, p_offset, p_vaddr, _, p_filesz = fields[:6]
+            if p_type == PT_LOAD:
+                self._segments.append((p_vaddr, p_offset, p_filesz))
+            elif p_type == PT_DYNAMIC:
+                dynamic_offset, dynamic_size = p_offset, p_filesz
+                self.dynamic_address = p_vaddr
+        self.dynamic_offset = dynamic_offset
+
+        # section headers are only needed to check the symbols names and the
+        # free space when editing the string table
+        if shoff and shnum:
+            sh_format = byte_order + SECTION_HEADER_FORMAT[elf_class]
+            file.seek(shoff)
+            data = file.read(shentsize * shnum)
+            self._section_headers = [
+                struct.unpack_from(sh_format, data, i * shentsize)
+                for i in range(len(data) // shentsize)
+            ]
+
+        if not dynamic_size:
+            return  # statically linked
+
+        dyn_format = byte_order + DYNAMIC_FORMAT[elf_class]
+        dyn_size = struct.calcsize(dyn_format)
+        file.seek(dynamic_offset)
+        data = file.read(dynamic_size)
+        strtab_address = None
+        end = len(data) - dyn_size + 1
+        for offset in range(0, end, dyn_size):
+            tag, value = struct.unpack_from(dyn_format, data, offset)
+            self.dynamic.append((tag, value, dynamic_offset + offset))
+            if tag == DT_NULL:
+                break
+            if tag == DT_STRTAB:
+                strtab_address = value
+            elif tag == DT_STRSZ:
+                self.strtab_size = value
+        # the linker may leave empty entries after the terminator, in which
+        # entries can be added without moving the dynamic section
+        if self.dynamic and self.dynamic[-1][0] == DT_NULL:
+            start = self.dynamic[-1][2] - dynamic_offset + dyn_size
+            for offset in range(start, end, dyn_size):
+                if struct.unpack_from(dyn_format, data, offset) != (0, 0):
+                    break
+                self.spare_dynamic_entries += 1
+        if strtab_address is None:
+            return
+
+        # map the address of the string table to its offset in the file
+        self.strtab_address = strtab_address
+        self.strtab_offset = self._get_offset(strtab_address)
+        if self.strtab_offset is None:
+            self.strtab_offset = strtab_address
+        file.seek(self.strtab_offset)
+        strtab = file.read(self.strtab_size)
+        for tag, value, _ in self.dynamic:
+            if tag not in DT_STRING_TAGS:
+                continue
+            end = strtab.find(b"\0", value)
+            raw_string = strtab[value : end if end >= 0 else None]
+            string = os.fsdecode(raw_string)
+            if tag == DT_NEEDED:
+                self.needed.append(string)
+            elif tag == DT_SONAME:
+                self.soname = string
+            elif tag == DT_RPATH:
+                self.rpath = string
+            else:
+                self.runpath = string
+
+    def _get_offset(self, address: int) -> Optional[int]:
+        """Return the offset in the file of the address, if it is loaded
+        from the file."""
+        for p_vaddr, p_offset, p_filesz in self._segments:
+            if p_vaddr <= address < p_vaddr + p_filesz:
+                return address - p_vaddr + p_offset
+        return None
+
+    def get_string_offset(self, value: int) -> Optional[int]:
+        """Return the offset in the file of the string at the given offset
+        of the string table."""
+        if value < self.strtab_size:
+            return self.strtab_offset + value
+        return None
+
+    def get_strtab_section(self) -> Optional[int]:
+        """Return the index of the section header of the string table of
+        the dynamic section (.dynstr), if it has one."""
+        for index, section in enumerate(self._section_headers):
+            sh_type, sh_offset, sh_size = section[1], section[4], section[5]
+            if (
+                sh_type == SHT_STRTAB
+                and sh_offset == self.strtab_offset
+                and sh_size == self.strtab_size
+            ):
+                return index
+        return None
+
+    def section_header_offset(self, index: int) -> int:
+        """Return the offset in the file of the given section header."""
+        return self._shoff + index * self._shentsize
+
+    def get_free_space_after_strtab(self) -> int:
+        """
+        Return the number of bytes, all zero, that follow the string table
+        in its loaded segment and are not part of any section or table of
+        the file, over which the string table can grow. Files without
+        section headers have none, as the used space cannot be known.
+        """
+        if not self.strtab_size or self.get_strtab_section() is None:
+            return 0
+        start = self.strtab_offset + self.strtab_size
+        end = None
+        for p_vaddr, p_offset, p_filesz in self._segments:
+            if p_offset <= self.strtab_offset < p_offset + p_filesz:
+                end = p_offset + p_filesz
+        if end is None:
+            return 0
+        ranges = list(self._header_ranges)
+        for section in self._section_headers:
+            sh_type, sh_offset, sh_size = section[1], section[4], section[5]
+            if sh_type != SHT_NOBITS and sh_size:
+                ranges.append((sh_offset, sh_offset + sh_size))
+        for range_start, range_end in ranges:
+            if range_start < start < range_end:
+                return 0
+            if start <= range_start < end and range_end > range_start:
+                end = range_start
+        if end <= start:
+            return 0
+        with open(self.file_name, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        return len(data) - len(data.lstrip(b"\0"))
+
+    def symbol_name_offsets(self) -> Optional[List[int]]:
+        """
+        Return the offsets in the string table of the names of the dynamic
+        symbols, read from the section headers, or None if the file has no
+        section headers.
+        """
+        if not self._section_headers:
+            return None
+        offsets = []
+        for section in self._section_headers:
+            sh_type, sh_offset, sh_size, sh_entsize = (
+                section[1],
+                section[4],
+                section[5],
+                section[9],
+            )
+            if sh_type != SHT_DYNSYM or not sh_entsize:
+                continue
+            with open(self.file_name, "rb") as file:
+                file.seek(sh_offset)
+                data = file.read(sh_size)
+            name_format = self.byte_order + "I"
+            for offset in range(0, len(data) - sh_entsize + 1, sh_entsize):
+                offsets.append(
+                    struct.unpack_from(name_format, data, offset)[0]
+                )
+        return offsets
+
+    def version_name_offsets(self) -> Optional[List[int]]:
+        """
+        Return the offsets in the string table of the names of the version
+        requirements (the files and their versions) and of the version
+        definitions, which the linker can merge with the other strings, or
+        None if they cannot be read.
+        """
+        tags = {tag: value for tag, value, _ in self.dynamic}
+        offsets = []
+        with open(self.file_name, "rb") as file:
+
+            def read(offset: Optional[int], struct_format: str) -> tuple:
+                if offset is None:
+                    raise ValueError("version section not loaded")
+                struct_format = self.byte_order + struct_format
+                file.seek(offset)
+                data = file.read(struct.calcsize(struct_format))
+                return struct.unpack(struct_format, data)
+
+            try:
+                # Elf_Verneed entries, each followed by Elf_Vernaux entries
+                offset = self._get_offset(tags.get(DT_VERNEED, 0))
+                for _ in range(tags.get(DT_VERNEEDNUM, 0)):
+                    _, count, vn_file, vn_aux, vn_next = read(offset, "HHIII")
+                    offsets.append(vn_file)
+                    aux_offset = offset + vn_aux
+                    for _ in range(count):
+                        _, _, _, vna_name, vna_next = read(aux_offset, "IHHII")
+                        offsets.append(vna_name)
+                        aux_offset += vna_next
+                    offset += vn_next
+                # Elf_Verdef entries, each followed by Elf_Verdaux entries
+                offset = self._get_offset(tags.get(DT_VERDEF, 0))
+                for _ in range(tags.get(DT_VERDEFNUM, 0)):
+                    fields = read(offset, "HHHHIII")
+                    count, vd_aux, vd_next = fields[3], fields[5], fields[6]
+                    aux_offset = offset + vd_aux
+                    for _ in range(count):
+                        vda_name, vda_next = read(aux_offset, "II")
+                        offsets.append(vda_name)
+                        aux_offset += vda_next
+                    offset += vd_next
+            except (ValueError, struct.error):
+                return None
+        return offsets
 
 
 class Patchelf:
-    """`Patchelf` is based on the logic around invoking `patchelf`."""
+    """
+    `Patchelf` is based on the logic around invoking `patchelf`. The
+    dependencies and the rpath of the ELF files are read in-process, and
+    the rpath is also edited in-process when the new value fits in place of
+    the old one or in the free space after the string table; the `patchelf`
+    utility is only run when the sections must be moved.
+    """
 
     def __init__(self) -> None:
-        _verify_patchelf()
+        self._verified: bool = False
+        self._elf_files: Dict[Tuple[str, int, int], ELFFile] = {}
+        self._dependent_files: Dict[
+            Tuple[str, int, int], Tuple[List[str], List[str]]
+        ] = {}
+        self._ld_so_cache: Optional[Dict[str, List[str]]] = None
+
+    def _run_patchelf(self, args: List[str]) -> None:
+        self.verify()
+        check_call(["patchelf"] + args)
 
     def replace_needed(
         self, file_name: str, so_name: str, new_so_name: str
     ) -> None:
-        check_call(
-            ["patchelf", "--replace-needed", so_name, new_so_name, file_name]
+        self._run_patchelf(
+            ["--replace-needed", so_name, new_so_name, file_name]
         )
 
     def set_soname(self, file_name: str, new_so_name: str) -> None:
-        check_call(["patchelf", "--set-soname", new_so_name, file_name])
+        self._run_patchelf(["--set-soname", new_so_name, file_name])
+
+    def verify(self) -> None:
+        """Verify, once, that the `patchelf` utility can be run."""
+        if not self._verified:
+            _verify_patchelf()
+            self._verified = True
 
     def set_rpath(self, file_name: str, rpath: str) -> None:
-        check_call(["patchelf", "--remove-rpath", file_name])
-        check_call(
-            ["patchelf", "--force-rpath", "--set-rpath", rpath, file_name]
-        )
+        """
+        Set the rpath of the file (as DT_RPATH) unless it is already set to
+        the given value. The string is overwritten in place when it fits in
+        the space of the existing one, otherwise it is appended to the string
+        table if it can grow over free space.
+        """
+        try:
+            elf = ELFFile(file_name)
+        except ValueError:
+            return
+        if elf.rpath == rpath and elf.runpath is None:
+            return
+        if not (
+            _set_rpath_in_place(elf, rpath)
+            or _set_rpath_after_strtab(elf, rpath)
+        ):
+            self._run_patchelf(["--remove-rpath", file_name])
+            self._run_patchelf(
+                ["--force-rpath", "--set-rpath", rpath, file_name]
+            )
 
     def get_rpath(self, file_name: str) -> str:
         try:
-            rpath = (
-                check_output(["patchelf", "--print-rpath", file_name])
-                .decode("utf-8")
-                .strip()
-            )
-        except CalledProcessError:
-            rpath = ""
-        return rpath
+            elf = ELFFile(file_name)
+        except (OSError, ValueError):
+            return ""
+        return elf.runpath or elf.rpath or ""
+
+    def get_dependent_files(
+        self, file_name: str
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Return the paths of the shared libraries that the dynamic linker
+        would load for the given file (its dependencies and theirs, in load
+        order) and the names of the libraries that could not be found, like
+        `ldd` does, but reading the ELF files in-process. The results are
+        memoized by path, inode and modification time.
+        """
+        try:
+            key = self._get_key(file_name)
+        except OSError:
+            return [], []
+        dependent_files = self._dependent_files.get(key)
+        if dependent_files is None:
+            try:
+                elf = self._get_elf_file(file_name)
+            except (OSError, ValueError):
+                dependent_files = [], []
+            else:
+                dependent_files = self._resolve_dependencies(elf)
+            self._dependent_files[key] = dependent_files
+        return dependent_files
+
+    @staticmethod
+    def _get_key(file_name: str) -> Tuple[str, int, int]:
+        file_stat = os.stat(file_name)
+        return (
+            os.path.abspath(file_name),
+            file_stat.st_ino,
+            file_stat.st_mtime_ns,
+        )
+
+    def _get_elf_file(self, file_name: str) -> ELFFile:
+        key = self._get_key(file_name)
+        elf = self._elf_files.get(key)
+        if elf is None:
+            elf = self._elf_files[key] = ELFFile(file_name)
+        return elf
+
+    def _resolve_dependencies(
+        self, elf: ELFFile
+    ) -> Tuple[List[str], List[str]]:
+        """Resolve the dependencies of the file breadth first."""
+        loaded: Dict[str, str] = {os.path.basename(elf.file_name): ""}
+        if elf.soname:
+            loaded[elf.soname] = ""
+        identities = {_get_identity(elf.file_name)}
+        dependent_files: List[str] = []
+        missing: List[str] = []
+        queue = deque([(elf, [])])
+        while queue:
+            obj, loaders = queue.popleft()
+            for name in obj.needed:
+                if name in loaded or name in missing:
+                    continue
+                if DYNAMIC_LINKER_NAME.match(name):
+                    continue
+                path = self._find_library(name, obj, loaders)
+                if path is None:
+                    missing.append(name)
+                    continue
+                dependency = self._get_elf_file(path)
+                loaded[name] = path
+                if dependency.soname:
+                    loaded.setdefault(dependency.soname, path)
+                identity = _get_identity(path)
+                if identity in identities:
+                    continue
+                identities.add(identity)
+                dependent_files.append(path)
+                queue.append((dependency, [obj] + loaders))
+        return dependent_files, missing
+
+    def _find_library(
+        self, name: str, obj: ELFFile, loaders: List[ELFFile]
+    ) -> Optional[str]:
+        """
+        Find the library with the given name needed by obj, in the order used
+        by the dynamic linker: the rpath of the object and of its loaders
+        (when the object has no runpath), LD_LIBRARY_PATH, the runpath of the
+        object, the ld.so.cache and the default directories.
+        """
+        if "/" in name:
+            return name if self._is_compatible(name, obj) else None
+        directories = []
+        if obj.runpath is None:
+            for loader in [obj] + loaders:
+                if loader.rpath and loader.runpath is None:
+                    directories += _expand_path(loader.rpath, loader)
+        ld_library_path = os.environ.get("LD_LIBRARY_PATH")
+        if ld_library_path:
+            directories += [p for p in ld_library_path.split(":") if p]
+        if obj.runpath:
+            directories += _expand_path(obj.runpath, obj)
+        for directory in directories:
+            path = os.path.join(directory, name)
+            if self._is_compatible(path, obj):
+                return path
+        if self._ld_so_cache is None:
+            self._ld_so_cache = _read_ld_so_cache()
+        for path in self._ld_so_cache.get(name, []):
+            if self._is_compatible(path, obj):
+                return path
+        for directory in _get_default_directories(obj.elf_class):
+            path = os.path.join(directory, name)
+            if self._is_compatible(path, obj):
+                return path
+        return None
+
+    def _is_compatible(self, path: str, obj: ELFFile) -> bool:
+        """Return True if path is a library that obj can load."""
+        if not os.path.isfile(path):
+            return False
+        try:
+            elf = self._get_elf_file(path)
+        except (OSError, ValueError):
+            return False
+        return elf.elf_class == obj.elf_class and elf.machine == obj.machine
+
+
+def _expand_path(value: str, obj: ELFFile) -> List[str]:
+    """Split an rpath or runpath, expanding the dynamic string tokens."""
+    origin = os.path.dirname(os.path.abspath(obj.file_name))
+    lib = "lib64" if obj.elf_class == 2 else "lib"
+    platform = os.uname().machine
+    directories = []
+    for directory in value.split(":"):
+        if not directory:
+            continue
+        directory = re.sub(r"\$(ORIGIN\b|\{ORIGIN\})", origin, directory)
+        directory = re.sub(r"\$(LIB\b|\{LIB\})", lib, directory)
+        directory = re.sub(r"\$(PLATFORM\b|\{PLATFORM\})", platform, directory)
+        directories.append(directory)
+    return directories
+
+
+def _get_default_directories(elf_class: int) -> List[str]:
+    """Return the directories searched by default by the dynamic linker."""
+    directories = []
+    multiarch = sysconfig.get_config_var("MULTIARCH")
+    if multiarch:
+        directories += [f"/lib/{multiarch}", f"/usr/lib/{multiarch}"]
+    if elf_class == 2:
+        directories += ["/lib64", "/usr/lib64"]
+    directories += ["/lib", "/usr/lib"]
+    return directories
+
+
+def _get_identity(path: str) -> Tuple[int, int]:
+    file_stat = os.stat(path)
+    return file_stat.st_dev, file_stat.st_ino
+
+
+def _read_ld_so_cache(path: str = LD_SO_CACHE) -> Dict[str, List[str]]:
+    """
+    Read the cache of the dynamic linker, returning a mapping of the names of
+    the libraries to their paths, in order of preference. Only the format
+    used since glibc 2.2 is supported (alone or after the old format).
+    """
+    libraries: Dict[str, List[str]] = {}
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return libraries
+    start = 0
+    if data.startswith(LD_SO_CACHE_OLD_MAGIC):
+        (nlibs,) = struct.unpack_from("=I", data, 12)
+        start = data.find(LD_SO_CACHE_NEW_MAGIC, 16 + nlibs * 12)
+    if start < 0 or not data.startswith(LD_SO_CACHE_NEW_MAGIC, start):
+        return libraries
+    byte_order = "=" if sys.byteorder == "little" else ">"
+    nlibs, _ = struct.unpack_from(byte_order + "II", data, start + 20)
+    entry_format = byte_order + "iIIIQ"
+    entry_size = struct.calcsize(entry_format)
+    offset = start + 48
+    for _ in range(nlibs):
+        if offset + entry_size > len(data):
+            break
+        _, key, value, _, _ = struct.unpack_from(entry_format, data, offset)
+        offset += entry_size
+        name = _read_string(data, start + key)
+        libraries.setdefault(name, []).append(
+            _read_string(data, start + value)
+        )
+    return libraries
+
+
+def _read_string(data: bytes, offset: int) -> str:
+    end = data.find(b"\0", offset)
+    return os.fsdecode(data[offset : end if end >= 0 else None])
+
+
+def _set_rpath_in_place(elf: ELFFile, rpath: str) -> bool:
+    """
+    Overwrite the rpath (or runpath) string of the file with the new value,
+    changing the entry to DT_RPATH. Returns False, without changing the file,
+    if there is not a single rpath or runpath entry or if the new value does
+    not fit in the space of the existing string or this space is shared with
+    other strings (or the names of the symbols and versions, which can share
+    it, cannot be read).
+    """
+    entries = [e for e in elf.dynamic if e[0] in (DT_RPATH, DT_RUNPATH)]
+    if len(entries) != 1 or not elf.strtab_offset:
+        return False
+    tag, value, entry_offset = entries[0]
+    string_offset = elf.get_string_offset(value)
+    if string_offset is None:
+        return False
+    old_value = elf.runpath if tag == DT_RUNPATH else elf.rpath
+    old_size = len(os.fsencode(old_value))
+    new_value = os.fsencode(rpath)
+    if len(new_value) > old_size:
+        return False
+
+    # the string must not be the tail of another string nor can it contain
+    # strings referenced by other entries, symbols or versions
+    other_offsets = [
+        e[1]
+        for e in elf.dynamic
+        if e[0] in DT_STRING_TAGS and e is not entries[0]
+    ]
+    symbol_offsets = elf.symbol_name_offsets()
+    version_offsets = elf.version_name_offsets()
+    if symbol_offsets is None or version_offsets is None:
+        return False
+    other_offsets += symbol_offsets + version_offsets
+    if any(value <= offset < value + old_size for offset in other_offsets):
+        return False
+    with open(elf.file_name, "rb") as file:
+        if value:
+            file.seek(string_offset - 1)
+            if file.read(1) != b"\0":
+                return False
+
+    with _open_for_update(elf.file_name) as file:
+        file.seek(string_offset)
+        file.write(new_value.ljust(old_size, b"\0"))
+        if tag != DT_RPATH:
+            dyn_format = elf.byte_order + DYNAMIC_FORMAT[elf.elf_class]
+            file.seek(entry_offset)
+            file.write(struct.pack(dyn_format, DT_RPATH, value))
+    return True
+
+
+def _set_rpath_after_strtab(elf: ELFFile, rpath: str) -> bool:
+    """
+    Append the new rpath to the string table, growing it (DT_STRSZ and the
+    size of its section) over the free space that follows it. The rpath (or
+    runpath) entry is changed to DT_RPATH and points to the new string; a
+    file without one gets it in place of the terminator of the dynamic
+    section, and the next empty entry becomes the terminator. Returns False,
+    without changing the file, if there is not enough free space or no
+    empty entry.
+    """
+    entries = [e for e in elf.dynamic if e[0] in (DT_RPATH, DT_RUNPATH)]
+    strsz_entries = [e for e in elf.dynamic if e[0] == DT_STRSZ]
+    if len(entries) > 1 or len(strsz_entries) != 1:
+        return False
+    if not elf.dynamic or elf.dynamic[-1][0] != DT_NULL:
+        return False
+    if entries:
+        entry_offset = entries[0][2]
+    elif elf.spare_dynamic_entries:
+        entry_offset = elf.dynamic[-1][2]
+    else:
+        return False
+    new_value = os.fsencode(rpath) + b"\0"
+    if elf.get_free_space_after_strtab() < len(new_value):
+        return False
+    value = elf.strtab_size
+    new_size = value + len(new_value)
+
+    dyn_format = elf.byte_order + DYNAMIC_FORMAT[elf.elf_class]
+    sh_format = elf.byte_order + SECTION_HEADER_FORMAT[elf.elf_class]
+    section_index = elf.get_strtab_section()
+    section = list(elf._section_headers[section_index])
+    section[5] = new_size
+    with _open_for_update(elf.file_name) as file:
+        file.seek(elf.strtab_offset + value)
+        file.write(new_value)
+        file.seek(entry_offset)
+        file.write(struct.pack(dyn_format, DT_RPATH, value))
+        file.seek(strsz_entries[0][2])
+        file.write(struct.pack(dyn_format, DT_STRSZ, new_size))
+        file.seek(elf.section_header_offset(section_index))
+        file.write(struct.pack(sh_format, *section))
+    return True
+
+
+@contextmanager
+def _open_for_update(file_name: str):
+    """Open the file for update, making a read-only file writable until it
+    is closed."""
+    mode = os.stat(file_name).st_mode
+    if not mode & stat.S_IWUSR:
+        os.chmod(file_name, mode | stat.S_IWUSR)
+    try:
+        with open(file_name, "r+b") as file:
+            yield file
+    finally:
+        if not mode & stat.S_IWUSR:
+            os.chmod(file_name, mode)
 
 
 def _verify_patchelf() -> None:
@@ -0,0 +1,175 @@
+"""
+Implements the profiler of the build, enabled with the profile option, which
+records the wall and CPU time spent in each phase of the freezing (finding
+the modules, running the hooks, reading the dependencies of the shared
+libraries, writing the modules, copying the files...) and counters, like the
+number of files copied. The profile is printed as a summary of the phases
+sorted by time and can be written as a trace of the events of each thread
+in the trace event format of Chrome, which chrome://tracing and Perfetto
+can display.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+__all__ = ["Profiler"]
+
+# Python 3.6 does not have a CPU clock for each thread
+thread_time = getattr(time, "thread_time", time.process_time)
+
+
+class PhaseEvent(NamedTuple):
+    """A phase of the build, with its times relative to the profiler."""
+
+    name: str
+    category: str
+    start: float
+    wall: float
+    own: float
+    cpu: float
+    thread_id: int
+    args: Dict[str, str]
+
+
+class Profiler:
+    """
+    The Profiler class records the phases of the build, which may be nested
+    and may run in several threads, and counters. The wall and CPU times of
+    a phase include the phases nested in it; its own time does not, so a
+    hook which includes other modules is not blamed for their hooks. A
+    disabled profiler records nothing, so the phases cost next to nothing
+    when the profile is not requested.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events: List[PhaseEvent] = []
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add the value to the counter of the given name."""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def phase(self, name: str, category: str = "build", **args) -> Iterator:
+        """Record the time spent in the body of the with statement."""
+        if not self.enabled:
+            yield
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        start_cpu = thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += wall
+            event = PhaseEvent(
+                name,
+                category,
+                start - self._start,
+                wall,
+                wall - nested,
+                thread_time() - start_cpu,
+                threading.get_ident(),
+                {key: str(value) for key, value in args.items()},
+            )
+            with self._lock:
+                self.events.append(event)
+
+    def summary(self) -> List[Tuple[str, int, float, float, float]]:
+        """Return the name, the number of calls, the own time, the wall time
+        and the CPU time of each phase, summed over its calls, the phases
+        with the longest own time first."""
+        totals: Dict[str, List] = {}
+        for event in self.events:
+            total = totals.setdefault(event.name, [0, 0.0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += event.own
+            total[2] += event.wall
+            total[3] += event.cpu
+        phases = [(name, *total) for name, total in totals.items()]
+        phases.sort(key=lambda phase: (-phase[2], phase[0]))
+        return phases
+
+    def print_summary(self, limit: Optional[int] = 30) -> None:
+        """Print the summary of the phases and the counters."""
+        wall = time.perf_counter() - self._start
+        cpu = time.process_time() - self._start_cpu
+        print(f"\nprofile: {wall:.3f}s wall, {cpu:.3f}s CPU (all threads)\n")
+        line = "  {:>9} {:>9} {:>9} {:>7}  {}"
+        print(line.format("Own", "Wall", "CPU", "Calls", "Phase"))
+        print(line.format("---", "----", "---", "-----", "-----"))
+        phases = self.summary()
+        for name, calls, own, phase_wall, phase_cpu in phases[:limit]:
+            times = [f"{value:.3f}s" for value in (own, phase_wall, phase_cpu)]
+            print(line.format(*times, calls, name))
+        if limit is not None and len(phases) > limit:
+            print(f"  ... {len(phases) - limit} more phases")
+        if self.counters:
+            print()
+            for name, value in sorted(self.counters.items()):
+                print(f"  {value:>37}  {name}")
+        print()
+
+    def write_trace(self, filename: str) -> None:
+        """Write the phases and the counters as trace events of Chrome."""
+        pid = os.getpid()
+        thread_ids: Dict[int, int] = {threading.main_thread().ident: 0}
+        events = []
+        for event in sorted(self.events, key=lambda event: event.start):
+            tid = thread_ids.setdefault(event.thread_id, len(thread_ids))
+            args = dict(
+                event.args,
+                own_ms=round(event.own * 1e3, 3),
+                cpu_ms=round(event.cpu * 1e3, 3),
+            )
+            events.append(
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": round(event.start * 1e6, 1),
+                    "dur": round(event.wall * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        for tid in thread_ids.values():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": "main" if tid == 0 else f"worker {tid}"},
+                }
+            )
+        end = time.perf_counter() - self._start
+        events.append(
+            {
+                "name": "counters",
+                "ph": "C",
+                "ts": round(end * 1e6, 1),
+                "pid": pid,
+                "tid": 0,
+                "args": self.counters,
+            }
+        )
+        data = {"traceEvents": events, "displayTimeUnit": "ms"}
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
@@ -0,0 +1,231 @@
+"""
+Implements the size report of the build, enabled with the size_report
+option, which attributes the bytes of the build directory to the modules and
+tells which single exclusion saves the most. The bytes of a module are its
+compiled code, in the zip file, the archive or the file system, the data
+files of its package and the extension module file. The shared libraries
+copied as dependencies and the included files are nodes of their own.
+
+The nodes are linked by the imports found by the finder, by the dependencies
+of the shared libraries and by the packages to their submodules. An import
+of a submodule from outside of its package is an import of the package, as
+Python imports the package first. The dominator tree of this graph, rooted
+at the executables, gives for each module the total size that disappears if
+it is excluded: its own bytes and the bytes of the nodes which are only
+reachable through it.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+__all__ = ["SizeReport"]
+
+# the root of the graph, which cannot be the name of a module or a file
+ROOT = ""
+
+
+def format_size(size: int) -> str:
+    """Return the size in bytes as a short human readable string."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "GB"
+    if unit == "B":
+        return f"{size} {unit}"
+    return f"{size:.1f} {unit}"
+
+
+class SizeReport:
+    """
+    The SizeReport class collects the sizes of the modules and of the files
+    and the edges of the graph, then computes the dominator tree.
+    """
+
+    def __init__(self):
+        self.sizes: Dict[str, int] = {}
+        self.modules: Dict[str, None] = {}
+        self.files: Dict[str, None] = {}
+        self._edges: Dict[str, Dict[str, None]] = {ROOT: {}}
+        self._data: Dict[str, int] = {}
+
+    def _add_edge(self, node: str, target: str) -> None:
+        self._edges.setdefault(node, {})[target] = None
+
+    def add_data(self, name: str, size: int) -> None:
+        """Add the size of data files found in the directory of the package
+        of the given name, or of a directory below it, which is attributed
+        to the nearest package when the report is computed."""
+        self._data[name] = self._data.get(name, 0) + size
+
+    def add_dependency(self, node: str, path: str) -> None:
+        """Record that the module or the file needs the file."""
+        self._add_edge(node, os.path.normcase(os.path.normpath(path)))
+
+    def add_file(self, path: str, size: int = 0) -> str:
+        """Add the size of the file and return its node."""
+        node = os.path.normcase(os.path.normpath(path))
+        self.files[node] = None
+        self.sizes[node] = self.sizes.get(node, 0) + size
+        return node
+
+    def add_import(self, name: str, imported_name: str) -> None:
+        """Record that the module imports the other module; an import of a
+        submodule from outside of its package imports the package."""
+        parts = imported_name.split(".")
+        caller_parts = name.split(".")
+        for index in range(len(parts)):
+            if parts[: index + 1] != caller_parts[: index + 1]:
+                self._add_edge(name, ".".join(parts[: index + 1]))
+                break
+
+    def add_module(self, name: str, size: int = 0) -> None:
+        """Add the size of the module."""
+        self.modules[name] = None
+        self.sizes[name] = self.sizes.get(name, 0) + size
+
+    def add_root(self, node: str) -> None:
+        """Record that the executables need the module or the file."""
+        self._edges[ROOT][node] = None
+
+    def _successors(self) -> Dict[str, List[str]]:
+        """Return the edges between the known nodes, with the edges of the
+        packages to their submodules."""
+        successors: Dict[str, List[str]] = {ROOT: []}
+        for node in list(self.modules) + list(self.files):
+            successors[node] = []
+        for name in self.modules:
+            parent_name = name.rpartition(".")[0]
+            if parent_name in self.modules:
+                successors[parent_name].append(name)
+        for node, targets in self._edges.items():
+            if node not in successors:
+                continue
+            for target in targets:
+                if target in successors and target != node:
+                    successors[node].append(target)
+        return successors
+
+    @staticmethod
+    def _postorder(
+        successors: Dict[str, List[str]],
+        starts: Iterable[str],
+        visited: Dict[str, None],
+        order: List[str],
+    ) -> None:
+        """Add the nodes reachable from the starts, not visited yet, to the
+        order, in postorder (depth first search without recursion)."""
+        for start in starts:
+            if start in visited:
+                continue
+            visited[start] = None
+            stack = [(start, iter(successors[start]))]
+            while stack:
+                node, targets = stack[-1]
+                for target in targets:
+                    if target not in visited:
+                        visited[target] = None
+                        stack.append((target, iter(successors[target])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+
+    def dominators(self) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Return the nodes in reverse postorder and the immediate dominator of
+        each node, computed with the iterative algorithm of Cooper, Harvey
+        and Kennedy. The nodes that the executables do not reach are
+        attached to the root, the packages first.
+        """
+        successors = self._successors()
+        visited: Dict[str, None] = {}
+        order: List[str] = []
+        self._postorder(successors, [ROOT], visited, order)
+        unreached = sorted(
+            (node for node in successors if node not in visited),
+            key=lambda node: (node in self.files, node.count("."), node),
+        )
+        for node in unreached:
+            if node not in visited:
+                successors[ROOT].append(node)
+                # the nodes found later must come first in reverse postorder
+                order.pop()
+                self._postorder(successors, [node], visited, order)
+                order.append(ROOT)
+        order.reverse()
+        index = {node: position for position, node in enumerate(order)}
+        predecessors: Dict[str, List[str]] = {node: [] for node in order}
+        for node in order:
+            for target in successors[node]:
+                predecessors[target].append(node)
+
+        idom: Dict[str, str] = {ROOT: ROOT}
+
+        def intersect(node: str, other: str) -> str:
+            while node != other:
+                while index[node] > index[other]:
+                    node = idom[node]
+                while index[other] > index[node]:
+                    other = idom[other]
+            return node
+
+        changed = True
+        while changed:
+            changed = False
+            for node in order[1:]:
+                new_idom: Optional[str] = None
+                for predecessor in predecessors[node]:
+                    if predecessor not in idom:
+                        continue
+                    if new_idom is None:
+                        new_idom = predecessor
+                    else:
+                        new_idom = intersect(predecessor, new_idom)
+                if idom.get(node) != new_idom:
+                    idom[node] = new_idom
+                    changed = True
+        return order, idom
+
+    def retained_sizes(self) -> Dict[str, Tuple[int, int]]:
+        """Return, for each node, the size that disappears if it is
+        excluded and the number of modules it takes with it."""
+        sizes = dict(self.sizes)
+        for name, size in self._data.items():
+            while name and name not in self.modules:
+                name = name.rpartition(".")[0]
+            sizes[name] = sizes.get(name, 0) + size
+        order, idom = self.dominators()
+        retained = {
+            node: [sizes.get(node, 0), int(node in self.modules)]
+            for node in order
+        }
+        for node in reversed(order[1:]):
+            parent = retained[idom[node]]
+            parent[0] += retained[node][0]
+            parent[1] += retained[node][1]
+        return {node: tuple(value) for node, value in retained.items()}
+
+    def print_report(self, limit: int = 30) -> None:
+        """Print the modules which save the most if they are excluded."""
+        retained = self.retained_sizes()
+        total_size, _ = retained.pop(ROOT)
+        print(
+            f"\nsize report: {format_size(total_size)} in "
+            f"{len(self.modules)} modules and {len(self.files)} files\n"
+        )
+        line = "  {:>10} {:>10} {:>7}  {}"
+        print(line.format("Excluded", "Own", "Modules", "Name"))
+        print(line.format("--------", "---", "-------", "----"))
+        ranked = sorted(
+            (node for node in retained if node in self.modules),
+            key=lambda node: (-retained[node][0], node),
+        )
+        for name in ranked[:limit]:
+            size, count = retained[name]
+            own = format_size(self.sizes.get(name, 0))
+            print(line.format(format_size(size), own, count, name))
+        if len(ranked) > limit:
+            print(f"  ... {len(ranked) - limit} more modules")
+        print()
@@ -0,0 +1,363 @@
+"""
+Implements a writer of zip files that compresses the entries in parallel,
+and the policy that chooses the compression of each entry, used by the
+Freezer to write library.zip.
+"""
+
+import bz2
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from fnmatch import fnmatchcase
+import os
+import struct
+from typing import Deque, List, Optional, Sequence, Tuple, Union
+import zipfile
+import zlib
+
+from .exception import ConfigError
+
+__all__ = ["CompressionPolicy", "ZipWriter"]
+
+COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# zipimport can only read modules that are stored or deflated
+ZIPIMPORT_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+ZIPIMPORT_SUFFIXES = (".pyc", ".py")
+
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP64_VERSION = 45
+
+# the layout of the records of the central directory, as in zipfile
+CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+END_ARCHIVE = struct.Struct("<4s4H2LH")
+END_ARCHIVE64 = struct.Struct("<4sQ2H2L4Q")
+END_ARCHIVE64_LOCATOR = struct.Struct("<4sLQL")
+
+
+def _compress(
+    data: bytes, compress_type: int, compress_level: Optional[int]
+) -> Tuple[bytes, int]:
+    """Return the compressed data and the CRC of the data."""
+    crc = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_DEFLATED:
+        if compress_level is None:
+            compress_level = zlib.Z_DEFAULT_COMPRESSION
+        compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    elif compress_type == zipfile.ZIP_BZIP2:
+        data = bz2.compress(data, compress_level or 9)
+    elif compress_type == zipfile.ZIP_LZMA:
+        # zipfile stores the lzma properties in a header of its own
+        compressor = zipfile.LZMACompressor()
+        data = compressor.compress(data) + compressor.flush()
+    elif compress_type != zipfile.ZIP_STORED:
+        raise NotImplementedError("compression method not supported")
+    return data, crc
+
+
+class CompressionPolicy:
+    """
+    The CompressionPolicy class chooses the compression method and level of
+    each entry of a zip file. The rules, of the form pattern=method[:level],
+    are matched against the names of the entries in the archive (like
+    "pkg/*" or "*.json") and the first rule that matches wins; the other
+    entries are deflated, if compress is True, or stored. The level, if not
+    given in the rule, defaults to the level of the policy. Entries smaller
+    than min_size are always stored, as compressing them does not pay off.
+    Modules are never compressed with bzip2 or lzma, as zipimport cannot
+    read them; they are deflated instead.
+    """
+
+    def __init__(
+        self,
+        compress: bool = True,
+        level: Optional[int] = None,
+        min_size: int = 0,
+        rules: Optional[Sequence[Union[str, Tuple[str, str]]]] = None,
+    ):
+        self.compress: bool = compress
+        self.level: Optional[int] = level
+        self.min_size: int = min_size
+        self.rules: List[Tuple[str, int, Optional[int]]] = [
+            self._parse_rule(rule) for rule in rules or []
+        ]
+        levels = [level for _, _, level in self.rules] + [level]
+        for value in levels:
+            if value is not None and not 0 <= value <= 9:
+                raise ConfigError(
+                    f"compression level must be between 0 and 9: {value}"
+                )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(compress={self.compress!r}, "
+            f"level={self.level!r}, min_size={self.min_size!r}, "
+            f"rules={self.rules!r})"
+        )
+
+    @staticmethod
+    def _parse_rule(
+        rule: Union[str, Tuple[str, str]]
+    ) -> Tuple[str, int, Optional[int]]:
+        """Parse a rule given as pattern=method[:level] or as a tuple
+        (pattern, method[:level])."""
+        if isinstance(rule, str):
+            pattern, sep, spec = rule.rpartition("=")
+            if not sep:
+                raise ConfigError(
+                    f"compression rule {rule!r} must be pattern=method"
+                )
+        else:
+            pattern, spec = rule
+        name, _, level = spec.partition(":")
+        method = COMPRESSION_METHODS.get(name.lower())
+        if method is None:
+            raise ConfigError(
+                f"unknown compression method {name!r} (use one of "
+                f"{', '.join(COMPRESSION_METHODS)})"
+            )
+        try:
+            return pattern, method, int(level) if level else None
+        except ValueError:
+            raise ConfigError(
+                f"invalid compression level {level!r} in rule {rule!r}"
+            ) from None
+
+    def get(self, arc_name: str, size: int) -> Tuple[int, Optional[int]]:
+        """Return the compression method and level of the entry."""
+        for pattern, method, level in self.rules:
+            if fnmatchcase(arc_name, pattern):
+                break
+        else:
+            method = (
+                zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            )
+            level = None
+        if level is None:
+            level = self.level
+        if size < self.min_size:
+            return zipfile.ZIP_STORED, None
+        if method not in ZIPIMPORT_METHODS and arc_name.endswith(
+            ZIPIMPORT_SUFFIXES
+        ):
+            return zipfile.ZIP_DEFLATED, self.level
+        return method, level
+
+
+class ZipWriter:
+    """
+    The ZipWriter class writes a zip file like zipfile.ZipFile in mode "w",
+    but the entries are compressed by a pool of threads (zlib, bz2 and lzma
+    release the GIL while compressing). The compressed entries are written
+    in the order they were added, as soon as they are ready, so the
+    resulting file does not depend on the number of threads. At most twice
+    as many entries as threads are in flight, so the data of the whole
+    archive is never held in memory at once. If a policy is given, it
+    chooses the compression of each entry.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        compression: int = zipfile.ZIP_DEFLATED,
+        jobs: int = 1,
+        policy: Optional[CompressionPolicy] = None,
+    ):
+        self.filename: str = filename
+        self.compression: int = compression
+        self.jobs: int = jobs
+        self.policy: Optional[CompressionPolicy] = policy
+        self.filelist: List[zipfile.ZipInfo] = []
+        self._file = open(filename, "wb")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if jobs > 1:
+            self._executor = ThreadPoolExecutor(jobs)
+        self._pending: Deque[Tuple[zipfile.ZipInfo, Future]] = deque()
+        self.max_pending: int = 2 * jobs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _write_entry(self, zinfo: zipfile.ZipInfo, result) -> None:
+        """Write the local header and the compressed data of an entry."""
+        data, crc = result
+        zinfo.CRC = crc
+        zinfo.compress_size = len(data)
+        zinfo.header_offset = self._file.tell()
+        zip64 = zinfo.file_size > ZIP64_LIMIT
+        self._file.write(zinfo.FileHeader(zip64))
+        self._file.write(data)
+        self.filelist.append(zinfo)
+
+    def _write_ready(self, wait: bool = False) -> None:
+        """Write the entries, in order, that are already compressed, waiting
+        for the first ones while too many entries are in flight."""
+        while self._pending:
+            zinfo, future = self._pending[0]
+            if (
+                not wait
+                and not future.done()
+                and len(self._pending) <= self.max_pending
+            ):
+                break
+            self._pending.popleft()
+            self._write_entry(zinfo, future.result())
+
+    def write(self, filename: str, arcname: Optional[str] = None) -> None:
+        """Put the file into the archive under the name arcname."""
+        zinfo = zipfile.ZipInfo.from_file(filename, arcname)
+        zinfo.compress_type = self.compression
+        with open(filename, "rb") as file:
+            data = file.read()
+        self.writestr(zinfo, data)
+
+    def writestr(
+        self,
+        zinfo: zipfile.ZipInfo,
+        data: bytes,
+        compress_level: Optional[int] = None,
+    ) -> None:
+        """Put the data into the archive with the name and the compression
+        method of zinfo."""
+        zinfo.file_size = len(data)
+        if self.policy is not None:
+            zinfo.compress_type, compress_level = self.policy.get(
+                zinfo.filename, len(data)
+            )
+        args = (data, zinfo.compress_type, compress_level)
+        if self._executor is None or zinfo.compress_type == zipfile.ZIP_STORED:
+            future = Future()
+            future.set_result(_compress(*args))
+        else:
+            future = self._executor.submit(_compress, *args)
+        self._pending.append((zinfo, future))
+        self._write_ready()
+
+    def _write_central_directory(self) -> None:
+        """Write the central directory and the end of archive records."""
+        start_dir = self._file.tell()
+        for zinfo in self.filelist:
+            dt = zinfo.date_time
+            dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+            dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+            extra = []
+            file_size = zinfo.file_size
+            compress_size = zinfo.compress_size
+            if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+                extra += [file_size, compress_size]
+                file_size = compress_size = 0xFFFFFFFF
+            header_offset = zinfo.header_offset
+            if header_offset > ZIP64_LIMIT:
+                extra.append(header_offset)
+                header_offset = 0xFFFFFFFF
+            extra_data = zinfo.extra
+            extract_version = zinfo.extract_version
+            create_version = zinfo.create_version
+            if extra:
+                extra_data = (
+                    struct.pack(f"<HH{len(extra)}Q", 1, 8 * len(extra), *extra)
+                    + extra_data
+                )
+                extract_version = max(ZIP64_VERSION, extract_version)
+                create_version = max(ZIP64_VERSION, create_version)
+            try:
+                filename = zinfo.filename.encode("ascii")
+                flag_bits = zinfo.flag_bits
+            except UnicodeEncodeError:
+                filename = zinfo.filename.encode("utf-8")
+                flag_bits = zinfo.flag_bits | 0x800
+            self._file.write(
+                CENTRAL_DIR.pack(
+                    b"PK\001\002",
+                    create_version,
+                    zinfo.create_system,
+                    extract_version,
+                    zinfo.reserved,
+                    flag_bits,
+                    zinfo.compress_type,
+                    dostime,
+                    dosdate,
+                    zinfo.CRC,
+                    compress_size,
+                    file_size,
+                    len(filename),
+                    len(extra_data),
+                    len(zinfo.comment),
+                    0,
+                    zinfo.internal_attr,
+                    zinfo.external_attr,
+                    header_offset,
+                )
+            )
+            self._file.write(filename)
+            self._file.write(extra_data)
+            self._file.write(zinfo.comment)
+
+        end_dir = self._file.tell()
+        count = len(self.filelist)
+        size = end_dir - start_dir
+        offset = start_dir
+        if (
+            count > ZIP_FILECOUNT_LIMIT
+            or offset > ZIP64_LIMIT
+            or size > ZIP64_LIMIT
+        ):
+            self._file.write(
+                END_ARCHIVE64.pack(
+                    b"PK\006\006", 44, 45, 45, 0, 0, count, count, size, offset
+                )
+            )
+            self._file.write(
+                END_ARCHIVE64_LOCATOR.pack(b"PK\006\007", 0, end_dir, 1)
+            )
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            offset = min(offset, 0xFFFFFFFF)
+        self._file.write(
+            END_ARCHIVE.pack(
+                b"PK\005\006", 0, 0, count, count, size, offset, 0
+            )
+        )
+
+    def _release(self) -> None:
+        """Stop the pool of threads and close the file."""
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._file.close()
+        self._file = None
+
+    def _discard(self) -> None:
+        """Drop the remaining entries and remove the partial file, which
+        must not pass for a complete archive."""
+        if self._file is None:
+            return
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._release()
+        os.remove(self.filename)
+
+    def close(self) -> None:
+        """Write the remaining entries and the central directory and close
+        the file."""
+        if self._file is None:
+            return
+        try:
+            self._write_ready(wait=True)
+            self._write_central_directory()
+        except BaseException:
+            self._discard()
+            raise
+        self._release()
@@ -206,6 +206,6 @@ if __name__ == "__main__":
         cmdclass={"build_ext": build_ext},
         options={"install": {"optimize": 1}},
         ext_modules=extensions,
-        packages=["cx_Freeze"],
+        packages=["cx_Freeze", "cx_Freeze.hooks"],
         package_data={"cx_Freeze": package_data},
     )
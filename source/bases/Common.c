@@ -24,6 +24,14 @@ static wchar_t g_ExecutableDirName[MAXPATHLEN + 1];
 static wchar_t g_LibDirName[MAXPATHLEN + 1];
 #endif
 
+// define the table of frozen modules which can be appended to the executable
+// by the freezer; these values must match the ones in cx_Freeze/frozentable.py
+#define CX_FROZEN_MAGIC                 "CXFZ"
+#define CX_FROZEN_VERSION               1
+#define CX_FROZEN_RECORD_SIZE           12
+#define CX_FROZEN_TRAILER_SIZE          16
+static struct _frozen *g_FrozenModules = NULL;
+
 
 //-----------------------------------------------------------------------------
 // SetExecutableName()
@@ -121,6 +129,116 @@ static int SetExecutableName(const wchar_t *wargv0)
 }
 
 
+//-----------------------------------------------------------------------------
+// ReadUInt32()
+//   Return the unsigned 32 bit integer stored in little endian order.
+//-----------------------------------------------------------------------------
+static uint32_t ReadUInt32(const unsigned char *ptr)
+{
+    return (uint32_t) ptr[0] | ((uint32_t) ptr[1] << 8) |
+            ((uint32_t) ptr[2] << 16) | ((uint32_t) ptr[3] << 24);
+}
+
+
+//-----------------------------------------------------------------------------
+// LoadFrozenModules()
+//   Load the table of frozen modules appended to the executable, if there is
+// one, and install it, after the modules frozen in Python itself, as the
+// table used by the frozen importer. The table is kept in memory for the
+// lifetime of the process, as the frozen importer refers to it.
+//-----------------------------------------------------------------------------
+static int LoadFrozenModules(void)
+{
+    unsigned char trailer[CX_FROZEN_TRAILER_SIZE], *table, *record;
+    uint32_t numModules, size, i, nameOffset, codeOffset, codeSize;
+    const struct _frozen *entry;
+    struct _frozen *module;
+    size_t numDefault;
+    FILE *fp;
+#ifndef MS_WINDOWS
+    char *fileName;
+#endif
+
+    // open the executable and check if the trailer is present
+#ifdef MS_WINDOWS
+    fp = _wfopen(g_ExecutableName, L"rb");
+#else
+    fileName = Py_EncodeLocale(g_ExecutableName, NULL);
+    if (!fileName)
+        return FatalError("Unable to convert path to bytes!");
+    fp = fopen(fileName, "rb");
+    PyMem_Free(fileName);
+#endif
+    if (!fp)
+        return FatalError("Unable to open executable!");
+    if (fseek(fp, -CX_FROZEN_TRAILER_SIZE, SEEK_END) != 0 ||
+            fread(trailer, 1, CX_FROZEN_TRAILER_SIZE, fp) !=
+                    CX_FROZEN_TRAILER_SIZE ||
+            memcmp(trailer, CX_FROZEN_MAGIC, 4) != 0) {
+        fclose(fp);
+        return 0;
+    }
+    if (ReadUInt32(trailer + 4) != CX_FROZEN_VERSION) {
+        fclose(fp);
+        return FatalError("Unsupported version of the frozen modules!");
+    }
+    numModules = ReadUInt32(trailer + 8);
+    size = ReadUInt32(trailer + 12);
+
+    // read the table
+    table = PyMem_RawMalloc(size);
+    if (!table) {
+        fclose(fp);
+        return FatalError("Out of memory loading frozen modules!");
+    }
+    if (fseek(fp, -(long) (CX_FROZEN_TRAILER_SIZE + size), SEEK_END) != 0 ||
+            fread(table, 1, size, fp) != size) {
+        fclose(fp);
+        PyMem_RawFree(table);
+        return FatalError("Unable to read the frozen modules!");
+    }
+    fclose(fp);
+    if ((uint64_t) numModules * CX_FROZEN_RECORD_SIZE > size) {
+        PyMem_RawFree(table);
+        return FatalError("The table of frozen modules is corrupted!");
+    }
+
+    // create the new table with the modules frozen in Python first
+    numDefault = 0;
+    for (entry = PyImport_FrozenModules; entry->name; entry++)
+        numDefault++;
+    g_FrozenModules = PyMem_RawCalloc(numDefault + numModules + 1,
+            sizeof(struct _frozen));
+    if (!g_FrozenModules) {
+        PyMem_RawFree(table);
+        return FatalError("Out of memory loading frozen modules!");
+    }
+    memcpy(g_FrozenModules, PyImport_FrozenModules,
+            numDefault * sizeof(struct _frozen));
+    for (i = 0; i < numModules; i++) {
+        record = table + i * CX_FROZEN_RECORD_SIZE;
+        nameOffset = ReadUInt32(record);
+        codeOffset = ReadUInt32(record + 4);
+        codeSize = ReadUInt32(record + 8);
+        module = &g_FrozenModules[numDefault + i];
+        module->size = (int32_t) codeSize;
+        if (module->size < 0)
+            codeSize = (uint32_t) -module->size;
+        if (nameOffset >= size || codeOffset > size ||
+                codeSize > size - codeOffset) {
+            PyMem_RawFree(g_FrozenModules);
+            PyMem_RawFree(table);
+            return FatalError("The table of frozen modules is corrupted!");
+        }
+        module->name = (const char *) table + nameOffset;
+        module->code = table + codeOffset;
+    }
+    PyImport_FrozenModules = g_FrozenModules;
+
+    return 0;
+}
+
+
 //-----------------------------------------------------------------------------
 // InitializePython()
 //   Initialize Python on all platforms.
@@ -135,6 +253,10 @@ static int InitializePython(int argc, wchar_t **argv)
     if (SetExecutableName(argv[0]) < 0)
         return -1;
 
+    // install the modules embedded in the executable, if any
+    if (LoadFrozenModules() < 0)
+        return -1;
+
     // create sys.path
     size = sizeof(g_ExecutableDirName) * 2 + strlen(CX_PATH_FORMAT) + 1;
     path = PyMem_RawMalloc(sizeof(char) * size);
@@ -0,0 +1,109 @@
+"""
+Benchmark of the memory used by the finder: a synthetic tree of packages,
+whose modules define many names and import the names of a base module with
+"from ... import *", is written to a temporary directory and searched by
+the finder in a child process, once with the Module class, once with a
+Module as it was before the compact representation (with a __dict__, the
+sets of names allocated for each module and the names imported with * copied
+into each module) and once with the code of the modules written to a spool
+(the stream_modules option), reporting the peak RSS of each process.
+
+Usage: python test/bench_memory.py [packages] [modules]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD = """
+import json, sys, time
+import cx_Freeze.finder
+from cx_Freeze.module import Module
+
+class EagerModule(Module):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exclude_names, self.global_names, self.ignore_names
+
+    def add_star_import(self, module):
+        self.global_names.update(module.global_names)
+
+tree_dir, packages, variant = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+if variant == "before":
+    cx_Freeze.finder.Module = EagerModule
+start = time.perf_counter()
+finder = cx_Freeze.finder.ModuleFinder(
+    path=[tree_dir] + sys.path, stream_modules=variant == "stream"
+)
+for index in range(packages):
+    finder.IncludePackage(f"pkg{index}")
+seconds = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss / 1024 if sys.platform != "darwin" else rss / 1024 / 1024
+except ImportError:
+    rss = None
+result = {"modules": len(finder.modules), "rss": rss, "seconds": seconds}
+print(json.dumps(result))
+"""
+
+
+def write_tree(tree_dir, packages, modules):
+    """Write the packages of the synthetic tree."""
+    base_names = [f"name{index}" for index in range(500)]
+    for package_index in range(packages):
+        package_dir = os.path.join(tree_dir, f"pkg{package_index}")
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, "__init__.py"), "w") as file:
+            file.write("from .base import *\n")
+        with open(os.path.join(package_dir, "base.py"), "w") as file:
+            file.writelines(
+                f"{name} = {index}\n" for index, name in enumerate(base_names)
+            )
+        for module_index in range(modules):
+            lines = ["import os\n", "from .base import *\n"]
+            if module_index:
+                lines.append(f"from . import mod{module_index - 1}\n")
+            lines.extend(
+                f"def func{module_index}_{index}(): pass\n"
+                for index in range(20)
+            )
+            filename = os.path.join(package_dir, f"mod{module_index}.py")
+            with open(filename, "w") as file:
+                file.writelines(lines)
+
+
+def main():
+    packages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    modules = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as tree_dir:
+        write_tree(tree_dir, packages, modules)
+        results = {}
+        for variant in ("before", "after", "stream"):
+            output = subprocess.check_output(
+                [sys.executable, "-c", CHILD, tree_dir, str(packages), variant]
+            )
+            results[variant] = result = json.loads(output)
+            rss = (
+                "n/a" if result["rss"] is None else f"{result['rss']:.1f} MiB"
+            )
+            print(
+                f"{variant}: {result['modules']} modules, peak RSS {rss}, "
+                f"{result['seconds']:.2f}s"
+            )
+        before = results["before"]["rss"]
+        for variant in ("after", "stream"):
+            after = results[variant]["rss"]
+            if before and after:
+                print(
+                    f"saved ({variant}): {before - after:.1f} MiB "
+                    f"({1 - after / before:.0%})"
+                )
+
+
+if __name__ == "__main__":
+    main()
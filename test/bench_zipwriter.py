@@ -0,0 +1,95 @@
+"""
+Benchmark of the parallel compression of library.zip: the modules of the
+standard library are compiled and written to a zip file with zipfile and
+with ZipWriter using 1, 2, 4 and 8 workers, reporting the best wall time of
+a few runs.
+
+Usage: python test/bench_zipwriter.py [repeat]
+"""
+
+from importlib.util import MAGIC_NUMBER
+import marshal
+import os
+import sys
+import sysconfig
+import tempfile
+import time
+import warnings
+import zipfile
+
+from cx_Freeze.zipwriter import ZipWriter
+
+WORKERS = (1, 2, 4, 8)
+
+
+def get_payloads():
+    """Return the marshaled code of the modules of the standard library."""
+    stdlib_dir = sysconfig.get_paths()["stdlib"]
+    payloads = []
+    for path, dirnames, filenames in os.walk(stdlib_dir):
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if name not in ("site-packages", "test", "tests", "__pycache__")
+        ]
+        for filename in filenames:
+            if not filename.endswith(".py"):
+                continue
+            source_path = os.path.join(path, filename)
+            try:
+                with open(source_path, "rb") as file:
+                    code = compile(file.read(), source_path, "exec")
+            except (SyntaxError, ValueError):
+                continue
+            arc_name = os.path.relpath(source_path, stdlib_dir) + "c"
+            arc_name = arc_name.replace(os.sep, "/")
+            header = MAGIC_NUMBER + bytes(12)
+            payloads.append((arc_name, header + marshal.dumps(code)))
+    return payloads
+
+
+def write_zip(filename, payloads, jobs):
+    """Write the payloads to a zip file using the given number of jobs or
+    using zipfile, if jobs is None."""
+    date_time = time.localtime()[:6]
+    if jobs is None:
+        out_file = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED)
+    else:
+        out_file = ZipWriter(filename, zipfile.ZIP_DEFLATED, jobs)
+    with out_file:
+        for arc_name, data in payloads:
+            zinfo = zipfile.ZipInfo(arc_name, date_time)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            out_file.writestr(zinfo, data)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        payloads = get_payloads()
+    total_size = sum(len(data) for _, data in payloads)
+    print(
+        f"{len(payloads)} modules, {total_size / 1024 / 1024:.1f} MiB, "
+        f"{os.cpu_count()} processors"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, "library.zip")
+        baseline = None
+        for jobs in (None,) + WORKERS:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                write_zip(filename, payloads, jobs)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            if baseline is None:
+                baseline = best
+            with zipfile.ZipFile(filename) as zip_file:
+                assert zip_file.testzip() is None
+            name = "zipfile" if jobs is None else f"{jobs} workers"
+            print(f"{name}: {best:.3f}s (speedup {baseline / best:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
+import importlib
+import importlib.machinery
+import marshal
 from unittest import mock
 import os.path
+import subprocess
 import sys
 
 test_dir = os.path.dirname(__file__)
 
 from cx_Freeze.finder import ModuleFinder
+from cx_Freeze.hookregistry import HookRegistry, HookSpec
+from cx_Freeze.hookspecs import HOOKS, MISSING_HOOKS
+from cx_Freeze.module import DistributionIndex, Module
 
 any3 = (mock.ANY,) * 3
 
@@ -58,3 +65,251 @@ def test_invalid_syntax():
         pass
     else:
         assert False, "Expected ImportError, but no error was raised"
+
+
+def test_module_cache(tmp_path):
+    """A second scan of the same file should be served by the cache."""
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+    for _ in range(2):
+        mf = ModuleFinder(cache_dir=cache_dir)
+        with mock.patch.object(mf, "_import_module") as _ImportModule_mock:
+            _ImportModule_mock.return_value = None
+            mf.IncludeFile(os.path.join(test_dir, "imports_sample.py"))
+            calls.append(
+                [call[0][0] for call in _ImportModule_mock.call_args_list]
+            )
+    assert mf.cache.hits > 0
+    assert mf.cache.misses == 0
+    assert calls[0] == calls[1]
+
+
+def test_parallel_jobs():
+    """Parallel mode should find exactly the same modules as serial mode."""
+    results = []
+    for jobs in (1, 4):
+        mf = ModuleFinder(jobs=jobs)
+        mf.IncludePackage("email")
+        mf.IncludeModule("json")
+        mf.IncludeFile(os.path.join(test_dir, "imports_sample.py"))
+        results.append(
+            [(m.name, m.file, sorted(m.global_names)) for m in mf.modules]
+        )
+        results.append(sorted(mf._bad_modules))
+    assert results[0] == results[2]
+    assert results[1] == results[3]
+
+
+def test_prefetch_find_spec_once(tmp_path):
+    """In parallel mode, the spec of an import found to prefetch the module
+    should be used to load it, instead of being searched again."""
+    (tmp_path / "prefetchmain.py").write_text("import prefetchdep\n")
+    (tmp_path / "prefetchdep.py").write_text("")
+    path = [str(tmp_path)] + sys.path
+    mf = ModuleFinder(path=path, jobs=2)
+    spec_from_file_location = importlib.util.spec_from_file_location
+    with mock.patch.object(
+        importlib.util,
+        "spec_from_file_location",
+        side_effect=spec_from_file_location,
+    ) as spy:
+        mf.IncludeModule("prefetchmain")
+    mf.ShutdownWorkers()
+    names = [call[0][0] for call in spy.call_args_list]
+    assert names.count("prefetchdep") == 1
+    assert "prefetchdep" in {module.name for module in mf.modules}
+    assert not mf._prefetched_specs
+
+
+def test_parallel_prefetch(tmp_path):
+    """Parallel mode should only compile the sub modules that are loaded,
+    and the errors should be the same as in serial mode."""
+    package = tmp_path / "prefetchpkg"
+    (package / "data").mkdir(parents=True)
+    (package / "data" / "readme.py").write_text("")
+    (package / "sub").mkdir()
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "__init__.py").write_text("")
+    (package / "good.py").write_text("import json\n")
+    (package / "skipped.py").write_text("")
+    path = [str(tmp_path)] + sys.path
+    mf = ModuleFinder(path=path, excludes=["prefetchpkg.skipped"], jobs=2)
+    module = mf.IncludeModule("prefetchpkg")
+    with mock.patch.object(mf, "_internal_import_module"):
+        mf._import_all_sub_modules(module, [])
+    prefetched = {os.path.relpath(key[0], package) for key in mf._prefetched}
+    assert prefetched == {"good.py", os.path.join("sub", "__init__.py")}
+    mf.ShutdownWorkers()
+    assert not mf._prefetched and mf._executor is None
+
+    (package / "bad.py").write_text("def bad(:\n")
+    errors = []
+    for jobs in (1, 2):
+        mf = ModuleFinder(path=path, jobs=jobs)
+        try:
+            mf.IncludePackage("prefetchpkg")
+        except ImportError as exc:
+            errors.append((type(exc), str(exc)))
+        mf.ShutdownWorkers()
+    assert len(errors) == 2 and errors[0] == errors[1]
+
+
+def test_stream_modules():
+    """In streaming mode the code is kept in the spool, not in memory."""
+    results = []
+    for stream_modules in (False, True):
+        mf = ModuleFinder(stream_modules=stream_modules)
+        mf.IncludeModule("json")
+        results.append(
+            {m.name: m.dump_code() for m in mf.modules if m.has_code}
+        )
+    module = mf.IncludeModule("json.decoder")
+    assert module.has_code and module._code is None
+    assert module.code.co_filename == module.file
+    assert results[0].keys() == results[1].keys()
+    assert all(
+        marshal.loads(results[0][name]) == marshal.loads(data)
+        for name, data in results[1].items()
+    )
+    mf.code_spool.close()
+
+
+def test_find_spec():
+    """The path index should find the same specs as the path finder."""
+    mf = ModuleFinder()
+    path = [os.path.join(test_dir, "samples")] + sys.path
+    for name in ("testmod1", "testpkg1", "json", "zlib", "_pytest", "cx"):
+        spec = mf._find_spec(name, path)
+        expected = importlib.machinery.PathFinder.find_spec(name, path)
+        if expected is None:
+            assert spec is None
+        else:
+            assert spec.origin == expected.origin
+            assert type(spec.loader) is type(expected.loader)
+            assert spec.submodule_search_locations == (
+                expected.submodule_search_locations
+            )
+
+
+def test_distribution_index():
+    """The dist-info files are found by the top-level import name."""
+    index = DistributionIndex()
+    arc_names = [arc_name for arc_name, _ in index.get_files(["_pytest"])]
+    assert any(
+        name.startswith("pytest-") and name.endswith(".dist-info/METADATA")
+        for name in arc_names
+    )
+    assert index.get_files(["not_a_module"]) == []
+
+
+def test_import_graph():
+    """The imports found are recorded in order as edges of the graph."""
+    mf = ModuleFinder()
+    module = mf.IncludeModule("json")
+    assert list(module.imports)[:2] == ["json.decoder", "json.encoder"]
+    decoder = [m for m in mf.modules if m.name == "json.decoder"][0]
+    assert "re" in decoder.imports
+    assert "json.scanner" in decoder.imports
+
+
+def test_hook_specs():
+    """The callbacks of the hooks are named after their modules and live in
+    the module of the hooks package named after their top level package."""
+    for prefix, specs in (("load", HOOKS), ("missing", MISSING_HOOKS)):
+        for name, spec in specs.items():
+            if spec.callback is not None:
+                assert spec.callback == f"{prefix}_{name.replace('.', '_')}"
+                module = importlib.import_module(
+                    f"cx_Freeze.hooks.{name.partition('.')[0]}"
+                )
+                assert callable(getattr(module, spec.callback))
+
+
+def test_sysconfig_hook():
+    """The data module of sysconfig is included by a declaration, and the
+    finder of the base modules imports no callback."""
+    import sysconfig
+
+    get_data_name = getattr(sysconfig, "_get_sysconfigdata_name", None)
+    data_name = get_data_name() if get_data_name else "_sysconfigdata"
+    assert HOOKS["sysconfig"] == HookSpec(includes=(data_name,))
+    source = (
+        "import sys\n"
+        "from cx_Freeze.finder import ModuleFinder\n"
+        "finder = ModuleFinder()\n"
+        "assert 'sysconfig' in [m.name for m in finder.modules]\n"
+        "print([m for m in sys.modules if m.partition('.')[2] == 'hooks'])\n"
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", source], universal_newlines=True
+    )
+    assert output == "[]\n"
+
+
+def test_hook_registry(tmp_path, monkeypatch):
+    """The hooks of other packages, declared by entry points, extend the
+    hooks of cx_Freeze and are loaded only when their module is found."""
+    dist_info = tmp_path / "hookpkg-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: hookpkg\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[cx_Freeze.hooks]\n"
+        "time = hookpkg:TIME_HOOK\n"
+        "missing:spam = hookpkg:missing_spam\n"
+    )
+    (tmp_path / "hookpkg.py").write_text(
+        "TIME_HOOK = {'includes': ['calendar'], 'ignore_names': ['eggs']}\n"
+        "def missing_spam(finder, caller):\n"
+        "    caller.ignore_names.add('spam')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = HookRegistry([str(tmp_path)])
+    assert "hookpkg" not in sys.modules
+    assert registry.get("load", "not_a_module") is None
+    finder = mock.Mock()
+    module = Module("time")
+    registry.get("load", "time")(finder, module)
+    assert "hookpkg" in sys.modules
+    assert finder.IncludeModule.call_args_list == [
+        mock.call("_strptime"),
+        mock.call("calendar"),
+    ]
+    assert module.ignore_names == {"eggs"}
+    registry.get("missing", "spam")(finder, module)
+    assert module.ignore_names == {"eggs", "spam"}
+    registry.add("load", "spam", HookSpec(include_packages=("email",)))
+    registry.get("load", "spam")(finder, module)
+    finder.IncludePackage.assert_called_once_with("email")
+    monkeypatch.delitem(sys.modules, "hookpkg")
+
+
+def test_exclude_patterns():
+    """The excludes match the submodules and the glob patterns."""
+    mf = ModuleFinder(excludes=["*.tool"])
+    mf.IncludePackage("json")
+    names = {module.name for module in mf.modules}
+    assert "json.decoder" in names
+    assert "json.tool" not in names
+    assert "json.decoder.py_scanstring" not in mf.excludes
+    mf.ExcludeModule("json")
+    assert "json.decoder" in mf.excludes
+    assert mf.IncludeModule("json").name == "json"
+    assert "json" not in mf.excludes
+
+
+def test_module_names():
+    """The names imported with * are shared until the names change."""
+    base = Module("base")
+    base.add_global_name("a")
+    first, second = Module("first"), Module("second")
+    first.add_star_import(base)
+    second.add_star_import(base)
+    assert first.get_frozen_global_names() is second.get_frozen_global_names()
+    assert first.has_global_name("a")
+    assert not first.has_ignore_name("a")
+    first.add_global_name("b")
+    assert first.get_frozen_global_names() == {"a", "b"}
+    first.global_names.add("c")
+    assert first.global_names == {"a", "b", "c"}
+    assert base.global_names == second.global_names == {"a"}
+    assert not hasattr(first, "__dict__")
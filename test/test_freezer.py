@@ -0,0 +1,382 @@
+import json
+import marshal
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import zipfile
+
+import pytest
+
+from cx_Freeze import Executable
+from cx_Freeze.freezer import Freezer
+from cx_Freeze.zipwriter import ZipWriter
+
+if sys.platform not in ("darwin", "win32"):
+    from cx_Freeze.patchelf import ELFFile, Patchelf
+
+ELF_ONLY = pytest.mark.skipif(
+    sys.platform in ("darwin", "win32"), reason="ELF files only"
+)
+
+
+def _freeze(tmp_path, source, target_name="build", **options):
+    """Freeze the script with the given source, returning the freezer."""
+    script = tmp_path / "test_script.py"
+    script.write_text(source)
+    target_dir = tmp_path / target_name
+    freezer = Freezer(
+        [Executable(str(script))],
+        targetDir=str(target_dir),
+        silent=3,
+        **options,
+    )
+    freezer.Freeze()
+    return freezer
+
+
+def _run(freezer):
+    """Run the frozen executable, returning its output."""
+    executable = freezer.executables[0]
+    path = os.path.join(freezer.targetdir, executable.target_name)
+    return subprocess.check_output([path], universal_newlines=True)
+
+
+def _read_constants(freezer):
+    """Return the names defined by the BUILD_CONSTANTS module."""
+    filename = os.path.join(freezer.targetdir, "lib", "library.zip")
+    with zipfile.ZipFile(filename) as zip_file:
+        data = zip_file.read("BUILD_CONSTANTS.pyc")
+    namespace = {}
+    exec(marshal.loads(data[16:]), namespace)
+    return namespace
+
+
+def _extension_target(freezer, name):
+    """Return the path of the copy of the extension module."""
+    module = next(m for m in freezer.finder.modules if m.name == name)
+    return os.path.join(
+        freezer.targetdir, "lib", os.path.basename(module.file)
+    )
+
+
+@ELF_ONLY
+def test_origin_rpath(tmp_path, monkeypatch):
+    """The executable and the copied libraries should search the target
+    directory and the lib directory, so the executable is not restarted."""
+    rpaths = {}
+    set_rpath = Patchelf.set_rpath
+
+    def record_rpath(self, file_name, rpath):
+        rpaths[file_name] = rpath
+        set_rpath(self, file_name, rpath)
+
+    monkeypatch.setattr(Patchelf, "set_rpath", record_rpath)
+    data_file = tmp_path / "data.txt"
+    data_file.write_text("data")
+    freezer = _freeze(
+        tmp_path,
+        "import _bz2\nprint('hello')\n",
+        originRpath=True,
+        includeFiles=[(str(data_file), "data.txt")],
+    )
+    executable = os.path.join(
+        freezer.targetdir, freezer.executables[0].target_name
+    )
+    assert ELFFile(executable).rpath.startswith("$ORIGIN:$ORIGIN/lib")
+    extension = _extension_target(freezer, "_bz2")
+    assert ELFFile(extension).rpath.startswith("$ORIGIN/..:$ORIGIN")
+    # the data files are not ELF files, they get no rpath
+    assert os.path.join(freezer.targetdir, "data.txt") not in rpaths
+    assert _read_constants(freezer)["ORIGIN_RPATH"] is True
+    assert _run(freezer) == "hello\n"
+
+
+def test_indexed_archive(tmp_path):
+    """The finder of the archive is only installed by the executables frozen
+    with the indexed archive."""
+    freezer = _freeze(tmp_path, "import json\nprint('hello')\n")
+    assert "INDEXED_ARCHIVE" not in _read_constants(freezer)
+    assert not any(m.name == "__archive__" for m in freezer.finder.modules)
+    assert _run(freezer) == "hello\n"
+
+    freezer = _freeze(
+        tmp_path,
+        "import json\nprint('hello')\n",
+        target_name="build_indexed",
+        archiveFormat="indexed",
+    )
+    # the constants are read before the archive, from the zip file
+    assert _read_constants(freezer)["INDEXED_ARCHIVE"] is True
+    filename = os.path.join(freezer.targetdir, "lib", "library.zip")
+    with zipfile.ZipFile(filename) as zip_file:
+        assert "__archive__.pyc" in zip_file.namelist()
+        assert "json/__init__.pyc" not in zip_file.namelist()
+    assert _run(freezer) == "hello\n"
+
+
+def test_import_trace(tmp_path, monkeypatch):
+    """The imports are only traced by the executables frozen with the
+    import_trace option."""
+    trace_file = tmp_path / "trace.json"
+    monkeypatch.setenv("CX_FREEZE_IMPORT_TRACE", str(trace_file))
+    freezer = _freeze(tmp_path, "import json\nprint('hello')\n")
+    assert "IMPORT_TRACE" not in _read_constants(freezer)
+    assert _run(freezer) == "hello\n"
+    assert not trace_file.exists()
+
+    freezer = _freeze(
+        tmp_path,
+        "import json\nprint('hello')\n",
+        target_name="build_traced",
+        importTrace=True,
+    )
+    assert _read_constants(freezer)["IMPORT_TRACE"] is True
+    assert _run(freezer) == "hello\n"
+    trace = json.loads(trace_file.read_text())
+    assert "json" in [module["name"] for module in trace["modules"]]
+
+
+def _tree(target_dir):
+    """Return the mode and the rpath of each file of the target directory."""
+    files = {}
+    for path, _, filenames in os.walk(target_dir):
+        for filename in filenames:
+            fullname = os.path.join(path, filename)
+            rpath = None
+            if sys.platform not in ("darwin", "win32"):
+                try:
+                    rpath = ELFFile(fullname).rpath
+                except (OSError, ValueError):
+                    pass
+            name = os.path.relpath(fullname, target_dir)
+            files[name] = (os.stat(fullname).st_mode, rpath)
+    return files
+
+
+def test_parallel_copy(tmp_path):
+    """Parallel mode should copy the same files, with the same modes and
+    rpaths, as serial mode."""
+    data_dir = tmp_path / "data"
+    (data_dir / "sub").mkdir(parents=True)
+    (data_dir / "sub" / "data.txt").write_text("data")
+    (data_dir / "tool.sh").write_text("#!/bin/sh\n")
+    (data_dir / "tool.sh").chmod(0o755)
+    trees = []
+    for jobs in (1, 4):
+        freezer = _freeze(
+            tmp_path,
+            "import _bz2, json\nprint('hello')\n",
+            target_name=f"build_{jobs}",
+            includeFiles=[(str(data_dir), "data")],
+            jobs=jobs,
+        )
+        assert (freezer._copy_executor is not None) == (jobs > 1)
+        assert _run(freezer) == "hello\n"
+        trees.append(_tree(freezer.targetdir))
+    assert trees[0] == trees[1]
+    assert os.path.join("data", "sub", "data.txt") in trees[0]
+    if sys.platform not in ("darwin", "win32"):
+        assert any(rpath for _, rpath in trees[0].values())
+
+
+def test_parallel_dependencies(tmp_path, monkeypatch):
+    """In parallel mode, the dependencies of the files should be read by the
+    pool of copy threads."""
+    get_dependent_files = Freezer._GetDependentFiles
+    threads = []
+
+    def record_thread(self, path, *args):
+        threads.append(threading.current_thread())
+        return get_dependent_files(self, path, *args)
+
+    monkeypatch.setattr(Freezer, "_GetDependentFiles", record_thread)
+    freezer = _freeze(tmp_path, "import _bz2, json\nprint('hello')\n", jobs=4)
+    assert _run(freezer) == "hello\n"
+    if sys.platform != "darwin":
+        assert any(t is not threading.main_thread() for t in threads)
+
+
+def test_incremental_copies(tmp_path):
+    """An incremental build of an unchanged project should only copy the
+    executable again, as the manifest records the files once they are
+    final."""
+    source = "import _bz2, json\nprint('hello')\n"
+    _freeze(tmp_path, source, incremental=True)
+    freezer = _freeze(tmp_path, source, incremental=True, profile=True)
+    assert _run(freezer) == "hello\n"
+    assert freezer.profiler.counters.get("files copied") == 1
+
+
+def test_parallel_copy_error(tmp_path, monkeypatch):
+    """An error raised by a copy done in parallel mode should fail the
+    build."""
+    copy_file_data = Freezer._CopyFileData
+
+    def fail_copy(self, source, target, *args):
+        if os.path.basename(target) == "data.txt":
+            raise OSError(f"cannot copy {source}")
+        copy_file_data(self, source, target, *args)
+
+    monkeypatch.setattr(Freezer, "_CopyFileData", fail_copy)
+    data_file = tmp_path / "data.txt"
+    data_file.write_text("data")
+    with pytest.raises(OSError, match="cannot copy"):
+        _freeze(
+            tmp_path,
+            "print('hello')\n",
+            includeFiles=[(str(data_file), "data.txt")],
+            jobs=4,
+        )
+
+
+def test_extension_in_zip_package(tmp_path):
+    """An extension module of a package stored in the zip file should be
+    copied to the lib directory and loaded from its recorded location."""
+    import _bz2
+
+    package = tmp_path / "extpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    extension = package / os.path.basename(_bz2.__file__)
+    shutil.copyfile(_bz2.__file__, str(extension))
+    freezer = _freeze(
+        tmp_path,
+        "import os, sys\n"
+        "from extpkg import _bz2\n"
+        "origin = _bz2.__spec__.origin\n"
+        "print(os.path.relpath(origin, os.path.dirname(sys.executable)))\n",
+        path=[str(tmp_path)] + sys.path,
+        zipIncludePackages=["extpkg"],
+    )
+    location = os.path.join("lib", "extpkg." + extension.name)
+    assert _read_constants(freezer)["EXTENSION_MODULES"] == {
+        "extpkg._bz2": location
+    }
+    assert os.path.isfile(os.path.join(freezer.targetdir, location))
+    assert _run(freezer) == location + "\n"
+
+
+def test_package_data_excludes(tmp_path):
+    """The package data matching the excludes should not be copied, the
+    other package data should be."""
+    package = tmp_path / "datapkg"
+    for dirname in ("data", "tests", "docs", "sub"):
+        (package / dirname).mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "data" / "keep.txt").write_text("keep")
+    (package / "data" / "notes.md").write_text("notes")
+    (package / "tests" / "test_data.txt").write_text("test")
+    (package / "docs" / "index.txt").write_text("docs")
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "sub" / "sub.txt").write_text("sub")
+    freezer = _freeze(
+        tmp_path,
+        "import datapkg\nprint('hello')\n",
+        path=[str(tmp_path)] + sys.path,
+        excludes=["datapkg.sub"],
+        packageDataExcludes=["tests", "*.md", "datapkg/docs"],
+    )
+    target = os.path.join(freezer.targetdir, "lib", "datapkg")
+    copied = {
+        os.path.relpath(os.path.join(path, name), target)
+        for path, dirnames, filenames in os.walk(target)
+        for name in dirnames + filenames
+    }
+    assert copied == {
+        "__init__.pyc",
+        "data",
+        os.path.join("data", "keep.txt"),
+    }
+    assert _run(freezer) == "hello\n"
+
+
+def test_import_trace_indexed_archive(tmp_path, monkeypatch):
+    """The tracer is installed before the finder of the archive, so it
+    should be read from the zip file."""
+    trace_file = tmp_path / "trace.json"
+    monkeypatch.setenv("CX_FREEZE_IMPORT_TRACE", str(trace_file))
+    freezer = _freeze(
+        tmp_path,
+        "import json\nprint('hello')\n",
+        archiveFormat="indexed",
+        importTrace=True,
+    )
+    filename = os.path.join(freezer.targetdir, "lib", "library.zip")
+    with zipfile.ZipFile(filename) as zip_file:
+        assert "__importtrace__.pyc" in zip_file.namelist()
+        assert "json/__init__.pyc" not in zip_file.namelist()
+    assert _run(freezer) == "hello\n"
+    trace = json.loads(trace_file.read_text())
+    assert "json" in [module["name"] for module in trace["modules"]]
+
+
+def test_stream_modules_parallel(tmp_path, monkeypatch):
+    """In streaming mode with parallel jobs, the zip writer should only hold
+    a bounded number of entries, so the code read back from the spool is
+    released as the entries are written."""
+    in_flight = []
+    writestr = ZipWriter.writestr
+
+    def record_writestr(self, *args):
+        writestr(self, *args)
+        in_flight.append(len(self._pending))
+
+    monkeypatch.setattr(ZipWriter, "writestr", record_writestr)
+    freezer = _freeze(
+        tmp_path,
+        "import email, json\nprint('hello')\n",
+        jobs=4,
+        streamModules=True,
+    )
+    assert len(in_flight) > 100
+    assert max(in_flight) <= 2 * 4
+    assert not any(module._code for module in freezer.finder.modules)
+    assert _run(freezer) == "hello\n"
+
+
+@ELF_ONLY
+def test_dedupe_needed_runpath(tmp_path):
+    """In needed mode, the files which find a duplicate in their runpath
+    should load the canonical copy, and a duplicate that a file may still
+    load should be kept."""
+    import _bz2
+
+    target_dir = tmp_path / "build"
+    freezer = Freezer(
+        [], targetDir=str(target_dir), silent=3, dedupeLibraries="needed"
+    )
+    library = next(
+        path
+        for path in freezer.patchelf.get_dependent_files(_bz2.__file__)[0]
+        if os.path.basename(path) == "libbz2.so.1.0"
+    )
+    files = {}
+    for name in ("a", "b", "c"):
+        (target_dir / "lib" / name).mkdir(parents=True)
+        files[name] = str(target_dir / "lib" / name / "libbz2.so.1.0")
+        shutil.copyfile(library, files[name])
+    consumer = str(target_dir / "lib" / "b" / "_bz2.so")
+    shutil.copyfile(_bz2.__file__, consumer)
+    subprocess.check_call(["patchelf", "--set-rpath", "$ORIGIN", consumer])
+    assert ELFFile(consumer).runpath == "$ORIGIN"
+    freezer.files_copied = set(files.values()) | {consumer}
+    freezer._DedupeLibraries()
+    assert os.path.isfile(files["a"])
+    assert not os.path.exists(files["b"])
+    assert ELFFile(consumer).rpath == "$ORIGIN:$ORIGIN/../a"
+    # the consumer needs a library of this name and does not search the
+    # directory of this duplicate, which is linked instead of removed
+    assert os.path.samefile(files["a"], files["c"])
+
+    # the duplicate is kept when a file does not find it in its runpath
+    os.remove(files["c"])
+    shutil.copyfile(library, files["c"])
+    other = str(target_dir / "lib" / "c" / "_bz2.so")
+    shutil.copyfile(_bz2.__file__, other)
+    subprocess.check_call(["patchelf", "--set-rpath", "$ORIGIN/..", other])
+    freezer.files_copied = {files["a"], files["c"], other}
+    freezer._DedupeLibraries()
+    assert os.path.samefile(files["a"], files["c"])
+    assert ELFFile(other).runpath == "$ORIGIN/.."
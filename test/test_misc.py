@@ -1,10 +1,29 @@
+import importlib.util
+import json
+import marshal
 import os.path
+import struct
 import sys
+import time
+import zipfile
 
 from nose.tools import assert_raises
 
-from cx_Freeze.common import process_path_specs
+from cx_Freeze import zipwriter
+from cx_Freeze.archive import ArchiveWriter
+from cx_Freeze.codespool import CodeSpool
+from cx_Freeze.common import get_resource_file_path, process_path_specs
+from cx_Freeze.dedupe import ContentIndex, is_shared_library
 from cx_Freeze.exception import ConfigError
+from cx_Freeze.frozentable import FrozenTable
+from cx_Freeze.importtrace import ImportTrace
+from cx_Freeze.manifest import BuildManifest
+from cx_Freeze.module import DistributionIndex
+from cx_Freeze.nametrie import NameTrie
+from cx_Freeze.packagequery import PackageQuery
+from cx_Freeze.profiler import Profiler
+from cx_Freeze.sizereport import SizeReport
+from cx_Freeze.zipwriter import CompressionPolicy, ZipWriter
 
 
 rootdir = "C:\\" if sys.platform == "win32" else "/"
@@ -30,3 +49,323 @@ def test_process_path_specs_bad():
 
     with assert_raises(ConfigError):
         process_path_specs([("a", "b", "c")])
+
+
+def test_build_manifest(tmpdir):
+    source = tmpdir.join("source.txt")
+    source.write("data")
+    target_dir = tmpdir.join("build")
+    target = target_dir.join("lib", "source.txt")
+    source.copy(target.dirpath().ensure(dir=True))
+    options = [False, None]
+
+    manifest = BuildManifest(str(target_dir))
+    assert not manifest.loaded
+    manifest.add(str(target), str(source), options)
+    manifest.save()
+
+    manifest = BuildManifest(str(target_dir))
+    assert manifest.loaded
+    assert not manifest.is_up_to_date(str(target), str(source), [True, None])
+    assert manifest.is_up_to_date(str(target), str(source), options)
+    # the same contents with a new modification time
+    source.setmtime(source.mtime() + 10)
+    assert manifest.is_up_to_date(str(target), str(source), options)
+    source.write("changed")
+    assert not manifest.is_up_to_date(str(target), str(source), options)
+    assert manifest.stale_files() == []
+
+    manifest = BuildManifest(str(target_dir))
+    assert manifest.stale_files() == [str(target)]
+
+
+def test_zip_writer(tmpdir):
+    filename = str(tmpdir.join("library.zip"))
+    entries = [(f"pkg/mod{i}.pyc", bytes([i]) * 1000 * i) for i in range(20)]
+    with ZipWriter(filename, zipfile.ZIP_DEFLATED, jobs=4) as zip_writer:
+        for name, data in entries:
+            zinfo = zipfile.ZipInfo(name)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zip_writer.writestr(zinfo, data)
+        zip_writer.write(__file__, "test_misc.py")
+    with zipfile.ZipFile(filename) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [name for name, _ in entries] + [
+            "test_misc.py"
+        ]
+        for name, data in entries:
+            assert zip_file.read(name) == data
+
+
+def test_zip_writer_backpressure(tmpdir, monkeypatch):
+    compress = zipwriter._compress
+
+    def slow_compress(*args):
+        time.sleep(0.01)
+        return compress(*args)
+
+    monkeypatch.setattr(zipwriter, "_compress", slow_compress)
+    filename = str(tmpdir.join("library.zip"))
+    in_flight = []
+    with ZipWriter(filename, zipfile.ZIP_DEFLATED, jobs=2) as zip_writer:
+        for i in range(50):
+            zinfo = zipfile.ZipInfo(f"mod{i}.pyc")
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zip_writer.writestr(zinfo, bytes([i]) * 100000)
+            in_flight.append(len(zip_writer._pending))
+    # the entries are written as they are added, not when the file is closed
+    assert max(in_flight) == 4
+    with zipfile.ZipFile(filename) as zip_file:
+        assert zip_file.testzip() is None
+        assert len(zip_file.namelist()) == 50
+
+
+def test_zip_writer_error(tmpdir):
+    filename = str(tmpdir.join("library.zip"))
+    with assert_raises(RuntimeError):
+        with ZipWriter(filename, zipfile.ZIP_DEFLATED, jobs=2) as zip_writer:
+            zinfo = zipfile.ZipInfo("mod.pyc")
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zip_writer.writestr(zinfo, b"data" * 1000)
+            raise RuntimeError("the build failed")
+    # a partial archive is not left to be trusted by the next build
+    assert not os.path.exists(filename)
+
+
+def test_compression_policy():
+    policy = CompressionPolicy(
+        level=6,
+        min_size=100,
+        rules=["*.json=lzma", ("data/*", "bzip2:9"), "pkg/*=stored"],
+    )
+    assert policy.get("mod.pyc", 1000) == (zipfile.ZIP_DEFLATED, 6)
+    assert policy.get("mod.pyc", 10) == (zipfile.ZIP_STORED, None)
+    assert policy.get("pkg/mod.pyc", 1000) == (zipfile.ZIP_STORED, 6)
+    assert policy.get("pkg/data.json", 1000) == (zipfile.ZIP_LZMA, 6)
+    assert policy.get("data/file.txt", 1000) == (zipfile.ZIP_BZIP2, 9)
+    # zipimport cannot read modules compressed with bzip2
+    assert policy.get("data/mod.pyc", 1000) == (zipfile.ZIP_DEFLATED, 6)
+    policy = CompressionPolicy(compress=False)
+    assert policy.get("mod.pyc", 1000) == (zipfile.ZIP_STORED, None)
+    with assert_raises(ConfigError):
+        CompressionPolicy(rules=["*.json=zstd"])
+    with assert_raises(ConfigError):
+        CompressionPolicy(rules=["*.json"])
+    with assert_raises(ConfigError):
+        CompressionPolicy(level=10)
+
+
+def test_archive(tmpdir):
+    filename = str(tmpdir.join("library.dat"))
+    policy = CompressionPolicy(rules=["pkg/*=deflated:9"])
+    with ArchiveWriter(filename, policy) as archive:
+        archive.add("pkg", marshal.dumps(compile("", "pkg", "exec")), True)
+        archive.add("mod", marshal.dumps(compile("X = 1", "mod", "exec")))
+        source = "Y = 'y' * 1000"
+        archive.add("pkg.mod", marshal.dumps(compile(source, "m", "exec")))
+
+    path = get_resource_file_path("initscripts", "__archive__", ".py")
+    spec = importlib.util.spec_from_file_location("__archive__", path)
+    archive_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(archive_module)
+    location = str(tmpdir.join("library.zip"))
+    finder = archive_module.ArchiveFinder(filename, location)
+    assert finder.module_names() == ["mod", "pkg", "pkg.mod"]
+    assert finder.find_spec("missing") is None
+    assert finder.find_spec("pk") is None
+    spec = finder.find_spec("pkg")
+    assert spec.submodule_search_locations == [os.path.join(location, "pkg")]
+    assert finder.is_package("pkg")
+    spec = finder.find_spec("pkg.mod")
+    assert spec.origin == os.path.join(location, "pkg", "mod.pyc")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.Y == "y" * 1000
+    namespace = {}
+    exec(finder.get_code("mod"), namespace)
+    assert namespace["X"] == 1
+
+    # the index is sorted but the data keeps the order of the modules
+    offsets = [finder._lookup(name)[0] for name in ("pkg", "mod", "pkg.mod")]
+    assert offsets == sorted(offsets)
+
+
+def test_frozen_table(tmpdir):
+    filename = str(tmpdir.join("base"))
+    with open(filename, "wb") as file:
+        file.write(b"executable")
+    table = FrozenTable()
+    table.add("mod", marshal.dumps(compile("X = 1", "mod", "exec")))
+    table.add("pkg", marshal.dumps(compile("", "pkg", "exec")), True)
+    table.append_to(filename)
+    assert len(table) == 2
+
+    with open(filename, "rb") as file:
+        contents = file.read()
+    assert contents.startswith(b"executable")
+    magic, version, count, size = struct.unpack("<4s3L", contents[-16:])
+    assert (magic, version, count) == (b"CXFZ", 1, 2)
+    data = contents[-16 - size : -16]
+    assert len(data) + 16 + len(b"executable") == len(contents)
+    modules = {}
+    for index in range(count):
+        name_offset, code_offset, code_size = struct.unpack_from(
+            "<LLl", data, index * 12
+        )
+        name = data[name_offset : data.index(b"\0", name_offset)]
+        code = data[code_offset : code_offset + abs(code_size)]
+        modules[name.decode()] = (marshal.loads(code), code_size < 0)
+    assert sorted(modules) == ["mod", "pkg"]
+    assert not modules["mod"][1] and modules["pkg"][1]
+    namespace = {}
+    exec(modules["mod"][0], namespace)
+    assert namespace["X"] == 1
+
+
+def test_import_trace(tmpdir):
+    for name, modules in (("a", ["sys", "os", "json"]), ("b", ["re", "os"])):
+        data = {"version": 1, "modules": [{"name": m} for m in modules]}
+        tmpdir.join(f"{name}.json").write(json.dumps(data))
+    tmpdir.join("notes.txt").write("not a trace")
+    trace = ImportTrace([str(tmpdir)])
+    assert len(trace.files) == 2
+    assert "os" in trace and "pkg" not in trace
+    assert trace.ordered() == ["re", "sys", "os", "json"]
+    bad_trace = tmpdir.join("bad.json")
+    bad_trace.write(json.dumps({"version": 0}))
+    with assert_raises(ConfigError):
+        ImportTrace([str(bad_trace)])
+
+
+def test_profiler(tmpdir):
+    profiler = Profiler()
+    with profiler.phase("outer", "build"):
+        for name in ("a", "b"):
+            with profiler.phase("inner", "hook", module=name):
+                profiler.count("modules")
+    names = [(name, calls) for name, calls, *_ in profiler.summary()]
+    assert sorted(names) == [("inner", 2), ("outer", 1)]
+    outer = [event for event in profiler.events if event.name == "outer"][0]
+    inner_wall = sum(e.wall for e in profiler.events if e.name == "inner")
+    assert abs(outer.own - (outer.wall - inner_wall)) < 1e-6
+    assert profiler.counters == {"modules": 2}
+    filename = str(tmpdir.join("trace.json"))
+    profiler.write_trace(filename)
+    with open(filename) as file:
+        events = json.load(file)["traceEvents"]
+    phases = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in phases] == ["outer", "inner", "inner"]
+    assert phases[1]["args"]["module"] == "a"
+    disabled = Profiler(enabled=False)
+    with disabled.phase("outer"):
+        disabled.count("modules")
+    assert disabled.events == [] and disabled.counters == {}
+
+
+def test_size_report():
+    report = SizeReport()
+    for name, size in (
+        ("main", 10),
+        ("app", 20),
+        ("json", 30),
+        ("json.decoder", 40),
+        ("big", 100),
+        ("shared", 5),
+        ("unused", 7),
+    ):
+        report.add_module(name, size)
+    lib = report.add_file("/lib/libbig.so", 1000)
+    report.add_dependency("big", lib)
+    report.add_data("big.data", 50)
+    report.add_root("main")
+    report.add_import("main", "app")
+    report.add_import("main", "json.decoder")
+    report.add_import("app", "big")
+    report.add_import("app", "shared")
+    report.add_import("json.decoder", "shared")
+    retained = report.retained_sizes()
+    # excluding big removes its library and its data too
+    assert retained["big"] == (1150, 1)
+    assert retained["app"] == (1170, 2)
+    # the import of json.decoder is an import of the package json
+    assert retained["json"] == (70, 2)
+    # shared is imported by two modules, so it only dominates itself
+    assert retained["shared"] == (5, 1)
+    assert retained["unused"] == (7, 1)
+    assert retained[""] == (1262, 7)
+
+
+def test_content_index(tmpdir):
+    for path, data in (
+        ("libz.so.1", b"zlib"),
+        ("a.libs/libz.so.1", b"zlib"),
+        ("b.libs/libz-1234.so.1", b"zlib"),
+        ("b.libs/libother.so", b"zlib2"),
+        ("c.libs/libbig.so", b"big"),
+    ):
+        tmpdir.join(path).write_binary(data, ensure=True)
+    os.link(tmpdir.join("c.libs/libbig.so"), tmpdir.join("libbig.so"))
+    paths = sorted(str(path) for path in tmpdir.visit() if path.isfile())
+    assert all(is_shared_library(path) for path in paths)
+    assert not is_shared_library("lib/data.json")
+    index = ContentIndex(jobs=2)
+    groups = index.duplicates(paths)
+    # the hard links are already deduplicated, the nearest copy is kept
+    assert [[os.path.relpath(p, tmpdir) for p in g] for g in groups] == [
+        [
+            "libz.so.1",
+            os.path.join("a.libs", "libz.so.1"),
+            os.path.join("b.libs", "libz-1234.so.1"),
+        ]
+    ]
+
+
+def test_package_query(tmpdir):
+    source = "import pytest; result = [pytest.__version__, __name__]"
+    distributions = DistributionIndex()
+    query = PackageQuery(sys.path, distributions, str(tmpdir))
+    version = distributions.get_version("pytest")
+    assert query.run("pytest", source) == [version, "builtins"]
+    assert query.run("pytest", source) == [version, "builtins"]
+    assert query.runs == 1
+    # the entry is renamed into place, no temporary file is left
+    entries = tmpdir.join("queries").listdir()
+    assert [entry.ext for entry in entries] == [".json"]
+    # the answer is cached on disk by package version
+    query = PackageQuery(sys.path, distributions, str(tmpdir))
+    assert query.run("pytest", source) == [version, "builtins"]
+    assert query.runs == 0
+    with assert_raises(ImportError):
+        query.run("not_a_package", "import not_a_package")
+    assert query.runs == 1
+
+
+def test_name_trie():
+    trie = NameTrie(["os.path", "*.tests", "pkg.*_test", "mod?"])
+    assert "os.path" in trie
+    assert "os.path.sub" in trie
+    assert "os" not in trie
+    assert "os.pathlib" not in trie
+    assert "scipy.ndimage.tests" in trie
+    assert "scipy.ndimage.tests.test_filters" in trie
+    assert "scipy.tests_utils" not in trie
+    assert "pkg.unit_test.data" in trie
+    assert "other.unit_test" not in trie
+    assert "mod1.sub" in trie
+    assert list(trie) == ["os.path", "*.tests", "pkg.*_test", "mod?"]
+    trie.discard("os.path")
+    trie.discard("*.tests")
+    trie.discard("not_added")
+    assert "os.path" not in trie
+    assert "pkg.tests" not in trie
+    assert len(trie) == 2
+
+
+def test_code_spool():
+    code = compile("x = 1", "spooled.py", "exec")
+    with CodeSpool() as spool:
+        first = spool.add(b"first")
+        second = spool.add(marshal.dumps(code))
+        assert second.read() == marshal.dumps(code)
+        assert first.read() == b"first"
+        assert (spool.count, spool.size) == (2, second.offset + second.size)
@@ -0,0 +1,211 @@
+import os
+import shutil
+import struct
+import subprocess
+import sys
+
+import pytest
+
+import cx_Freeze
+
+if sys.platform in ("darwin", "win32"):
+    pytest.skip("ELF files only", allow_module_level=True)
+
+from cx_Freeze.freezer import Freezer
+from cx_Freeze.patchelf import (
+    DT_RPATH,
+    DT_RUNPATH,
+    DT_VERNEED,
+    DYNAMIC_LINKER_NAME,
+    ELFFile,
+    Patchelf,
+    _set_rpath_in_place,
+)
+
+
+def _ldd(path):
+    """Return the dependencies of the file as listed by ldd."""
+    output = subprocess.check_output(["ldd", path], universal_newlines=True)
+    dependent_files = []
+    for line in output.splitlines():
+        parts = line.strip().split(" => ")
+        if len(parts) == 2 and parts[1].startswith("/"):
+            dependent_files.append(parts[1].partition(" (")[0])
+    return dependent_files
+
+
+def _readelf_dynamic(path):
+    """Return the dynamic section of the file as listed by readelf."""
+    return subprocess.check_output(
+        ["readelf", "-d", path], universal_newlines=True
+    )
+
+
+def _find_library_without_rpath():
+    """Return a library without rpath nor runpath which needs other libraries
+    than the dynamic linker, or None."""
+    patchelf = Patchelf()
+    lib_dynload = os.path.dirname(os.__file__) + "/lib-dynload"
+    paths = [
+        os.path.join(lib_dynload, name)
+        for name in sorted(os.listdir(lib_dynload))
+        if name.endswith(".so")
+    ]
+    for path in paths + [sys.executable]:
+        paths += patchelf.get_dependent_files(path)[0]
+    for path in paths:
+        elf = ELFFile(path)
+        needed = [n for n in elf.needed if not DYNAMIC_LINKER_NAME.match(n)]
+        if elf.rpath is None and elf.runpath is None and needed:
+            return path
+    return None
+
+
+def test_elf_file():
+    elf = ELFFile(sys.executable)
+    assert elf.elf_class in (1, 2)
+    assert elf.needed
+    with pytest.raises(ValueError):
+        ELFFile(__file__)
+
+
+@pytest.mark.skipif(shutil.which("ldd") is None, reason="requires ldd")
+def test_dependent_files():
+    """The dependencies should be resolved as ldd does."""
+    patchelf = Patchelf()
+    lib_dynload = os.path.dirname(os.__file__) + "/lib-dynload"
+    paths = [sys.executable] + [
+        os.path.join(lib_dynload, name)
+        for name in sorted(os.listdir(lib_dynload))
+        if name.endswith(".so")
+    ]
+    for path in paths:
+        dependent_files, _ = patchelf.get_dependent_files(path)
+        assert dependent_files == _ldd(path)
+
+
+def test_set_rpath_in_place(tmp_path, monkeypatch):
+    """A shorter rpath should be written without the patchelf utility."""
+    bases_dir = os.path.join(os.path.dirname(cx_Freeze.__file__), "bases")
+    source = os.path.join(bases_dir, "Console")
+    if ELFFile(source).runpath is None and ELFFile(source).rpath is None:
+        pytest.skip("the base executable has no rpath")
+    target = str(tmp_path / "Console")
+    shutil.copy2(source, target)
+    monkeypatch.setenv("PATH", "")
+    patchelf = Patchelf()
+    patchelf.set_rpath(target, "$ORIGIN/lib")
+    elf = ELFFile(target)
+    assert elf.rpath == "$ORIGIN/lib"
+    assert elf.runpath is None
+    assert patchelf.get_rpath(target) == "$ORIGIN/lib"
+    assert elf.needed == ELFFile(source).needed
+
+
+def test_set_rpath_shared_with_version(tmp_path):
+    """An rpath which shares its bytes with the name of a version should not
+    be overwritten in place."""
+    import _bz2
+
+    target = str(tmp_path / os.path.basename(_bz2.__file__))
+    shutil.copy2(_bz2.__file__, target)
+    elf = ELFFile(target)
+    entry = [e for e in elf.dynamic if e[0] in (DT_RPATH, DT_RUNPATH)]
+    verneed = [e for e in elf.dynamic if e[0] == DT_VERNEED]
+    if len(entry) != 1 or not verneed:
+        pytest.skip("the extension has no rpath or no version requirements")
+    # make the name of the first required version the tail of the rpath, as
+    # a linker merging the strings would do
+    offset = elf._get_offset(verneed[0][1])
+    with open(target, "r+b") as file:
+        file.seek(offset + 8)
+        (vn_aux,) = struct.unpack(elf.byte_order + "I", file.read(4))
+        file.seek(offset + vn_aux + 8)
+        file.write(struct.pack(elf.byte_order + "I", entry[0][1] + 1))
+    elf = ELFFile(target)
+    assert entry[0][1] + 1 in elf.version_name_offsets()
+    with open(target, "rb") as file:
+        data = file.read()
+    assert _set_rpath_in_place(elf, "$ORIGIN") is False
+    with open(target, "rb") as file:
+        assert file.read() == data
+
+
+@pytest.mark.skipif(
+    shutil.which("readelf") is None or shutil.which("patchelf") is None,
+    reason="requires readelf and patchelf",
+)
+def test_add_rpath_after_strtab(tmp_path, monkeypatch):
+    """An rpath should be added to a file without one, growing its string
+    table over free space, without the patchelf utility."""
+    rpath = "lib"
+    lib_dynload = os.path.dirname(os.__file__) + "/lib-dynload"
+    for name in sorted(os.listdir(lib_dynload)):
+        source = os.path.join(lib_dynload, name)
+        elf = ELFFile(source)
+        if (
+            name.endswith(".so")
+            and elf.spare_dynamic_entries
+            and elf.get_free_space_after_strtab() > len(rpath)
+        ):
+            break
+    else:
+        pytest.skip("no extension has free space after its string table")
+    target = str(tmp_path / name)
+    shutil.copy2(source, target)
+    subprocess.check_call(["patchelf", "--remove-rpath", target])
+    elf = ELFFile(target)
+    assert elf.rpath is None and elf.runpath is None
+    with monkeypatch.context() as context:
+        context.setenv("PATH", "")
+        Patchelf().set_rpath(target, rpath)
+    new_elf = ELFFile(target)
+    assert new_elf.rpath == rpath
+    assert new_elf.needed == elf.needed
+    # the string is within the string table, as seen by the other tools
+    assert new_elf.strtab_size == elf.strtab_size + len(rpath) + 1
+    assert new_elf.get_strtab_section() is not None
+    assert f"Library rpath: [{rpath}]" in _readelf_dynamic(target)
+    output = subprocess.check_output(
+        ["patchelf", "--print-rpath", target], universal_newlines=True
+    )
+    assert output.strip() == rpath
+
+
+@pytest.mark.skipif(
+    shutil.which("ldd") is None or shutil.which("readelf") is None,
+    reason="requires ldd and readelf",
+)
+def test_add_rpath(tmp_path):
+    """An rpath which does not fit in the string table should be added by the
+    patchelf utility."""
+    source = _find_library_without_rpath()
+    if source is None:
+        pytest.skip("no library without rpath")
+    target = str(tmp_path / os.path.basename(source))
+    shutil.copy2(source, target)
+    Patchelf().set_rpath(target, "$ORIGIN/deps")
+    elf = ELFFile(target)
+    assert elf.rpath == "$ORIGIN/deps"
+    assert elf.runpath is None
+    assert elf.needed == ELFFile(source).needed
+    assert "Library rpath: [$ORIGIN/deps]" in _readelf_dynamic(target)
+    # the dynamic linker finds the string and searches the new rpath
+    process = subprocess.run(
+        ["ldd", target],
+        env=dict(os.environ, LD_DEBUG="libs"),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    assert f"(RPATH from file {target})" in process.stdout
+
+
+def test_verify_patchelf(tmp_path, monkeypatch):
+    """A missing patchelf utility should stop the build before any file is
+    copied."""
+    monkeypatch.setenv("PATH", "")
+    target_dir = tmp_path / "build"
+    with pytest.raises(ValueError):
+        Freezer([], targetDir=str(target_dir))
+    assert not target_dir.exists()